@@ -0,0 +1,254 @@
+"""
+============================================================
+SIGNAL FORGE — VECTORIZED SYNTHETIC COHORT GENERATOR
+============================================================
+Same schema and artifact model as generate_messy_data.generate_user_data
+(one row per 5-second window), built from whole-array draws on seeded
+np.random.Generator streams instead of a per-window Python loop, so
+thousands of subjects × hours of windows can be produced for load and
+accuracy testing.
+
+Model (per subject, per window):
+  SCL drift     random walk N(0, 0.05), floored at 0.5 uS
+  SCR events    5% of windows, amplitude U(0.1, 2.5)
+  clean EDA     baseline + SCR + N(0, 0.02)
+  artifacts     15% (extreme) / 8% (moderate) of windows, one of
+                massive_spike, drop_to_zero, high_freq_jitter, sensor_peel
+
+Ground truth (ground_truth=True, the default):
+  Motion          1 where an artifact was injected — the per-sample mask
+  Artifact_Type   which artifact ("" for clean windows)
+  EDA_Clean       the value before the artifact was applied
+
+Reproducibility: every subject draws from its own SeedSequence child
+of `seed`, so a cohort is identical whatever the batch size or worker
+count. (generate_user_data keeps the legacy np.random stream that the
+benchmark baselines were recorded with.)
+
+Usage:
+  python generate_cohort.py cohort.parquet --subjects 5000 --windows 720
+  python generate_cohort.py cohort.csv --subjects 200 --windows 1000 \\
+      --noise moderate --workers 4 --seed 7
+============================================================
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+ARTIFACT_TYPES = ("massive_spike", "drop_to_zero", "high_freq_jitter", "sensor_peel")
+ARTIFACT_PROB  = {"extreme": 0.15, "moderate": 0.08}
+
+COLUMNS = ["User_ID", "Age", "Gen", "BSR", "Win", "EDA_Mean", "EDA_Std", "SCL_Tonic",
+           "SCR_Peaks", "SCR_Amp", "Slope_Max", "Entropy", "Motion"]
+TRUTH_COLUMNS = ["Artifact_Type", "EDA_Clean"]
+
+# (user_id, age, gen, baseline_start, seed sequence)
+Subject = Tuple[str, int, str, float, np.random.SeedSequence]
+
+
+def _between(rng: np.random.Generator, low, high, size: int) -> np.ndarray:
+    """U(low, high) that, like np.random.uniform, tolerates low > high."""
+    return low + (high - low) * rng.random(size)
+
+
+def generate_user_arrays(rng: np.random.Generator, num_windows: int,
+                         baseline_start: float = 2.0,
+                         noise_level: str = "extreme") -> Dict[str, np.ndarray]:
+    """One subject's numeric columns (unrounded) plus `artifact_type` codes (-1 = clean)."""
+    n = num_windows
+
+    # 1. SCL drift: b_t = max(0.5, b_{t-1} + step). With W = b - 0.5 this is
+    #    the Lindley recursion W_t = max(0, W_{t-1} + step), solved in
+    #    closed form as X_t - min(0, min_{j<=t} X_j) with X = W_0 + cumsum(step)
+    walk     = (baseline_start - 0.5) + np.cumsum(rng.normal(0, 0.05, n))
+    baseline = 0.5 + walk - np.minimum(0.0, np.minimum.accumulate(walk))
+
+    # 2. Legitimate SCRs
+    scr_amp = np.where(rng.random(n) < 0.05, rng.uniform(0.1, 2.5, n), 0.0)
+    clean   = baseline + scr_amp + rng.normal(0, 0.02, n)
+
+    # 3. Artifacts
+    motion   = rng.random(n) < ARTIFACT_PROB.get(noise_level, ARTIFACT_PROB["moderate"])
+    kind     = np.where(motion, rng.integers(0, len(ARTIFACT_TYPES), n), -1)
+    eda      = clean.copy()
+    spike    = kind == 0
+    drop     = kind == 1
+    jitter   = kind == 2
+    peel     = kind == 3
+    eda[spike]  += rng.uniform(6.0, 18.0, n)[spike]
+    eda[drop]    = rng.uniform(0.01, 0.3, n)[drop]
+    eda[jitter] += rng.normal(0, 3.5, n)[jitter]
+    eda[peel]    = np.maximum(0.1, eda[peel] - _between(rng, 1.0, baseline, n)[peel])
+
+    m = motion.astype(float)
+    return {
+        "BSR":           rng.normal(0.4, 0.1, n),
+        "EDA_Mean":      eda,
+        "EDA_Std":       rng.uniform(0.05, 0.5, n) + 1.5 * m,
+        "SCL_Tonic":     baseline,
+        "SCR_Peaks":     (scr_amp > 0).astype(np.int64),
+        "SCR_Amp":       scr_amp,
+        "Slope_Max":     rng.uniform(0.01, 0.3, n) + 2.5 * m,
+        "Entropy":       rng.uniform(0.4, 1.2, n) + 0.8 * m,
+        "Motion":        motion.astype(np.int64),
+        "artifact_type": kind,
+        "EDA_Clean":     clean,
+    }
+
+
+def generate_user_frame(user_id: str, age: int, gen: str, num_windows: int = 1000,
+                        baseline_start: float = 2.0, noise_level: str = "extreme",
+                        seed=None, ground_truth: bool = True) -> pd.DataFrame:
+    """Vectorized generate_user_data: same columns, values rounded to 4 decimals."""
+    cols  = generate_user_arrays(np.random.default_rng(seed), num_windows,
+                                 baseline_start, noise_level)
+    frame = {
+        "User_ID":   np.full(num_windows, user_id, dtype=object),
+        "Age":       np.full(num_windows, age, dtype=np.int64),
+        "Gen":       np.full(num_windows, gen, dtype=object),
+        "BSR":       np.round(cols["BSR"], 4),
+        "Win":       np.arange(1, num_windows + 1),
+        "EDA_Mean":  np.round(cols["EDA_Mean"], 4),
+        "EDA_Std":   np.round(cols["EDA_Std"], 4),
+        "SCL_Tonic": np.round(cols["SCL_Tonic"], 4),
+        "SCR_Peaks": cols["SCR_Peaks"],
+        "SCR_Amp":   np.round(cols["SCR_Amp"], 4),
+        "Slope_Max": np.round(cols["Slope_Max"], 4),
+        "Entropy":   np.round(cols["Entropy"], 4),
+        "Motion":    cols["Motion"],
+    }
+    if ground_truth:
+        names = np.array(("",) + ARTIFACT_TYPES, dtype=object)
+        frame["Artifact_Type"] = names[cols["artifact_type"] + 1]
+        frame["EDA_Clean"]     = np.round(cols["EDA_Clean"], 4)
+    return pd.DataFrame(frame)
+
+
+# ===========================================================
+# Cohorts
+# ===========================================================
+
+def plan_cohort(n_subjects: int, seed: int = 0, first_id: int = 1) -> List[Subject]:
+    """Demographics and per-subject seed streams, as generate_messy_data draws them."""
+    demo_seed, *subject_seeds = np.random.SeedSequence(seed).spawn(n_subjects + 1)
+    rng   = np.random.default_rng(demo_seed)
+    ages  = rng.integers(18, 66, n_subjects)
+    gens  = rng.choice(["M", "F"], n_subjects)
+    bases = rng.uniform(2.0, 7.5, n_subjects)
+    return [(f"U_{first_id + i}", int(ages[i]), str(gens[i]), float(bases[i]), subject_seeds[i])
+            for i in range(n_subjects)]
+
+
+def _generate_batch(subjects: List[Subject], num_windows: int, noise_level: str,
+                    ground_truth: bool) -> pd.DataFrame:
+    return pd.concat(
+        [generate_user_frame(uid, age, gen, num_windows, base, noise_level, ss, ground_truth)
+         for uid, age, gen, base, ss in subjects],
+        ignore_index=True
+    )
+
+
+def iter_cohort(n_subjects: int, num_windows: int, seed: int = 0,
+                noise_level: str = "extreme", batch_subjects: int = 64,
+                workers: int = 1, ground_truth: bool = True) -> Iterator[pd.DataFrame]:
+    """
+    The cohort as DataFrame chunks of `batch_subjects` subjects, in
+    subject order. With workers > 1 batches are generated in a process
+    pool, at most 2 × workers ahead of the consumer so memory stays
+    bounded when writing is the slower side.
+    """
+    plan    = plan_cohort(n_subjects, seed)
+    batches = [plan[i:i + batch_subjects] for i in range(0, len(plan), batch_subjects)]
+    args    = (num_windows, noise_level, ground_truth)
+
+    if workers <= 1:
+        for batch in batches:
+            yield _generate_batch(batch, *args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for batch in batches:
+            pending.append(pool.submit(_generate_batch, batch, *args))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def write_cohort(path: str, n_subjects: int, num_windows: int, seed: int = 0,
+                 noise_level: str = "extreme", batch_subjects: int = 64,
+                 workers: int = 1, ground_truth: bool = True,
+                 fmt: Optional[str] = None) -> dict:
+    """
+    Stream a cohort to CSV or Parquet (by extension unless `fmt`), one
+    chunk at a time. Returns rows / subjects / seconds written.
+    """
+    fmt = fmt or ("parquet" if path.endswith((".parquet", ".pq")) else "csv")
+    if fmt not in ("csv", "parquet"):
+        raise ValueError(f"Unknown format '{fmt}' — expected csv or parquet")
+
+    started = time.perf_counter()
+    rows    = 0
+    chunks  = iter_cohort(n_subjects, num_windows, seed, noise_level,
+                          batch_subjects, workers, ground_truth)
+
+    if fmt == "csv":
+        with open(path, "w", newline="") as f:
+            for k, chunk in enumerate(chunks):
+                chunk.to_csv(f, index=False, header=(k == 0))
+                rows += len(chunk)
+    else:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    return {
+        "path":     path,
+        "format":   fmt,
+        "subjects": n_subjects,
+        "rows":     rows,
+        "seconds":  round(time.perf_counter() - started, 3),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Vectorized synthetic EDA cohort generator")
+    parser.add_argument("out", help="output file (.csv or .parquet)")
+    parser.add_argument("--subjects", type=int, default=100)
+    parser.add_argument("--windows", type=int, default=1000, help="5-second windows per subject")
+    parser.add_argument("--noise", choices=sorted(ARTIFACT_PROB), default="extreme")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-subjects", type=int, default=64)
+    parser.add_argument("--no-truth", action="store_true",
+                        help="omit the Artifact_Type / EDA_Clean ground-truth columns")
+    args = parser.parse_args(argv)
+
+    report = write_cohort(args.out, args.subjects, args.windows, args.seed, args.noise,
+                          args.batch_subjects, args.workers, not args.no_truth)
+    print(f"Wrote {report['rows']:,} rows ({report['subjects']} subjects) "
+          f"→ {report['path']} in {report['seconds']} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
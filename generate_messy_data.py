@@ -64,31 +64,32 @@ def generate_user_data(user_id, age, gen, num_windows=1000, baseline_start=2.0,
         
     return pd.DataFrame(data)
 
-# Set a NEW random seed so the data is completely fresh and different from the first batch
-np.random.seed(99)
-random.seed(99)
+if __name__ == "__main__":
+    # Set a NEW random seed so the data is completely fresh and different from the first batch
+    np.random.seed(99)
+    random.seed(99)
 
-out_dir = r"c:\Users\manoh\Downloads\EDA\eda_f"
+    out_dir = r"c:\Users\manoh\Downloads\EDA\eda_f"
 
-print("Generating 1st NEW Solo File (Subject 02)...")
-df_solo1 = generate_user_data("U_02", 31, "F", num_windows=1000, baseline_start=1.8, noise_level="extreme")
-df_solo1.to_csv(os.path.join(out_dir, "EDA_SOLO_SUBJECT_02_MESSY.csv"), index=False)
+    print("Generating 1st NEW Solo File (Subject 02)...")
+    df_solo1 = generate_user_data("U_02", 31, "F", num_windows=1000, baseline_start=1.8, noise_level="extreme")
+    df_solo1.to_csv(os.path.join(out_dir, "EDA_SOLO_SUBJECT_02_MESSY.csv"), index=False)
 
-print("Generating 2nd NEW Solo File (Subject 03)...")
-df_solo2 = generate_user_data("U_03", 45, "M", num_windows=1000, baseline_start=5.2, noise_level="extreme")
-df_solo2.to_csv(os.path.join(out_dir, "EDA_SOLO_SUBJECT_03_MESSY.csv"), index=False)
+    print("Generating 2nd NEW Solo File (Subject 03)...")
+    df_solo2 = generate_user_data("U_03", 45, "M", num_windows=1000, baseline_start=5.2, noise_level="extreme")
+    df_solo2.to_csv(os.path.join(out_dir, "EDA_SOLO_SUBJECT_03_MESSY.csv"), index=False)
 
-print("Generating NEW Group File (20 subjects, 100 windows each)...")
-dfs = []
-for i in range(101, 121):  # distinct user IDs (U_101 to U_120)
-    uid = f"U_{i}"
-    age = random.randint(18, 65)
-    gen = random.choice(["M", "F"])
-    base = random.uniform(2.0, 7.5)
-    df_u = generate_user_data(uid, age, gen, num_windows=100, baseline_start=base, noise_level="extreme")
-    dfs.append(df_u)
-    
-df_group2 = pd.concat(dfs)
-df_group2.to_csv(os.path.join(out_dir, "EDA_GROUP_02_MESSY.csv"), index=False)
+    print("Generating NEW Group File (20 subjects, 100 windows each)...")
+    dfs = []
+    for i in range(101, 121):  # distinct user IDs (U_101 to U_120)
+        uid = f"U_{i}"
+        age = random.randint(18, 65)
+        gen = random.choice(["M", "F"])
+        base = random.uniform(2.0, 7.5)
+        df_u = generate_user_data(uid, age, gen, num_windows=100, baseline_start=base, noise_level="extreme")
+        dfs.append(df_u)
+
+    df_group2 = pd.concat(dfs)
+    df_group2.to_csv(os.path.join(out_dir, "EDA_GROUP_02_MESSY.csv"), index=False)
 
-print("✅ 3 NEW data files successfully generated.")
+    print("✅ 3 NEW data files successfully generated.")
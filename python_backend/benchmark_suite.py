@@ -0,0 +1,422 @@
+"""
+============================================================
+SIGNAL FORGE — ENGINE BENCHMARK & REGRESSION HARNESS
+============================================================
+Measures ForensicMLEngine on reproducible signals and records a JSON
+baseline that later runs are compared against.
+
+Cases:
+  solo[<technique>]   every run_solo technique
+  hybrid              run_hybrid over all seven techniques
+  metrics             calculate_metrics on a CUL reconstruction
+  metrics_stack       calculate_metrics_stack over all seven solo
+                      reconstructions in one batched pass
+  brute_force         the full 127-combination run_brute_force_benchmark
+  budgeted            run_budgeted_benchmark, top 10 within 40 evaluations
+
+Signals:
+  gen_extreme / gen_moderate   generate_messy_data.generate_user_data
+                               (seeded) at 30, 1k, 10k, 100k samples
+  csv_<name>                   first subject of every bundled CSV
+
+Per case: latency p50/p90/p99/min/mean (ms), peak traced memory (KB)
+and throughput (samples/s at p50).
+
+Usage:
+  python benchmark_suite.py run --out baseline.json
+  python benchmark_suite.py run --sizes 30,1000 --out current.json
+  python benchmark_suite.py compare baseline.json current.json --threshold 0.15
+  python benchmark_suite.py startup --target-ms 1000
+  python benchmark_suite.py precision --sizes 1000,10000 --max-drift 1.0
+
+compare exits with status 1 when any case regresses beyond threshold;
+startup exits with status 1 when a fresh interpreter needs longer than
+the target to import the API and refine its first live CUL sample;
+precision exits with status 1 when a float32 engine's metrics drift
+from the float64 engine's by more than the bound.
+============================================================
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from ml_engine import ForensicMLEngine                  # noqa: E402
+
+TECHNIQUES    = list(ForensicMLEngine.BENCHMARK_TECHNIQUES)
+DEFAULT_SIZES = [30, 1000, 10000, 100000]
+NOISE_LEVELS  = {"gen_extreme": "extreme", "gen_moderate": "moderate"}
+
+# The 127-combo auditor at 100k samples takes minutes; cap it by default.
+BRUTE_FORCE_MAX_LEN = 10000
+
+
+# ===========================================================
+# Signals
+# ===========================================================
+
+def generated_signal(noise_level: str, n: int, seed: int = 7) -> np.ndarray:
+    import random
+    from generate_messy_data import generate_user_data
+
+    np.random.seed(seed)
+    random.seed(seed)
+    df = generate_user_data("U_BENCH", 30, "F", num_windows=n,
+                            baseline_start=2.0, noise_level=noise_level)
+    return df["EDA_Mean"].to_numpy(dtype=float)
+
+
+def csv_signals() -> Dict[str, np.ndarray]:
+    import pandas as pd
+
+    signals = {}
+    for path in sorted(glob.glob(os.path.join(ROOT, "*.csv"))):
+        df = pd.read_csv(path)
+        if "User_ID" not in df or "EDA_Mean" not in df:
+            continue
+        first = df["User_ID"].iloc[0]
+        name  = os.path.splitext(os.path.basename(path))[0]
+        signals[f"csv_{name}"] = df.loc[df["User_ID"] == first, "EDA_Mean"].to_numpy(dtype=float)
+    return signals
+
+
+def build_signals(sizes: List[int], include_csv: bool = True) -> Dict[str, np.ndarray]:
+    signals = {}
+    for label, level in NOISE_LEVELS.items():
+        full = generated_signal(level, max(sizes))
+        for n in sizes:
+            signals[f"{label}:{n}"] = full[:n]
+    if include_csv:
+        for name, data in csv_signals().items():
+            signals[f"{name}:{len(data)}"] = data
+    return signals
+
+
+# ===========================================================
+# Cases
+# ===========================================================
+
+def build_cases(engine: ForensicMLEngine) -> List[Tuple[str, Callable, Callable, Optional[int]]]:
+    """(name, setup(data) -> args, fn(*args), max signal length or None)."""
+    cases = [(f"solo[{t}]", (lambda d, t=t: (t, d)), engine.run_solo, None)
+             for t in TECHNIQUES]
+    cases.append(("hybrid", lambda d: (TECHNIQUES, d), engine.run_hybrid, None))
+    cases.append(("metrics", lambda d: (d, engine.run_solo("cul", d)),
+                  engine.calculate_metrics, None))
+    cases.append(("metrics_stack", lambda d: (d, engine._solo_stack(TECHNIQUES, d)),
+                  engine.calculate_metrics_stack, None))
+    cases.append(("brute_force", lambda d: (d,), engine.run_brute_force_benchmark,
+                  BRUTE_FORCE_MAX_LEN))
+    cases.append(("budgeted", lambda d: (d, 10, 40), engine.run_budgeted_benchmark, None))
+    return cases
+
+
+def measure(fn: Callable, args: tuple, n: int, repeat: int, budget: float) -> Dict[str, float]:
+    fn(*args)   # warm-up: imports, sklearn dispatch, caches
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < repeat:
+        t0 = time.perf_counter()
+        fn(*args)
+        timings.append((time.perf_counter() - t0) * 1000.0)
+        if time.perf_counter() - started > budget and len(timings) >= 3:
+            break
+
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ms = np.array(timings)
+    p50 = float(np.percentile(ms, 50))
+    return {
+        "n":          int(n),
+        "runs":       int(len(ms)),
+        "p50_ms":     round(p50, 4),
+        "p90_ms":     round(float(np.percentile(ms, 90)), 4),
+        "p99_ms":     round(float(np.percentile(ms, 99)), 4),
+        "min_ms":     round(float(ms.min()), 4),
+        "mean_ms":    round(float(ms.mean()), 4),
+        "peak_kb":    round(peak / 1024.0, 1),
+        "samples_per_s": round(n / (p50 / 1000.0), 1) if p50 > 0 else None,
+    }
+
+
+def run_suite(sizes: List[int], repeat: int, budget: float,
+              include_csv: bool, case_filter: str = "",
+              brute_force_max: int = BRUTE_FORCE_MAX_LEN) -> dict:
+    import sklearn
+
+    engine  = ForensicMLEngine()
+    signals = build_signals(sizes, include_csv)
+    results = {}
+
+    for case, setup, fn, max_len in build_cases(engine):
+        if case_filter and case_filter not in case:
+            continue
+        if case == "brute_force":
+            max_len = brute_force_max
+        for signal, data in signals.items():
+            if max_len is not None and len(data) > max_len:
+                continue
+            key = f"{case}@{signal}"
+            results[key] = measure(fn, setup(data), len(data), repeat, budget)
+            print(f"  {key:<55} p50 {results[key]['p50_ms']:>10.3f} ms   "
+                  f"peak {results[key]['peak_kb']:>10.1f} KB", flush=True)
+
+    return {
+        "meta": {
+            "created":  datetime.now().isoformat(timespec="seconds"),
+            "python":   platform.python_version(),
+            "numpy":    np.__version__,
+            "sklearn":  sklearn.__version__,
+            "machine":  platform.machine(),
+            "cpus":     os.cpu_count(),
+            "sizes":    sizes,
+            "repeat":   repeat,
+        },
+        "results": results,
+    }
+
+
+# ===========================================================
+# Startup
+# ===========================================================
+
+# Runs in a fresh interpreter: time to import the API module and serve
+# one live CUL sample — what an autoscaled replica pays before its first
+# /live_reconstruct answer.
+STARTUP_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+main.streams.push("probe", 2.0, history=[1.0] * 30)
+t2 = time.perf_counter()
+print(json.dumps({"import_s": t1 - t0, "first_cul_s": t2 - t1,
+                  "sklearn_loaded": "sklearn" in sys.modules}))
+"""
+
+
+def measure_startup(repeat: int, env: Optional[Dict[str, str]] = None) -> Dict[str, float]:
+    runs = []
+    for _ in range(repeat):
+        t0  = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", STARTUP_PROBE], cwd=HERE,
+                             env={**os.environ, **(env or {})},
+                             capture_output=True, text=True, check=True)
+        wall  = time.perf_counter() - t0
+        probe = json.loads(out.stdout.strip().splitlines()[-1])
+        runs.append((wall, probe))
+
+    wall_ms = np.array([w for w, _ in runs]) * 1000.0
+    return {
+        "runs":            repeat,
+        "wall_p50_ms":     round(float(np.percentile(wall_ms, 50)), 1),
+        "wall_max_ms":     round(float(wall_ms.max()), 1),
+        "import_p50_ms":   round(float(np.median([p["import_s"] for _, p in runs])) * 1000.0, 1),
+        "first_cul_ms":    round(float(np.median([p["first_cul_s"] for _, p in runs])) * 1000.0, 3),
+        "sklearn_loaded":  any(p["sklearn_loaded"] for _, p in runs),
+    }
+
+
+# ===========================================================
+# Precision drift (float32 engine vs float64 engine)
+# ===========================================================
+
+# noise_suppression is an absolute sum (unbounded) — compared relative
+RELATIVE_METRICS = ("noise_suppression",)
+
+
+def _drift(reference: Dict[str, float], candidate: Dict[str, float]) -> Dict[str, float]:
+    return {k: abs(candidate[k] - v) / max(abs(v), 1.0) if k in RELATIVE_METRICS
+            else abs(candidate[k] - v)
+            for k, v in reference.items()}
+
+
+def precision_drift(sizes: List[int], include_csv: bool = True,
+                    brute_force_max: int = BRUTE_FORCE_MAX_LEN) -> dict:
+    """
+    Every solo technique, the seven-way hybrid and (up to
+    brute_force_max samples) all 127 benchmark combinations, scored
+    by a float64 and a float32 engine. Drift is per metric: absolute
+    score points, relative for RELATIVE_METRICS. Also reports the
+    measured nbytes of each engine's solo reconstructions per signal.
+
+    Two effects dominate: 4-decimal steps of exactly 0.001 uS sit on
+    signal_continuity's flat-step threshold, and LOF's pick between
+    equidistant neighbours changes once samples are rounded to float32
+    (which is why its noise_suppression moves by a few percent).
+    """
+    e64 = ForensicMLEngine(precision="float64")
+    e32 = ForensicMLEngine(precision="float32")
+
+    worst: Dict[str, Dict[str, float]] = {}
+    saved = {}
+    for label, data in build_signals(sizes, include_csv).items():
+        raw32 = e32.as_signal(data)
+        cases = [(t, (lambda e, d, t=t: e.run_solo(t, d))) for t in TECHNIQUES]
+        cases.append(("hybrid", lambda e, d: e.run_hybrid(TECHNIQUES, d)))
+        held  = {"float64": 0, "float32": 0}
+        for name, run in cases:
+            out64, out32 = run(e64, data), run(e32, raw32)
+            if name != "hybrid":
+                held["float64"] += out64.nbytes
+                held["float32"] += out32.nbytes
+            drift = _drift(e64.calculate_metrics(data, out64),
+                           e32.calculate_metrics(raw32, out32))
+            case = worst.setdefault(name, dict.fromkeys(drift, 0.0))
+            for k, v in drift.items():
+                case[k] = max(case[k], v)
+
+        if len(data) <= brute_force_max:
+            ref = {tuple(r["techs"]): r["metrics"] for r in e64.run_brute_force_benchmark(data)}
+            case = worst.setdefault("brute_force", {})
+            for r in e32.run_brute_force_benchmark(raw32):
+                for k, v in _drift(ref[tuple(r["techs"])], r["metrics"]).items():
+                    case[k] = max(case.get(k, 0.0), v)
+
+        saved[label] = {f"{p}_kb": round(b / 1024, 1) for p, b in held.items()}
+
+    return {
+        "worst_drift": {name: {k: round(v, 4) for k, v in case.items()}
+                        for name, case in worst.items()},
+        "solo_stack":  saved,
+    }
+
+
+# ===========================================================
+# Compare
+# ===========================================================
+
+def compare(baseline: dict, current: dict, threshold: float,
+            memory_threshold: float, min_delta_ms: float = 0.1) -> int:
+    base, cur = baseline["results"], current["results"]
+    regressions, improvements = [], []
+
+    for key in sorted(set(base) & set(cur)):
+        ratio     = cur[key]["p50_ms"] / max(base[key]["p50_ms"], 1e-9)
+        mem_ratio = cur[key]["peak_kb"] / max(base[key]["peak_kb"], 1e-9)
+        line = (f"  {key:<55} p50 {base[key]['p50_ms']:>10.3f} → {cur[key]['p50_ms']:>10.3f} ms "
+                f"({ratio:5.2f}x)   mem {mem_ratio:5.2f}x")
+        # Sub-`min_delta_ms` swings on tiny signals are timer noise, not regressions
+        delta = abs(cur[key]["p50_ms"] - base[key]["p50_ms"])
+        if (ratio > 1.0 + threshold and delta >= min_delta_ms) or mem_ratio > 1.0 + memory_threshold:
+            regressions.append(line)
+        elif ratio < 1.0 - threshold and delta >= min_delta_ms:
+            improvements.append(line)
+
+    only_base = sorted(set(base) - set(cur))
+    only_cur  = sorted(set(cur) - set(base))
+
+    print(f"Compared {len(set(base) & set(cur))} cases "
+          f"(threshold ±{threshold:.0%} time, +{memory_threshold:.0%} memory)")
+    if improvements:
+        print("\nIMPROVED:")
+        print("\n".join(improvements))
+    if regressions:
+        print("\nREGRESSED:")
+        print("\n".join(regressions))
+    if only_base:
+        print(f"\nMissing from current run: {len(only_base)} cases")
+    if only_cur:
+        print(f"New in current run: {len(only_cur)} cases")
+
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="ForensicMLEngine benchmark suite")
+    sub    = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="measure and write a JSON baseline")
+    run.add_argument("--out", default="engine_baseline.json")
+    run.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    run.add_argument("--repeat", type=int, default=7)
+    run.add_argument("--budget", type=float, default=5.0,
+                     help="seconds per case before stopping early (min 3 runs)")
+    run.add_argument("--cases", default="", help="substring filter, e.g. 'solo[' or 'brute'")
+    run.add_argument("--no-csv", action="store_true", help="skip the bundled CSV signals")
+    run.add_argument("--brute-force-max", type=int, default=BRUTE_FORCE_MAX_LEN)
+
+    cmp_ = sub.add_parser("compare", help="flag regressions against a baseline")
+    cmp_.add_argument("baseline")
+    cmp_.add_argument("current")
+    cmp_.add_argument("--threshold", type=float, default=0.15)
+    cmp_.add_argument("--memory-threshold", type=float, default=0.25)
+    cmp_.add_argument("--min-delta-ms", type=float, default=0.1,
+                      help="ignore p50 changes smaller than this")
+
+    start = sub.add_parser("startup", help="cold-start time of the API process")
+    start.add_argument("--repeat", type=int, default=5)
+    start.add_argument("--target-ms", type=float, default=1000.0,
+                       help="fail when the p50 wall time exceeds this")
+    start.add_argument("--preload", default="",
+                       help="FORGE_PRELOAD for the probe, e.g. 'all'")
+
+    prec = sub.add_parser("precision", help="float32 vs float64 metric drift")
+    prec.add_argument("--sizes", default="30,1000,10000")
+    prec.add_argument("--max-drift", type=float, default=1.0,
+                      help="fail when any score metric moves more than this many points")
+    prec.add_argument("--max-relative-drift", type=float, default=0.15,
+                      help="same for RELATIVE_METRICS, as a fraction")
+    prec.add_argument("--no-csv", action="store_true", help="skip the bundled CSV signals")
+    prec.add_argument("--brute-force-max", type=int, default=BRUTE_FORCE_MAX_LEN)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "precision":
+        sizes  = [int(s) for s in args.sizes.split(",") if s]
+        report = precision_drift(sizes, not args.no_csv, args.brute_force_max)
+        print(json.dumps(report, indent=2))
+        over = [f"{name}.{k} = {v}"
+                for name, case in report["worst_drift"].items()
+                for k, v in case.items()
+                if v > (args.max_relative_drift if k in RELATIVE_METRICS else args.max_drift)]
+        if over:
+            print("\nPRECISION DRIFT OVER BOUND:\n  " + "\n  ".join(over))
+            return 1
+        return 0
+
+    if args.command == "startup":
+        env = {"FORGE_PRELOAD": args.preload, "FORGE_PRELOAD_AT": "import"} if args.preload else {}
+        report = measure_startup(args.repeat, env)
+        print(json.dumps(report, indent=2))
+        if report["wall_p50_ms"] > args.target_ms:
+            print(f"\nSTARTUP OVER TARGET: {report['wall_p50_ms']} ms > {args.target_ms} ms")
+            return 1
+        return 0
+
+    if args.command == "run":
+        sizes  = [int(s) for s in args.sizes.split(",") if s]
+        report = run_suite(sizes, args.repeat, args.budget, not args.no_csv,
+                           args.cases, args.brute_force_max)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {len(report['results'])} cases → {args.out}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    return compare(baseline, current, args.threshold, args.memory_threshold,
+                   args.min_delta_ms)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
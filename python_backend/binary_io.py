@@ -0,0 +1,144 @@
+import json
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+
+# ===========================================================
+# Binary signal transport for /analyze and /benchmark
+# ===========================================================
+#
+# JSON stays the default. Two binary encodings are negotiated through
+# Content-Type (request) and Accept (response):
+#
+#   application/octet-stream              raw little-endian samples;
+#                                         X-Forge-Dtype: float64 | float32
+#   application/vnd.apache.arrow.stream   Arrow IPC stream, first column
+#
+# Multi-channel signals add X-Forge-Channels: C. Octet bodies are then
+# a row-major (C, n) matrix; Arrow streams carry one column per channel.
+#
+# Request bodies are decoded with np.frombuffer / Arrow buffers, i.e.
+# without a per-float parse. Binary responses carry the refined signal
+# as the body and the metrics as a small JSON header (X-Forge-Metrics)
+# or, for Arrow, as schema metadata.
+
+OCTET_STREAM = "application/octet-stream"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+DTYPES = {"float64": np.dtype("<f8"), "float32": np.dtype("<f4")}
+
+
+def media_type(header: Optional[str]) -> str:
+    return (header or "").split(";")[0].strip().lower()
+
+
+def is_binary(content_type: Optional[str]) -> bool:
+    return media_type(content_type) in (OCTET_STREAM, ARROW_STREAM)
+
+
+def wants_binary(accept: Optional[str]) -> Optional[str]:
+    """Binary media type requested by the Accept header, else None (JSON)."""
+    for part in (accept or "").split(","):
+        kind = media_type(part)
+        if kind in (OCTET_STREAM, ARROW_STREAM):
+            return kind
+    return None
+
+
+def _dtype(name: Optional[str]) -> np.dtype:
+    dtype = DTYPES.get((name or "float64").lower())
+    if dtype is None:
+        raise HTTPException(status_code=415,
+                            detail=f"Unsupported X-Forge-Dtype '{name}' — use float64 or float32")
+    return dtype
+
+
+def parse_channels(header: Optional[str]) -> Optional[int]:
+    if not header:
+        return None
+    try:
+        channels = int(header)
+    except ValueError:
+        channels = 0
+    if channels < 1:
+        raise HTTPException(status_code=400, detail=f"Invalid X-Forge-Channels '{header}'")
+    return channels
+
+
+def decode_signal(body: bytes, content_type: str,
+                  dtype_name: Optional[str] = None,
+                  channels: Optional[int] = None,
+                  target=np.float64) -> np.ndarray:
+    """
+    Binary request body → `target`-dtype array (the engine's precision;
+    zero-copy when the body already is that dtype): 1-D, or
+    (channels, n) when a channel count is given.
+    """
+    if media_type(content_type) == ARROW_STREAM:
+        import pyarrow as pa
+
+        try:
+            table = pa.ipc.open_stream(body).read_all()
+        except pa.ArrowInvalid as e:
+            raise HTTPException(status_code=400, detail=f"Invalid Arrow stream: {e}")
+        if table.num_columns < (channels or 1):
+            raise HTTPException(status_code=400,
+                                detail=f"Arrow stream has {table.num_columns} columns, "
+                                       f"expected {channels or 1}")
+        columns = []
+        for k in range(channels or 1):
+            column = table.column(k).combine_chunks()
+            if column.null_count:
+                raise HTTPException(status_code=400, detail="Arrow signal column contains nulls")
+            columns.append(np.asarray(column.to_numpy(zero_copy_only=False), dtype=target))
+        return np.vstack(columns) if channels else columns[0]
+
+    dtype = _dtype(dtype_name)
+    if len(body) % dtype.itemsize:
+        raise HTTPException(status_code=400,
+                            detail=f"Body length {len(body)} is not a multiple of {dtype.itemsize} bytes")
+    signal = np.frombuffer(body, dtype=dtype)
+    if channels:
+        if len(signal) % channels:
+            raise HTTPException(status_code=400,
+                                detail=f"{len(signal)} samples do not split into {channels} channels")
+        signal = signal.reshape(channels, -1)
+    # float32 halves the wire size; a float32 engine keeps it as sent
+    return signal.astype(target, copy=False)
+
+
+def encode_signal(refined: np.ndarray, kind: str,
+                  metrics: Union[Dict[str, float], List[Dict[str, float]]],
+                  dtype_name: Optional[str] = None,
+                  headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Refined signal as a binary response of the negotiated kind. A 2-D
+    (channels, n) result is sent row-major / as one Arrow column per
+    channel, with X-Forge-Channels and a per-channel metrics list.
+    """
+    headers = dict(headers or {})
+    refined = np.asarray(refined, dtype=np.float64)
+    if refined.ndim == 2:
+        headers["X-Forge-Channels"] = str(len(refined))
+    if kind == ARROW_STREAM:
+        import pyarrow as pa
+
+        if refined.ndim == 2:
+            table = pa.table({f"channel_{k}": row for k, row in enumerate(refined)})
+        else:
+            table = pa.table({"refined": refined})
+        table = table.replace_schema_metadata({"metrics": json.dumps(metrics)})
+        sink  = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(content=sink.getvalue().to_pybytes(),
+                        media_type=ARROW_STREAM, headers=headers)
+
+    dtype = _dtype(dtype_name)
+    headers["X-Forge-Dtype"]   = dtype_name or "float64"
+    headers["X-Forge-Metrics"] = json.dumps(metrics, separators=(",", ":"))
+    return Response(content=np.ascontiguousarray(refined, dtype=dtype).tobytes(),
+                    media_type=OCTET_STREAM, headers=headers)
@@ -0,0 +1,364 @@
+import numpy as np
+
+
+# ===========================================================
+# NATIVE 1-D DETECTOR BACKENDS
+# ===========================================================
+#
+# Every run_solo detector sees `data.reshape(-1, 1)` — one feature.
+# sklearn answers that with its general n-dimensional machinery
+# (KD-tree neighbour queries, Cholesky-factored full covariances,
+# k-means++ initialisation). On a line all of it collapses to a sort:
+#
+#   DBSCAN1D               eps-neighbourhood counts from two
+#                          searchsorted sweeps over the sorted signal
+#   LocalOutlierFactor1D   the k nearest neighbours of a point are
+#                          within k positions of it in sorted order,
+#                          so one (n, 2k) candidate block replaces
+#                          the tree
+#   GaussianMixture1D      EM on scalar means / variances, vectorised
+#                          over samples, seeded by the same k-means++
+#                          / Lloyd initialisation replayed on a line
+#
+# Each class mirrors the slice of the sklearn estimator API the engine
+# uses, so ml_engine.load_backend can hand either one out (see
+# ml_engine.NATIVE_BACKENDS / FORGE_DETECTORS).
+
+
+def _column(X) -> np.ndarray:
+    x = np.asarray(X, dtype=float)
+    if x.ndim == 2:
+        if x.shape[1] != 1:
+            raise ValueError(f"1-D detector expects one feature, got {x.shape[1]}")
+        x = x[:, 0]
+    if not np.all(np.isfinite(x)):
+        # sklearn's check_array refuses NaN / inf the same way
+        raise ValueError("Input contains NaN or infinity")
+    return x
+
+
+def _radius_window(xs: np.ndarray, eps: float):
+    """
+    [lo, hi) sorted positions with (xs[j] - xs[i])² <= eps² — the
+    squared-distance test sklearn's KD-tree applies — for every i.
+    searchsorted on xs ± eps can be one position off where rounding
+    lands on the boundary; those positions are corrected exactly.
+    """
+    r2 = eps * eps
+    n  = len(xs)
+    lo = np.searchsorted(xs, xs - eps, "left")
+    hi = np.searchsorted(xs, xs + eps, "right")
+    idx = np.arange(n)
+
+    # Shrink: boundary element outside the radius
+    while True:
+        bad = (lo < idx) & ((xs[lo] - xs) ** 2 > r2)
+        if not bad.any():
+            break
+        lo[bad] += 1
+    while True:
+        bad = (hi - 1 > idx) & ((xs[hi - 1] - xs) ** 2 > r2)
+        if not bad.any():
+            break
+        hi[bad] -= 1
+    # Grow: neighbour just outside the window still inside the radius
+    while True:
+        ok = (lo > 0) & ((xs[np.maximum(lo - 1, 0)] - xs) ** 2 <= r2)
+        if not ok.any():
+            break
+        lo[ok] -= 1
+    while True:
+        ok = (hi < n) & ((xs[np.minimum(hi, n - 1)] - xs) ** 2 <= r2)
+        if not ok.any():
+            break
+        hi[ok] += 1
+    return lo, hi
+
+
+class DBSCAN1D:
+    """
+    DBSCAN on a single feature. Only noise vs. clustered is computed
+    exactly like sklearn (labels_ == -1); clustered points get the id of
+    their connected run of core points, numbered left to right.
+    """
+
+    def __init__(self, eps: float = 0.5, min_samples: int = 5):
+        self.eps         = eps
+        self.min_samples = min_samples
+
+    def fit(self, X, y=None) -> "DBSCAN1D":
+        if not (np.isfinite(self.eps) and self.eps > 0):
+            raise ValueError(f"eps must be in (0, inf), got {self.eps}")
+        x     = _column(X)
+        n     = len(x)
+        order = np.argsort(x, kind="stable")
+        xs    = x[order]
+
+        lo, hi = _radius_window(xs, self.eps)
+        core   = (hi - lo) >= self.min_samples
+
+        # Border points: within eps of the nearest core point on either side
+        pos        = np.arange(n)
+        core_pos   = np.flatnonzero(core)
+        labels_s   = np.full(n, -1, dtype=np.int64)
+        if len(core_pos):
+            # Core points whose windows overlap the next core point are one cluster
+            gaps       = (xs[core_pos[1:]] - xs[core_pos[:-1]]) ** 2 > self.eps * self.eps
+            cluster_id = np.concatenate(([0], np.cumsum(gaps)))
+
+            left  = np.searchsorted(core_pos, pos, "right") - 1
+            right = np.searchsorted(core_pos, pos, "left")
+            r2    = self.eps * self.eps
+            has_l = left >= 0
+            has_r = right < len(core_pos)
+            d_l   = np.where(has_l, (xs - xs[core_pos[np.maximum(left, 0)]]) ** 2, np.inf)
+            d_r   = np.where(has_r, (xs[core_pos[np.minimum(right, len(core_pos) - 1)]] - xs) ** 2, np.inf)
+            use_l = has_l & (d_l <= r2) & ((d_l <= d_r) | ~has_r)
+            use_r = has_r & (d_r <= r2) & ~use_l
+            labels_s[use_l] = cluster_id[left[use_l]]
+            labels_s[use_r] = cluster_id[right[use_r]]
+
+        self.core_sample_indices_ = np.sort(order[core])
+        self.labels_              = np.empty(n, dtype=np.int64)
+        self.labels_[order]       = labels_s
+        return self
+
+    def fit_predict(self, X, y=None) -> np.ndarray:
+        return self.fit(X).labels_
+
+
+class LocalOutlierFactor1D:
+    """
+    Local Outlier Factor (outlier-detection mode, fit_predict only) on a
+    single feature: same k-distance, reachability, lrd and contamination
+    offset arithmetic as sklearn, with the neighbour search done on the
+    sorted signal. Equidistant neighbours on opposite sides may be picked
+    in a different order than the KD-tree picks them.
+    """
+
+    def __init__(self, n_neighbors: int = 20, contamination: float = 0.1):
+        self.n_neighbors   = n_neighbors
+        self.contamination = contamination
+
+    def _kneighbors(self, xs: np.ndarray, k: int):
+        """(distances, neighbour positions), both (n, k) in sorted space."""
+        n    = len(xs)
+        pos  = np.arange(n)[:, None]
+        offs = np.concatenate((np.arange(-k, 0), np.arange(1, k + 1)))
+        cand = pos + offs[None, :]
+        valid = (cand >= 0) & (cand < n)
+        cand  = np.clip(cand, 0, n - 1)
+
+        diff = xs[cand] - xs[:, None]
+        dist = np.where(valid, np.sqrt(diff * diff), np.inf)
+        pick = np.argsort(dist, axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(dist, pick, axis=1), np.take_along_axis(cand, pick, axis=1)
+
+    def fit_predict(self, X, y=None) -> np.ndarray:
+        x = _column(X)
+        n = len(x)
+        if n < 2:
+            raise ValueError(f"Expected n_neighbors <= n_samples_fit, got n_samples_fit = {n}")
+        k = max(1, min(self.n_neighbors, n - 1))
+
+        order     = np.argsort(x, kind="stable")
+        xs        = x[order]
+        dist, nbr = self._kneighbors(xs, k)
+
+        k_dist = dist[:, -1]
+        reach  = np.maximum(dist, k_dist[nbr])
+        lrd    = 1.0 / (np.mean(reach, axis=1) + 1e-10)
+        nof_s  = -np.mean(lrd[nbr] / lrd[:, None], axis=1)
+
+        self.n_neighbors_            = k
+        self.negative_outlier_factor_ = np.empty(n)
+        self.negative_outlier_factor_[order] = nof_s
+        self.offset_ = np.percentile(self.negative_outlier_factor_, 100.0 * self.contamination)
+
+        labels = np.ones(n, dtype=int)
+        labels[self.negative_outlier_factor_ < self.offset_] = -1
+        return labels
+
+
+class GaussianMixture1D:
+    """
+    Gaussian mixture on a single feature. Same k-means initialisation
+    (seeded k-means++ and Lloyd, replayed on one feature), EM,
+    regularisation, convergence test (change of the mean log-likelihood
+    < tol) and warm_start semantics as sklearn's GaussianMixture.
+    `covariance_type` is accepted for API compatibility — with one
+    feature every type is a scalar variance per component.
+    """
+
+    def __init__(self, n_components: int = 1, covariance_type: str = "full",
+                 tol: float = 1e-3, reg_covar: float = 1e-6, max_iter: int = 100,
+                 random_state=None, warm_start: bool = False):
+        self.n_components    = n_components
+        self.covariance_type = covariance_type
+        self.tol             = tol
+        self.reg_covar       = reg_covar
+        self.max_iter        = max_iter
+        self.random_state    = random_state
+        self.warm_start      = warm_start
+
+    # ===========================================================
+    # Initialisation
+    # ===========================================================
+
+    @staticmethod
+    def _sq_dist(centres: np.ndarray, xc: np.ndarray, sq: np.ndarray) -> np.ndarray:
+        """Squared distances in sklearn's expanded form (c² - 2cx + x²), clipped at 0."""
+        d  = -2 * (centres[:, None] * xc[None, :])
+        d += (centres * centres)[:, None]
+        d += sq[None, :]
+        return np.maximum(d, 0)
+
+    def _kmeans_labels(self, x: np.ndarray) -> np.ndarray:
+        """
+        sklearn KMeans(n_clusters, n_init=1, random_state) labels on one
+        feature: centred data, greedy k-means++ seeding from the same
+        RandomState draws, then Lloyd iterations with the same strict /
+        centre-shift convergence tests.
+        """
+        k  = self.n_components
+        rs = self.random_state
+        if not isinstance(rs, np.random.RandomState):
+            rs = np.random.RandomState(rs) if rs is not None else np.random.mtrand._rand
+        n  = len(x)
+        xc = x - x.mean()
+        sq = xc * xc
+        w  = np.ones(n)
+
+        # k-means++ seeding
+        trials  = 2 + int(np.log(k))
+        first   = rs.choice(n, p=w / w.sum())
+        centres = [xc[first]]
+        closest = self._sq_dist(xc[[first]], xc, sq)
+        pot     = closest @ w
+        for _ in range(1, k):
+            rand  = rs.uniform(size=trials) * pot
+            cand  = np.searchsorted(np.cumsum(w * closest), rand)
+            np.clip(cand, None, closest.size - 1, out=cand)
+            dist  = self._sq_dist(xc[cand], xc, sq)
+            np.minimum(closest, dist, out=dist)
+            pots  = dist @ w.reshape(-1, 1)
+            best  = int(np.argmin(pots))
+            pot, closest = pots[best], dist[best]
+            centres.append(xc[cand[best]])
+        centres = np.array(centres)
+
+        # Lloyd — on a line every cluster is a contiguous run of the
+        # sorted signal, so an iteration is k binary searches on prefix sums
+        order = np.argsort(xc, kind="stable")
+        xs    = xc[order]
+        csum  = np.concatenate(([0.0], np.cumsum(xs)))
+        tol   = float(np.var(xc)) * 1e-4
+
+        def goes_left(centres, x, a, b):
+            """sklearn's argmin of c² - 2xc between centres a < b (sorted), lowest index on ties."""
+            da = centres[a] * centres[a] - 2 * (x * centres[a])
+            db = centres[b] * centres[b] - 2 * (x * centres[b])
+            return (da < db) | ((da == db) & (a < b))
+
+        def assign(centres):
+            # Coincident centres (more clusters than distinct values) are
+            # equidistant from every point and sklearn's argmin keeps the
+            # lowest index, so only the first of each run owns a segment
+            perm  = np.argsort(centres, kind="stable")
+            sc    = centres[perm]
+            first = np.concatenate(([True], sc[1:] != sc[:-1]))
+            perm  = perm[first]
+            sc    = sc[first]
+            a, b  = perm[:-1], perm[1:]
+
+            # The midpoint cut can be one position off where a sample sits
+            # on (or rounds onto) the midpoint; settle those exactly
+            cut = np.searchsorted(xs, (sc[1:] + sc[:-1]) / 2.0, "right")
+            while True:
+                bad = (cut < n) & goes_left(centres, xs[np.minimum(cut, n - 1)], a, b)
+                if not bad.any():
+                    break
+                cut[bad] += 1
+            while True:
+                bad = (cut > 0) & ~goes_left(centres, xs[np.maximum(cut - 1, 0)], a, b)
+                if not bad.any():
+                    break
+                cut[bad] -= 1
+            return perm, np.concatenate(([0], cut, [n]))
+
+        previous = None
+        strict   = False
+        for _ in range(300):
+            perm, edges = assign(centres)
+            counts = np.zeros(k)
+            sums   = np.zeros(k)
+            counts[perm] = np.diff(edges)
+            sums[perm]   = csum[edges[1:]] - csum[edges[:-1]]
+            new    = np.where(counts > 0, sums / np.maximum(counts, 1), centres)
+            shift  = new - centres
+            centres = new
+            if previous is not None and np.array_equal(perm, previous[0]) \
+                    and np.array_equal(edges, previous[1]):
+                strict = True
+                break
+            if float((shift ** 2).sum()) <= tol:
+                break
+            previous = (perm, edges)
+        if not strict:
+            perm, edges = assign(centres)
+
+        labels = np.empty(n, dtype=np.int64)
+        labels[order] = np.repeat(perm, np.diff(edges))
+        return labels
+
+    def _m_step(self, x: np.ndarray, resp: np.ndarray):
+        nk    = resp.sum(axis=0) + 10 * np.finfo(resp.dtype).eps
+        means = resp.T @ x / nk
+        var   = np.einsum("nk,nk->k", resp, (x[:, None] - means) ** 2) / nk + self.reg_covar
+        self.weights_ = nk / nk.sum()
+        self._means   = means
+        self._var     = var
+
+    # ===========================================================
+    # EM
+    # ===========================================================
+
+    def _weighted_log_prob(self, x: np.ndarray) -> np.ndarray:
+        const = np.log(self.weights_) - 0.5 * (np.log(2 * np.pi) + np.log(self._var))
+        return const - (x[:, None] - self._means) ** 2 * (0.5 / self._var)
+
+    def fit(self, X, y=None) -> "GaussianMixture1D":
+        x = _column(X)
+        if len(x) < self.n_components:
+            raise ValueError(
+                f"Expected n_samples >= n_components but got n_components = "
+                f"{self.n_components}, n_samples = {len(x)}"
+            )
+
+        if not (self.warm_start and hasattr(self, "converged_")):
+            labels = self._kmeans_labels(x)
+            resp   = np.zeros((len(x), self.n_components))
+            resp[np.arange(len(x)), labels] = 1.0
+            self._m_step(x, resp)
+
+        lower_bound     = -np.inf
+        self.converged_ = False
+        for n_iter in range(1, self.max_iter + 1):
+            prev     = lower_bound
+            weighted = self._weighted_log_prob(x)
+            top      = weighted.max(axis=1, keepdims=True)
+            log_norm = top[:, 0] + np.log(np.exp(weighted - top).sum(axis=1))
+            self._m_step(x, np.exp(weighted - log_norm[:, None]))
+            lower_bound = float(np.mean(log_norm))
+            if abs(lower_bound - prev) < self.tol:
+                self.converged_ = True
+                break
+
+        self.n_iter_       = n_iter
+        self.lower_bound_  = lower_bound
+        self.means_        = self._means.reshape(-1, 1)
+        self.covariances_  = self._var.reshape(-1, 1, 1)
+        return self
+
+    def predict(self, X) -> np.ndarray:
+        return self._weighted_log_prob(_column(X)).argmax(axis=1)
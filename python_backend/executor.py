@@ -0,0 +1,415 @@
+import os
+import threading
+import time
+import numpy as np
+from concurrent.futures import (
+    Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor,
+    TimeoutError as FutureTimeout,
+)
+from typing import Iterable, List, Optional, Tuple
+
+import shared_buffers
+from instrumentation import metrics
+from shared_buffers import Handle, SharedArena, attached
+
+
+# ===========================================================
+# WORKER-SIDE ENTRY POINT
+# ===========================================================
+
+_worker_engines = {}
+
+
+def _local_engine(data: Optional[np.ndarray] = None):
+    """
+    Process workers keep one engine per process (and precision) so the
+    import + construction cost is paid once per worker. The precision
+    follows the dtype of the signal the task carries, i.e. that of the
+    engine that fanned it out.
+    """
+    from ml_engine import DEFAULT_PRECISION, PRECISIONS, ForensicMLEngine
+
+    precision = data.dtype.name if data is not None and data.dtype.name in PRECISIONS \
+        else DEFAULT_PRECISION
+    engine = _worker_engines.get(precision)
+    if engine is None:
+        engine = _worker_engines[precision] = ForensicMLEngine(precision=precision)
+    return engine
+
+
+def _warm_worker(preload: tuple):
+    """Pool initializer: build the worker's engine and import its backends up front."""
+    from ml_engine import preload_backends
+    _local_engine()
+    preload_backends(preload)
+
+
+def _run_solo_task(technique: str, data: np.ndarray) -> np.ndarray:
+    return _local_engine(data).run_solo(technique, data)
+
+
+def _run_solo_shared(technique: str, raw: Handle, out: Handle, row: int):
+    """_run_solo_task over shared memory: reads `raw`, writes out[row] in place."""
+    with attached(raw) as data, attached(out, writeable=True) as stack:
+        stack[row] = _local_engine(data).run_solo(technique, data)
+
+
+def _release_after(arena: SharedArena, futures: Iterable):
+    """
+    Release `arena` once every future is done. A task abandoned on
+    timeout may not even have attached to its segments yet, so they
+    must outlive the fan-out call that created them.
+    """
+    pending = [f for f in futures if not f.done()]
+    if not pending:
+        arena.release()
+        return
+    lock      = threading.Lock()
+    remaining = [len(pending)]
+
+    def finished(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            arena.release()
+
+    for future in pending:
+        future.add_done_callback(finished)
+
+
+def _run_channel(engine, mode: str, techniques: List[str], data: np.ndarray) -> np.ndarray:
+    """
+    run_mode for one channel without touching engine.executor: the
+    channel itself already occupies a pool slot, so a nested fan-out
+    into the same pool could wait on itself.
+    """
+    if mode == "solo":
+        return engine.run_solo(techniques[0] if techniques else "cul", data)
+    if not techniques:
+        return data
+    stack = np.array([engine.run_solo(t, data) for t in techniques])
+    return engine._consensus_from_stack(
+        stack, data, np.ones((1, len(techniques)), dtype=bool)
+    )[0]
+
+
+def _run_channel_task(mode: str, techniques: List[str], data: np.ndarray) -> np.ndarray:
+    return _run_channel(_local_engine(data), mode, techniques, data)
+
+
+def _run_channel_shared(mode: str, techniques: List[str], raw: Handle, out: Handle, row: int):
+    """_run_channel_task over shared memory: channel `row` of `raw` → out[row]."""
+    with attached(raw) as channels, attached(out, writeable=True) as refined:
+        refined[row] = _run_channel(_local_engine(channels), mode, techniques, channels[row])
+
+
+def _run_subject_task(mode: str, techniques: List[str], data: np.ndarray):
+    """One subject of a batch job: (refined, metrics)."""
+    eng     = _local_engine()
+    refined = eng.run_mode(mode, techniques, data)
+    return refined, eng.calculate_metrics(data, refined)
+
+
+class DetectorExecutor:
+    """
+    ============================================================
+    SIGNAL FORGE — DETECTOR FAN-OUT LAYER
+    ============================================================
+    The seven detectors are independent of each other, so run_hybrid
+    and run_brute_force_benchmark hand them to a pool instead of fitting
+    them one after another on a single core.
+
+    Settings (constructor args, or environment via from_env()):
+      FORGE_POOL_KIND       "process" | "thread" | "inline"
+      FORGE_POOL_SIZE       worker count (default: min(7, cpu_count))
+      FORGE_TECH_TIMEOUT    seconds allowed per technique (0 = no limit)
+      FORGE_POOL_MIN_SAMPLES  signals shorter than this run their detectors
+                            inline (512): below it every fit but
+                            iso_forest takes ~1 ms, so pool IPC would cost
+                            more than the overlap saves (a 31-sample live
+                            window: ~9 ms through processes vs ~4 ms inline)
+      FORGE_PRELOAD         detector backends each process worker imports
+                            when it starts ("all", "gmm,lof", ...)
+      FORGE_SHM             "0" pickles arrays to process workers instead
+                            of sharing them (default "1")
+      FORGE_SHM_MIN_KB      signals smaller than this are pickled anyway —
+                            a segment costs more than a tiny pickle (64)
+
+    Process workers receive the raw signal and return reconstructions
+    through shared-memory segments (shared_buffers.py): one copy in, the
+    (n_tasks, n) result stack written in place by the workers, one copy
+    out, instead of a pickle round trip per task.
+
+    A technique that times out or crashes is treated exactly like an
+    algorithm error inside run_solo: the raw signal is returned unhealed
+    for that slot, so the ensemble vote still completes.
+
+    A timed-out task that is already running cannot be cancelled, and
+    would hold its worker until the fit ends. The pool is therefore
+    retired: later calls get a fresh pool, and the old one finishes
+    what it was given (other callers' tasks included) and exits. At
+    most MAX_RETIRED_POOLS retired pools may still be busy:
+      process   past the cap, the oldest one's workers are terminated
+                (any of its tasks still running come back as errors)
+      thread    threads cannot be killed, so past the cap the pool is
+                no longer retired and a stuck fit keeps its slot
+    ============================================================
+    """
+
+    KINDS = ("process", "thread", "inline")
+
+    MAX_RETIRED_POOLS = 2
+
+    def __init__(self, kind: str = "process",
+                 max_workers: Optional[int] = None,
+                 technique_timeout: Optional[float] = None,
+                 preload: Optional[List[str]] = None,
+                 shared_memory: bool = True,
+                 shm_min_bytes: int = 64 << 10,
+                 inline_below: int = 512):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown pool kind '{kind}' — expected one of {self.KINDS}")
+
+        self.kind              = kind
+        self.max_workers       = max_workers or min(7, os.cpu_count() or 1)
+        self.technique_timeout = technique_timeout or None
+        self.preload           = tuple(preload or ())
+        self.shared_memory     = shared_memory
+        self.shm_min_bytes     = shm_min_bytes
+        self.inline_below      = inline_below
+        self.recycled          = 0
+        self._pool: Optional[Executor] = None
+        self._pool_lock        = threading.Lock()
+        # (pool, its abandoned futures) for retired pools still running them
+        self._retired: List[Tuple[Executor, List[Future]]] = []
+
+    @classmethod
+    def from_env(cls) -> "DetectorExecutor":
+        from ml_engine import parse_preload
+
+        return cls(
+            kind              = os.environ.get("FORGE_POOL_KIND", "process"),
+            max_workers       = int(os.environ.get("FORGE_POOL_SIZE", "0")) or None,
+            technique_timeout = float(os.environ.get("FORGE_TECH_TIMEOUT", "0")) or None,
+            preload           = parse_preload(os.environ.get("FORGE_PRELOAD")),
+            shared_memory     = os.environ.get("FORGE_SHM", "1") != "0",
+            shm_min_bytes     = int(os.environ.get("FORGE_SHM_MIN_KB", "64")) << 10,
+            inline_below      = int(os.environ.get("FORGE_POOL_MIN_SAMPLES", "512")),
+        )
+
+    def runs_inline(self, techniques: List[str], data: np.ndarray) -> bool:
+        """Whether map_solo fits `techniques` on `data` in the calling thread."""
+        return (self.kind == "inline" or len(techniques) <= 1
+                or data.shape[-1] < self.inline_below)
+
+    def _shares(self, data: np.ndarray) -> bool:
+        """Whether a fan-out over `data` goes through shared memory."""
+        return (self.kind == "process" and self.shared_memory
+                and data.nbytes >= self.shm_min_bytes)
+
+    def _get_pool(self) -> Executor:
+        # Created lazily so importing main.py never forks workers.
+        with self._pool_lock:
+            return self._create_pool()
+
+    def _create_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                if self.shared_memory:
+                    shared_buffers.ensure_tracker()
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_warm_worker,
+                    initargs=(self.preload,)
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="forge-detector"
+                )
+        return self._pool
+
+    def _retire(self, pool: Executor, abandoned: List[Future]):
+        """
+        Stop handing out `pool`, whose workers are stuck on `abandoned`
+        timed-out tasks; see the class docstring for the cap.
+        """
+        with self._pool_lock:
+            self._retired = [(p, fs) for p, fs in self._retired
+                             if not all(f.done() for f in fs)]
+            for entry in self._retired:
+                if entry[0] is pool:
+                    entry[1].extend(abandoned)
+                    return
+            if self._pool is not pool:
+                return
+            if self.kind == "thread" and len(self._retired) >= self.MAX_RETIRED_POOLS:
+                print(f"[ML Engine] {len(self._retired)} retired thread pools still busy — "
+                      f"keeping the current pool")
+                return
+
+            self._pool = None
+            pool.shutdown(wait=False)
+            self._retired.append((pool, list(abandoned)))
+            self.recycled += 1
+            metrics.inc("forge_pool_recycled_total", kind=self.kind)
+            while len(self._retired) > self.MAX_RETIRED_POOLS:
+                oldest, _ = self._retired.pop(0)
+                self._terminate(oldest)
+
+    @staticmethod
+    def _terminate(pool: Executor):
+        """Kill a process pool's workers (its pending futures fail as broken)."""
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+
+    def warm_up(self):
+        """
+        Start every process worker now (each runs _warm_worker) so the
+        first hybrid request does not pay worker start-up and imports.
+        """
+        if self.kind != "process":
+            return
+        pool = self._get_pool()
+        for future in [pool.submit(os.getpid) for _ in range(self.max_workers)]:
+            future.result()
+
+    def map_solo(self, engine, techniques: List[str], data: np.ndarray,
+                 deadline: Optional[float] = None,
+                 failed: Optional[List[str]] = None) -> List[np.ndarray]:
+        """
+        Run engine.run_solo for every technique and return the results
+        in input order (they are submitted heaviest cost class first).
+        Falls back to in-process execution for "inline" mode, a single
+        technique (nothing to overlap) or a signal shorter than
+        inline_below (IPC would outweigh the overlap) — unless a
+        `deadline` (perf_counter time) is given: every wait is then also
+        cut off at the deadline. Techniques that time out or fail are
+        appended to `failed` when a list is passed.
+        """
+        if self.kind == "inline" or (deadline is None and self.runs_inline(techniques, data)):
+            return [engine.run_solo(t, data) for t in techniques]
+
+        started = time.perf_counter()
+        pool    = self._get_pool()
+        order   = engine.techniques.by_cost(dict.fromkeys(techniques), heaviest_first=True)
+
+        arena   = SharedArena() if self._shares(data) else None
+        futures = {}
+        try:
+            if arena is not None:
+                raw    = arena.copy_of(data)
+                out    = arena.empty((len(order), len(data)), engine.dtype)
+                rows   = {t: k for k, t in enumerate(order)}
+                submit = lambda t: pool.submit(_run_solo_shared, t, raw.handle, out.handle, rows[t])
+                fetch  = lambda t, _: out.array[rows[t]].copy()
+            elif self.kind == "process":
+                submit = lambda t: pool.submit(_run_solo_task, t, data)
+                fetch  = lambda t, result: result
+            else:
+                submit = lambda t: pool.submit(engine.run_solo, t, data)
+                fetch  = lambda t, result: result
+
+            # Longest-processing-time order: heavy fits (iso_forest) start
+            # first so cheap numpy techniques fill the remaining slots
+            # instead of leaving one long fit running alone at the end
+            futures = {t: submit(t) for t in order}
+
+            results   = []
+            abandoned = []
+            for technique in techniques:
+                future  = futures[technique]
+                outcome = "ok"
+                timeout = self.technique_timeout
+                if deadline is not None:
+                    left    = max(0.0, deadline - time.perf_counter())
+                    timeout = left if timeout is None else min(timeout, left)
+                try:
+                    results.append(fetch(technique, future.result(timeout=timeout)))
+                except FutureTimeout:
+                    if not future.cancel():
+                        abandoned.append(future)
+                    print(f"[ML Engine] Technique timeout [{technique}]: "
+                          f"exceeded {round(timeout, 3)}s")
+                    results.append(data.copy())
+                    outcome = "timeout"
+                except Exception as e:
+                    print(f"[ML Engine] Worker error [{technique}]: {str(e)}")
+                    results.append(data.copy())
+                    outcome = "error"
+                if outcome != "ok" and failed is not None:
+                    failed.append(technique)
+                # Wall time from submission until this technique's result was collected
+                metrics.observe("forge_stage_seconds", time.perf_counter() - started,
+                                (("stage", "pool"), ("technique", technique)))
+                metrics.inc("forge_pool_tasks_total", technique=technique, outcome=outcome)
+            if abandoned:
+                self._retire(pool, abandoned)
+        finally:
+            if arena is not None:
+                _release_after(arena, futures.values())
+        return results
+
+    def map_channels(self, engine, mode: str, techniques: List[str],
+                     channels: np.ndarray) -> List[np.ndarray]:
+        """
+        run_mode for every row of a (n_channels, n) matrix, one pool task
+        per channel, results in channel order. A channel that fails or
+        times out (technique_timeout × techniques) comes back unhealed.
+        """
+        if self.kind == "inline":
+            return [_run_channel(engine, mode, techniques, row) for row in channels]
+
+        pool    = self._get_pool()
+        timeout = self.technique_timeout * max(len(techniques), 1) \
+            if self.technique_timeout else None
+
+        arena   = SharedArena() if self._shares(channels) else None
+        futures = []
+        try:
+            if arena is not None:
+                raw     = arena.copy_of(channels)
+                out     = arena.empty(raw.shape, engine.dtype)
+                futures = [pool.submit(_run_channel_shared, mode, techniques,
+                                       raw.handle, out.handle, k)
+                           for k in range(len(channels))]
+                fetch   = lambda k, _: out.array[k].copy()
+            else:
+                futures = [
+                    pool.submit(_run_channel_task, mode, techniques, row) if self.kind == "process"
+                    else pool.submit(_run_channel, engine, mode, techniques, row)
+                    for row in channels
+                ]
+                fetch   = lambda k, result: result
+
+            results   = []
+            abandoned = []
+            for k, future in enumerate(futures):
+                try:
+                    results.append(fetch(k, future.result(timeout=timeout)))
+                except FutureTimeout:
+                    if not future.cancel():
+                        abandoned.append(future)
+                    print(f"[ML Engine] Channel timeout [{k}]: exceeded {timeout}s")
+                    results.append(channels[k].copy())
+                    metrics.inc("forge_pool_tasks_total", technique="channel", outcome="timeout")
+                except Exception as e:
+                    print(f"[ML Engine] Worker error [channel {k}]: {str(e)}")
+                    results.append(channels[k].copy())
+                    metrics.inc("forge_pool_tasks_total", technique="channel", outcome="error")
+            if abandoned:
+                self._retire(pool, abandoned)
+        finally:
+            if arena is not None:
+                _release_after(arena, futures)
+        return results
+
+    def shutdown(self, wait: bool = True):
+        with self._pool_lock:
+            pools, self._retired = [p for p, _ in self._retired], []
+            if self._pool is not None:
+                pools.append(self._pool)
+                self._pool = None
+        for pool in pools:
+            pool.shutdown(wait=wait, cancel_futures=True)
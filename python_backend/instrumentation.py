@@ -0,0 +1,309 @@
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# ===========================================================
+# Prometheus-style counters and timing histograms
+# ===========================================================
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "labels", "started")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, labels: Labels):
+        self.registry = registry
+        self.name     = name
+        self.labels   = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.started, self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """
+    ============================================================
+    SIGNAL FORGE — ENGINE & API INSTRUMENTATION
+    ============================================================
+    Where does a request's time go? Engine code wraps its stages in
+
+        with timed("fit", technique):
+            ...
+
+    and the API layer counts requests, pool outcomes and cache traffic.
+    Everything is exported in Prometheus text format on /metrics:
+
+      forge_stage_seconds{stage,technique}    histogram — scr_mask,
+                                              contamination, fit, predict,
+                                              interpolate, consensus,
+                                              metrics, solo (whole technique)
+      forge_http_requests_total{method,path,status}
+      forge_http_request_seconds{method,path} histogram
+      forge_pool_tasks_total{technique,outcome}
+      forge_*                                 gauges from registered
+                                              collectors (cache, streams, ...)
+
+    Disabled (the default, FORGE_METRICS=0) `timed` hands back one
+    shared nullcontext and `inc` / `observe` return immediately, so the
+    instrumented hot paths cost a function call and a flag check.
+
+    Stage timings are recorded in the process that runs the stage: with
+    FORGE_POOL_KIND=process the per-stage detail of fanned-out
+    techniques stays in the workers; the parent still sees the pool
+    wall time per technique (forge_stage_seconds{stage="pool"}).
+    ============================================================
+    """
+
+    def __init__(self, enabled: bool = False, buckets=LATENCY_BUCKETS):
+        self.enabled  = enabled
+        self.buckets  = tuple(buckets)
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], List] = {}
+        self._collectors: List[Callable[[], Dict[str, float]]] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "MetricsRegistry":
+        return cls(enabled=os.environ.get("FORGE_METRICS", "0").lower() in ("1", "true", "yes"))
+
+    # ===========================================================
+    # Recording
+    # ===========================================================
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def observe(self, name: str, seconds: float, labels: Labels = ()):
+        if not self.enabled:
+            return
+        key = (name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                # [per-bucket counts..., +Inf count, sum]
+                hist = self._histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            hist[bisect_left(self.buckets, seconds)] += 1
+            hist[-1] += seconds
+
+    def timer(self, name: str, **labels: str):
+        if not self.enabled:
+            return _DISABLED
+        return _Timer(self, name, tuple(sorted(labels.items())))
+
+    def stage(self, stage: str, technique: str = ""):
+        """Time one engine stage into forge_stage_seconds."""
+        if not self.enabled:
+            return _DISABLED
+        return _Timer(self, "forge_stage_seconds", (("stage", stage), ("technique", technique)))
+
+    def register_collector(self, collector: Callable[[], Dict[str, float]]):
+        """`collector()` → {metric_name: value}, exported as gauges on every scrape."""
+        self._collectors.append(collector)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # ===========================================================
+    # Exposition
+    # ===========================================================
+
+    @staticmethod
+    def _labels(labels: Labels, extra: str = "") -> str:
+        parts = [f'{k}="{str(v)}"' for k, v in labels]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            counters   = sorted(self._counters.items())
+            histograms = sorted((k, list(v)) for k, v in self._histograms.items())
+
+        lines, typed = [], set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{self._labels(labels)} {value:g}")
+
+        for (name, labels), hist in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, count in zip(self.buckets, hist):
+                cumulative += count
+                le = 'le="%g"' % bound
+                lines.append(f"{name}_bucket{self._labels(labels, le)} {cumulative}")
+            cumulative += hist[len(self.buckets)]
+            le = 'le="+Inf"'
+            lines.append(f"{name}_bucket{self._labels(labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{self._labels(labels)} {hist[-1]:.9g}")
+            lines.append(f"{name}_count{self._labels(labels)} {cumulative}")
+
+        for collector in self._collectors:
+            try:
+                gauges = collector()
+            except Exception as e:
+                print(f"[Metrics] Collector failed: {str(e)}")
+                continue
+            for name, value in gauges.items():
+                if value is None:
+                    continue
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {float(value):g}")
+
+        lines.append(f"forge_metrics_enabled {int(self.enabled)}")
+        return "\n".join(lines) + "\n"
+
+
+_DISABLED = nullcontext()
+
+metrics = MetricsRegistry.from_env()
+timed   = metrics.stage
+
+
+# ===========================================================
+# Opt-in per-request profiling (X-Forge-Profile header)
+# ===========================================================
+
+_active_profile: contextvars.ContextVar = contextvars.ContextVar("forge_profile", default=None)
+
+
+class RequestProfiles:
+    """
+    cProfile capture for single requests. The API marks a request as
+    profiled (X-Forge-Profile: 1); every run_blocking call it makes then
+    runs under that request's profiler in the worker thread. The report
+    is kept in a small LRU and fetched by id from /metrics/profiles/{id}.
+
+    Only the request's own worker thread is profiled: detectors fanned
+    out to the DetectorExecutor pool show up as time waiting on futures
+    (use FORGE_POOL_KIND=inline to see inside them).
+
+    Profiled calls are serialised — only one profiler may be active per
+    interpreter on newer Pythons, and this is a diagnostic, not a
+    production path. Unprofiled requests never touch the lock.
+    """
+
+    def __init__(self, keep: int = 16, top: int = 40):
+        self.keep     = keep
+        self.top      = top
+        self._reports: "OrderedDict[str, str]" = OrderedDict()
+        self._run_lock = threading.Lock()
+
+    def begin(self) -> Tuple[str, cProfile.Profile, contextvars.Token]:
+        profile_id = uuid.uuid4().hex[:12]
+        profiler   = cProfile.Profile()
+        return profile_id, profiler, _active_profile.set(profiler)
+
+    def end(self, profile_id: str, profiler: cProfile.Profile, token: contextvars.Token):
+        _active_profile.reset(token)
+        out = io.StringIO()
+        stats = pstats.Stats(profiler, stream=out)
+        if stats.total_calls:
+            stats.sort_stats("cumulative").print_stats(self.top)
+        else:
+            out.write("No engine work was profiled for this request.\n")
+        self._reports[profile_id] = out.getvalue()
+        while len(self._reports) > self.keep:
+            self._reports.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[str]:
+        return self._reports.get(profile_id)
+
+    @staticmethod
+    def current() -> Optional[cProfile.Profile]:
+        return _active_profile.get()
+
+    def wrap(self, profiler: cProfile.Profile, func: Callable) -> Callable:
+        """`func` as a callable that runs under `profiler` (for executor threads)."""
+        def run(*args):
+            with self._run_lock:
+                return profiler.runcall(func, *args)
+        return run
+
+
+profiles = RequestProfiles()
+
+
+# ===========================================================
+# ASGI middleware — per-endpoint counters and profile capture
+# ===========================================================
+
+class InstrumentationMiddleware:
+    """
+    Counts and times every HTTP request by route template (so
+    /batch/{job_id} is one series, not one per job) and, when the
+    request carries `X-Forge-Profile: 1`, captures a cProfile of its
+    engine work and answers with an `X-Forge-Profile-Id` header.
+
+    Plain ASGI rather than BaseHTTPMiddleware: with metrics disabled
+    and no profile header, a request costs one header scan.
+    """
+
+    PROFILE_HEADER = b"x-forge-profile"
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        profile = any(k == self.PROFILE_HEADER and v not in (b"", b"0")
+                      for k, v in scope.get("headers", ()))
+        if not metrics.enabled and not profile:
+            return await self.app(scope, receive, send)
+
+        status  = [500]
+        capture = profiles.begin() if profile else None
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                if capture is not None:
+                    message = dict(message)
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-forge-profile-id", capture[0].encode())
+                    ]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if capture is not None:
+                profiles.end(*capture)
+            route = scope.get("route")
+            path  = getattr(route, "path", None) or "unmatched"
+            metrics.inc("forge_http_requests_total",
+                        method=scope["method"], path=path, status=str(status[0]))
+            metrics.observe("forge_http_request_seconds", time.perf_counter() - started,
+                            (("method", scope["method"]), ("path", path)))
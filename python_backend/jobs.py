@@ -0,0 +1,290 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from executor import _run_subject_task
+
+
+class BatchJob:
+    """State of one uploaded subject file as it moves through the pool."""
+
+    STATES = ("queued", "running", "done", "cancelled", "failed")
+
+    def __init__(self, job_id: str, workdir: str, mode: str,
+                 techniques: List[str], column: str):
+        self.id         = job_id
+        self.workdir    = workdir
+        self.mode       = mode
+        self.techniques = techniques
+        self.column     = column
+        self.status     = "queued"
+        self.total      = 0
+        self.completed  = 0
+        self.metrics: Dict[str, Dict[str, float]] = {}
+        self.error: Optional[str] = None
+        self.created    = time.time()
+        self.finished: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def input_path(self) -> str:
+        return os.path.join(self.workdir, "input.csv")
+
+    @property
+    def result_path(self) -> str:
+        return os.path.join(self.workdir, "refined.csv")
+
+    @property
+    def metrics_path(self) -> str:
+        return os.path.join(self.workdir, "metrics.csv")
+
+    def summary(self) -> dict:
+        return {
+            "job_id":     self.id,
+            "status":     self.status,
+            "progress":   round(self.completed / self.total, 4) if self.total else 0.0,
+            "subjects":   {"done": self.completed, "total": self.total},
+            "mode":       self.mode,
+            "algorithms": self.techniques,
+            "error":      self.error,
+            "metrics":    self.metrics if self.status == "done" else None,
+        }
+
+
+class BatchJobManager:
+    """
+    ============================================================
+    SIGNAL FORGE — SUBJECT-FILE BATCH JOBS
+    ============================================================
+    Whole study files (e.g. EDA_GROUP_02_MESSY.csv, several User_IDs ×
+    1000 windows) are cleaned server-side instead of being split and
+    posted to /analyze subject by subject from a browser tab.
+
+      1. upload is streamed to a job directory on disk
+      2. the file is read back in CHUNK_ROWS-row chunks, keeping only
+         User_ID and the signal column, grouped by User_ID (file order
+         preserved)
+      3. every subject runs run_solo/run_hybrid + calculate_metrics in
+         a worker process (FORGE_BATCH_WORKERS)
+      4. output, streamed chunk by chunk again: the input rows +
+         EDA_Refined column, and one metrics row per subject
+
+    Progress is polled per job; cancel() drops all subjects that have
+    not started yet and marks the job cancelled. A cancelled job only
+    turns terminal once its in-flight file I/O has returned, so purge()
+    (which waits for that) never deletes a directory still being
+    written. Finished jobs are evicted, files included, `ttl` seconds
+    after they finish (FORGE_BATCH_TTL_SECS) or oldest-first beyond
+    `max_jobs` (FORGE_BATCH_MAX_JOBS).
+    ============================================================
+    """
+
+    CHUNK_ROWS = 65536
+
+    def __init__(self, root: Optional[str] = None, max_workers: Optional[int] = None,
+                 ttl: float = 3600.0, max_jobs: int = 256):
+        self.root        = root or os.path.join(tempfile.gettempdir(), "signal_forge_jobs")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.ttl         = ttl
+        self.max_jobs    = max(1, max_jobs)
+        self.jobs: Dict[str, BatchJob] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def from_env(cls) -> "BatchJobManager":
+        return cls(
+            root        = os.environ.get("FORGE_BATCH_DIR") or None,
+            max_workers = int(os.environ.get("FORGE_BATCH_WORKERS", "0")) or None,
+            ttl         = float(os.environ.get("FORGE_BATCH_TTL_SECS", "3600")),
+            max_jobs    = int(os.environ.get("FORGE_BATCH_MAX_JOBS", "256")),
+        )
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        self._evict()
+        return self.jobs.get(job_id)
+
+    def _evict(self):
+        """Drop finished jobs past the TTL, then the oldest beyond max_jobs."""
+        now      = time.time()
+        finished = sorted((j for j in self.jobs.values() if j.finished is not None),
+                          key=lambda j: j.finished)
+        excess   = len(self.jobs) - self.max_jobs
+        for job in finished:
+            if excess <= 0 and now - job.finished <= self.ttl:
+                break
+            self._discard(job)
+            excess -= 1
+
+    def _discard(self, job: BatchJob):
+        self.jobs.pop(job.id, None)
+        shutil.rmtree(job.workdir, ignore_errors=True)
+
+    # ===========================================================
+    # Submission
+    # ===========================================================
+
+    async def submit(self, upload, mode: str, techniques: List[str],
+                     column: str = "EDA_Mean") -> BatchJob:
+        """
+        `upload` is any object with an async read(size) (FastAPI
+        UploadFile); it is copied to disk in 1 MB chunks.
+        """
+        self._evict()
+        job_id  = uuid.uuid4().hex
+        workdir = os.path.join(self.root, job_id)
+        os.makedirs(workdir, exist_ok=True)
+        job = BatchJob(job_id, workdir, mode, techniques, column)
+
+        loop = asyncio.get_running_loop()
+        with open(job.input_path, "wb") as out:
+            while True:
+                block = await upload.read(1 << 20)
+                if not block:
+                    break
+                await loop.run_in_executor(None, out.write, block)
+
+        self.jobs[job_id] = job
+        job.task = asyncio.create_task(self._run(job))
+        return job
+
+    # ===========================================================
+    # Execution
+    # ===========================================================
+
+    @staticmethod
+    async def _io(func, *args):
+        """
+        File I/O on the default thread pool that a cancelled job does not
+        abandon: the cancellation is re-raised only after `func` returns.
+        """
+        fut = asyncio.get_running_loop().run_in_executor(None, func, *args)
+        try:
+            return await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            await asyncio.wait([fut])
+            raise
+
+    async def _run(self, job: BatchJob):
+        loop = asyncio.get_running_loop()
+        futures: List[asyncio.Future] = []
+        try:
+            subjects, n_rows = await self._io(self._scan_subjects, job)
+            groups     = list(subjects.items())
+            job.total  = len(groups)
+            job.status = "running"
+
+            pool = self._get_pool()
+
+            async def run_subject(k: int, values: np.ndarray):
+                result = await loop.run_in_executor(
+                    pool, _run_subject_task, job.mode, job.techniques, values
+                )
+                return k, result
+
+            for k, (_, (_, values)) in enumerate(groups):
+                futures.append(asyncio.ensure_future(run_subject(k, values)))
+
+            # Rows without a User_ID belong to no subject and stay NaN
+            refined = np.full(n_rows, np.nan)
+            for fut in asyncio.as_completed(futures):
+                k, (subject_refined, metrics) = await fut
+                user_id, (rows, _) = groups[k]
+                refined[rows] = subject_refined
+                job.metrics[user_id] = metrics
+                job.completed += 1
+
+            job.metrics = {u: job.metrics[u] for u, _ in groups}   # file order
+            await self._io(self._write_outputs, job, refined)
+            job.status = "done"
+        except asyncio.CancelledError:
+            for f in futures:
+                f.cancel()
+            job.status = "cancelled"
+        except Exception as e:
+            for f in futures:
+                f.cancel()
+            job.status = "failed"
+            job.error  = str(e)
+        finally:
+            job.finished = time.time()
+
+    def _scan_subjects(self, job: BatchJob) -> Tuple[Dict[str, Tuple[np.ndarray, np.ndarray]], int]:
+        """
+        One chunked pass over the upload reading only User_ID and the
+        signal column → ({user_id: (row numbers, values)} in file order,
+        total rows).
+        """
+        import pandas as pd
+
+        header = pd.read_csv(job.input_path, nrows=0).columns
+        if "User_ID" not in header or job.column not in header:
+            raise ValueError(f"CSV must contain 'User_ID' and '{job.column}' columns")
+
+        rows: Dict[str, List[np.ndarray]] = {}
+        values: Dict[str, List[np.ndarray]] = {}
+        offset = 0
+        for chunk in pd.read_csv(job.input_path, usecols=["User_ID", job.column],
+                                 dtype={"User_ID": str}, chunksize=self.CHUNK_ROWS):
+            signal = chunk[job.column].to_numpy(dtype=float)
+            for user_id, idx in chunk.groupby("User_ID", sort=False).indices.items():
+                rows.setdefault(user_id, []).append(idx + offset)
+                values.setdefault(user_id, []).append(signal[idx])
+            offset += len(chunk)
+
+        return {u: (np.concatenate(rows[u]), np.concatenate(values[u])) for u in rows}, offset
+
+    def _write_outputs(self, job: BatchJob, refined: np.ndarray):
+        import pandas as pd
+
+        offset = 0
+        with open(job.result_path, "w", newline="") as out:
+            for chunk in pd.read_csv(job.input_path, chunksize=self.CHUNK_ROWS):
+                chunk["EDA_Refined"] = refined[offset:offset + len(chunk)]
+                chunk.to_csv(out, index=False, header=(offset == 0))
+                offset += len(chunk)
+        pd.DataFrame.from_dict(job.metrics, orient="index") \
+          .rename_axis("User_ID").reset_index() \
+          .to_csv(job.metrics_path, index=False)
+
+    # ===========================================================
+    # Control
+    # ===========================================================
+
+    def cancel(self, job_id: str) -> Optional[BatchJob]:
+        job = self.jobs.get(job_id)
+        if job is not None and job.task is not None and not job.task.done():
+            job.task.cancel()
+        return job
+
+    async def purge(self, job_id: str) -> bool:
+        """
+        Cancel if still running, wait until the job is terminal (its
+        in-flight file I/O has returned), then delete the job's files.
+        """
+        job = self.cancel(job_id)
+        if job is None:
+            return False
+        if job.task is not None:
+            await asyncio.wait([job.task])
+        self._discard(job)
+        return True
+
+    def shutdown(self):
+        for job in self.jobs.values():
+            if job.task is not None and not job.task.done():
+                job.task.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
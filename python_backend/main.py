@@ -1,59 +1,295 @@
-from fastapi import FastAPI, HTTPException
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import (
+    FastAPI, File, Form, HTTPException, Query, Request, UploadFile, WebSocket, WebSocketDisconnect
+)
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import List, Optional, Union
+from contextlib import asynccontextmanager
+import asyncio
+import heapq
+import json
 import numpy as np
 import os
-from ml_engine import engine
+from ml_engine import (
+    detector_implementation, detector_signature, engine, loaded_backends, parse_preload, preload_backends
+)
+from executor import DetectorExecutor
+import shared_buffers
+from streaming import StreamRegistry, StreamingSSA, decode_frame, encode_frame
+from telemetry import TelemetrySink
+from vault import ExportFilter, parse_timestamp
+from jobs import BatchJobManager
+from result_cache import ResultCache
+from model_registry import SubjectModelRegistry
+from instrumentation import InstrumentationMiddleware, metrics, profiles
+from techniques import COST_CHEAP, UnknownTechnique
+from binary_io import (
+    ARROW_STREAM, OCTET_STREAM, decode_signal, encode_signal, is_binary, parse_channels, wants_binary
+)
+
+# Detector backends (sklearn) are imported on first use. FORGE_PRELOAD
+# ("all" or "gmm,lof,...") loads them ahead of time: FORGE_PRELOAD_AT=import
+# does it here, before any fork (gunicorn --preload workers inherit warm
+# modules); "startup" (default) does it in the background once serving.
+PRELOAD    = parse_preload(os.environ.get("FORGE_PRELOAD"))
+PRELOAD_AT = os.environ.get("FORGE_PRELOAD_AT", "startup")
+if PRELOAD and PRELOAD_AT == "import":
+    preload_backends(PRELOAD)
+
+startup_seconds: Optional[float] = None
+
+# Detector fan-out pool for hybrid / benchmark runs (see executor.py)
+engine.executor = DetectorExecutor.from_env()
+
+# Content-addressed cache of refined arrays / metrics / leaderboards
+# (keyed by engine version + native detector selection + precision)
+result_cache = ResultCache.from_env(
+    f"{engine.ENGINE_VERSION}+{detector_signature()}+{engine.precision}"
+)
 
-app = FastAPI(title="Signal Forge Forensic Lab Backend")
+# Warm per-subject detectors for calls that carry a subject / session id
+subject_models = SubjectModelRegistry.from_env(engine)
+
+# Server-side subject-file jobs (see jobs.py)
+batch_jobs = BatchJobManager.from_env()
+
+# Per-sensor CUL-v4 streaming state for the live monitor loop
+streams = StreamRegistry(engine, window=int(os.environ.get("FORGE_STREAM_WINDOW", "31")))
+# ...and incremental rank-1 SSA state for solo "pca" streams
+pca_streams = StreamRegistry(engine, window=streams.window, stream_cls=StreamingSSA)
+# Solo live sessions of a streaming-capable technique (registry flag)
+# are served per sample from these; everything else re-runs on the window
+live_streams = {"cul": streams, "pca": pca_streams}
+
+def _warm_start():
+    if PRELOAD_AT == "startup":
+        preload_backends(PRELOAD)
+    engine.executor.warm_up()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global startup_seconds
+    await telemetry.start()
+    if PRELOAD:
+        # Live CUL streams are served while the heavy imports finish.
+        # One task, in order: forking pool workers while another thread
+        # is mid-import could leave a child holding the import lock.
+        asyncio.get_running_loop().run_in_executor(None, _warm_start)
+    startup_seconds = time.perf_counter() - _IMPORT_STARTED
+    yield
+    await telemetry.stop()
+    batch_jobs.shutdown()
+    engine.executor.shutdown(wait=False)
+
+app = FastAPI(title="Signal Forge Forensic Lab Backend", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Forge-Profile-Id"],
 )
+# Per-endpoint counters / timings and X-Forge-Profile capture (see instrumentation.py)
+app.add_middleware(InstrumentationMiddleware)
 
 class AnalysisInput(BaseModel):
-    raw_data: List[float]
+    raw_data: Union[List[float], List[List[float]]]  # one signal, or (n_channels, n_samples)
     mode: str  # "solo" or "hybrid"
     techniques: List[str] # List of algorithms to use
+    segment_length: Optional[int] = None  # overlapping-window mode for long recordings
+    segment_overlap: int = 256
+    subject_id: Optional[str] = None  # reuse this subject's warm detectors
+
+class CalibrationInput(BaseModel):
+    raw_data: List[float]
+    techniques: List[str]
 
 class BenchmarkInput(BaseModel):
     raw_data: List[float]
 
+async def run_blocking(func, *args):
+    """Run CPU-bound engine work off the event loop so other callers keep flowing."""
+    loop = asyncio.get_running_loop()
+    profiler = profiles.current()
+    if profiler is not None:
+        func = profiles.wrap(profiler, func)   # X-Forge-Profile request
+    return await loop.run_in_executor(None, func, *args)
+
+def _techniques_or_400(techs: List[str]) -> List[str]:
+    try:
+        return engine.techniques.validate(techs)
+    except UnknownTechnique as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _worth_caching(mode: str, techs: List[str]) -> bool:
+    """
+    Only results that involve a model fit go into the result cache;
+    cheap numpy techniques recompute in about the time a lookup takes
+    and would only push fitted leaderboards out of the LRU.
+    """
+    used = (techs[:1] or ["cul"]) if mode == "solo" else techs
+    return engine.techniques.max_cost(used) > COST_CHEAP
+
+async def cached(key_parts: tuple, func, *args):
+    """run_blocking behind the result cache (key: kind, raw array, params...)."""
+    if result_cache is None:
+        return await run_blocking(func, *args)
+    key = result_cache.key(*key_parts)
+    hit = result_cache.get(key)
+    if hit is not None:
+        return hit
+    return result_cache.put(key, await run_blocking(func, *args))
+
+def _precision_report(endpoint: str, raw_array: np.ndarray, rows: int) -> dict:
+    """
+    Memory estimate for a request whose signal-sized working set is
+    `rows` arrays like raw_array (input, solo stack, output) at the
+    engine's precision — computed from sizes, not measured; the
+    estimated saving is also counted for /metrics.
+    """
+    report = engine.precision_report(raw_array.size * rows)
+    metrics.inc("forge_precision_estimated_bytes_saved_total",
+                report["estimated_bytes_saved"], endpoint=endpoint)
+    return report
+
+def _analyze_job(mode: str, techniques: List[str], raw_array: np.ndarray,
+                 segment_length: Optional[int] = None, segment_overlap: int = 256,
+                 subject_id: Optional[str] = None):
+    if raw_array.ndim == 2:
+        if segment_length:
+            refined_array = np.array([
+                engine.run_segmented(mode, techniques, row, segment_length, segment_overlap)
+                for row in raw_array
+            ])
+        else:
+            refined_array = engine.run_mode_channels(mode, techniques, raw_array)
+        return refined_array, engine.calculate_metrics_rows(raw_array, refined_array)
+
+    if segment_length:
+        refined_array = engine.run_segmented(mode, techniques, raw_array,
+                                             segment_length, segment_overlap)
+    elif subject_id is not None and subject_models is not None:
+        refined_array = subject_models.run_mode(subject_id, mode, techniques, raw_array)
+    else:
+        refined_array = engine.run_mode(mode, techniques, raw_array)
+
+    # Calculate Auditor Metrics
+    metrics = engine.calculate_metrics(raw_array, refined_array)
+    return refined_array, metrics
+
 @app.get("/")
 def read_root():
     return {"status": "Forensic Lab Node Active", "version": "4.0.0"}
 
-@app.post("/analyze")
-async def analyze(input_data: AnalysisInput):
+def _binary_body_doc(model) -> dict:
+    """OpenAPI: the JSON model plus the two raw-signal encodings."""
+    binary = {"schema": {"type": "string", "format": "binary"}}
+    return {"requestBody": {"required": True, "content": {
+        "application/json": {"schema": model.model_json_schema()},
+        OCTET_STREAM: binary,
+        ARROW_STREAM: binary,
+    }}}
+
+async def _read_input(request: Request, model):
+    """
+    Content negotiation for signal-bearing endpoints. Binary bodies
+    return (None, array); JSON bodies are validated into `model` exactly
+    as FastAPI would and return (parsed, array).
+    """
+    body = await request.body()
+    if is_binary(request.headers.get("content-type")):
+        return None, decode_signal(body, request.headers.get("content-type"),
+                                   request.headers.get("X-Forge-Dtype"),
+                                   parse_channels(request.headers.get("X-Forge-Channels")),
+                                   engine.dtype)
+    try:
+        parsed = model.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    try:
+        return parsed, np.array(parsed.raw_data, dtype=engine.dtype)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="All channels in raw_data must have the same length.")
+
+@app.post("/analyze", openapi_extra=_binary_body_doc(AnalysisInput))
+async def analyze(request: Request, mode: str = "solo", techniques: Optional[str] = None,
+                  segment_length: Optional[int] = None, segment_overlap: int = 256,
+                  subject_id: Optional[str] = None):
     """
     Main entry point for both live and batch forensic analysis.
+
+    raw_data may be a single signal or an (n_channels, n_samples)
+    matrix (binary bodies: X-Forge-Channels); multi-channel calls return
+    a matching matrix and one metrics dict per channel.
+
+    Binary bodies (application/octet-stream, Arrow IPC) take mode,
+    techniques and segmentation from the query string; `Accept` picks a
+    binary response with the metrics in the X-Forge-Metrics header /
+    Arrow metadata. segment_length switches long recordings to the
+    overlapping-window engine mode (run_segmented). subject_id reuses
+    that subject's warm detectors (fit once, predict until drift)
+    instead of refitting; such results depend on model state and are
+    not cached (nor are results of cheap numpy-only techniques).
+    Unknown technique names are rejected with 400.
     """
+    input_data, raw_array = await _read_input(request, AnalysisInput)
+    if input_data is not None:
+        mode, techs = input_data.mode, input_data.techniques
+        segment_length  = input_data.segment_length
+        segment_overlap = input_data.segment_overlap
+        subject_id      = input_data.subject_id
+    else:
+        techs = [t for t in (techniques or "").split(",") if t]
+    _techniques_or_400(techs)
+    if segment_length is not None and segment_length < 3:
+        raise HTTPException(status_code=400, detail="segment_length must be at least 3 samples.")
+    if raw_array.ndim == 2 and subject_id is not None:
+        raise HTTPException(status_code=400, detail="subject_id applies to single-channel input only.")
+    segmentation = (segment_length, segment_overlap) if segment_length else None
+
     try:
-        raw_array = np.array(input_data.raw_data)
-        
-        if input_data.mode == "solo":
-            tech = input_data.techniques[0] if input_data.techniques else "cul"
-            refined_array = engine.run_solo(tech, raw_array)
+        if subject_id is not None and not segmentation:
+            refined_array, metrics = await run_blocking(
+                _analyze_job, mode, techs, raw_array, None, segment_overlap, subject_id
+            )
+        elif not _worth_caching(mode, techs):
+            refined_array, metrics = await run_blocking(
+                _analyze_job, mode, techs, raw_array, segment_length, segment_overlap
+            )
         else:
-            refined_array = engine.run_hybrid(input_data.techniques, raw_array)
-        
-        # Calculate Auditor Metrics
-        metrics = engine.calculate_metrics(raw_array, refined_array)
-        
-        return {
-            "refined_data": refined_array.tolist(),
-            "metrics": metrics,
-            "mode_used": input_data.mode,
-            "algorithms": input_data.techniques
-        }
+            refined_array, metrics = await cached(
+                ("analyze", raw_array, mode, techs, segmentation, raw_array.shape),
+                _analyze_job, mode, techs, raw_array, segment_length, segment_overlap
+            )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    # input + output, plus the solo stack an ensemble votes over
+    precision = _precision_report("/analyze", raw_array,
+                                  2 + (len(techs) if mode != "solo" else 0))
+    binary = wants_binary(request.headers.get("accept"))
+    if binary:
+        return encode_signal(refined_array, binary, metrics,
+                             request.headers.get("X-Forge-Dtype"),
+                             headers={"X-Forge-Mode": mode,
+                                      "X-Forge-Algorithms": ",".join(techs),
+                                      "X-Forge-Precision": precision["precision"],
+                                      "X-Forge-Bytes-Saved-Estimate":
+                                          str(precision["estimated_bytes_saved"])})
+    return {
+        "refined_data": refined_array.tolist(),
+        "metrics": metrics,
+        "mode_used": mode,
+        "algorithms": techs,
+        "precision": precision
+    }
+
 class TelemetryLog(BaseModel):
     User_ID: str
     Age: str
@@ -70,66 +306,470 @@ class TelemetryLog(BaseModel):
     Motion: float
     Timestamp: str
 
+TELEMETRY_PATH = "telemetry_database.csv"
+
+# Buffered single-writer sink for the Forensic Vault (see telemetry.py)
+telemetry = TelemetrySink.from_env(
+    TELEMETRY_PATH,
+    {name: field.annotation for name, field in TelemetryLog.model_fields.items()}
+)
+
 @app.post("/log_telemetry")
 async def log_telemetry(data: TelemetryLog):
     """
     Automatically appends telemetry features to a persistent CSV for ML training.
     """
-    import pandas as pd
-    import os
-    
-    file_path = "telemetry_database.csv"
-    new_row = data.dict()
-    df = pd.DataFrame([new_row])
-    
-    # Append to CSV, create header only if file is new
-    header = not os.path.exists(file_path)
-    df.to_csv(file_path, mode='a', index=False, header=header)
-    
-    return {"status": "Logged", "file": file_path}
+    telemetry.submit([data.dict()])
+    return {"status": "Logged", "file": telemetry.vault.location}
 
-@app.post("/benchmark")
-async def benchmark(input_data: BenchmarkInput):
+@app.post("/log_telemetry_batch")
+async def log_telemetry_batch(rows: List[TelemetryLog]):
+    """
+    Bulk variant of /log_telemetry — many 5-second epochs in one request.
+    """
+    telemetry.submit([row.dict() for row in rows])
+    return {"status": "Logged", "rows": len(rows), "file": telemetry.vault.location}
+
+# Metrics the auditor leaderboard shows (SMOOTH% / CLEAN / STAB)
+BENCHMARK_SUMMARY_METRICS = ("smoothness_score", "noise_suppression", "stability_index")
+BENCHMARK_STREAM_FORMATS  = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+def _summarize_entry(entry: dict) -> dict:
+    return {**entry, "metrics": {k: entry["metrics"][k] for k in BENCHMARK_SUMMARY_METRICS}}
+
+async def _benchmark_events(raw_array: np.ndarray, top_k: int, summary: bool):
+    """
+    (event, payload) pairs while the auditor runs: one "result" per
+    combination as its chunk finishes, a "top" running leaderboard after
+    every chunk, then "done" (or "error"). Only the current chunk and
+    the top_k heap are held, never the full leaderboard.
+    """
+    chunks    = engine.iter_brute_force_benchmark(raw_array)
+    total     = 2 ** len(engine.techniques.names()) - 1
+    heap      = []   # (score, -index, entry): min-heap of the running top_k
+    evaluated = 0
+
+    def leaderboard() -> List[dict]:
+        # Score, then combination order — the same order as the full list
+        return [entry for _, _, entry in sorted(heap, reverse=True)]
+
+    try:
+        while True:
+            chunk = await run_blocking(next, chunks, None)
+            if chunk is None:
+                break
+            for entry in chunk:
+                if summary:
+                    entry = _summarize_entry(entry)
+                yield "result", {"index": evaluated, "result": entry}
+                item = (entry["total_score"], -evaluated, entry)
+                if len(heap) < top_k:
+                    heapq.heappush(heap, item)
+                elif item[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, item)
+                evaluated += 1
+            yield "top", {"evaluated": evaluated, "total": total, "top": leaderboard()}
+        yield "done", {"evaluated": evaluated, "total": total, "top": leaderboard()}
+    except Exception as e:
+        yield "error", {"detail": str(e)}
+
+async def _encode_events(events, fmt: str):
+    async for event, payload in events:
+        if fmt == "sse":
+            yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+        else:
+            yield json.dumps({"event": event, **payload}) + "\n"
+
+@app.post("/benchmark", openapi_extra=_binary_body_doc(BenchmarkInput))
+async def benchmark(request: Request, top_k: Optional[int] = None,
+                    max_evals: Optional[int] = None,
+                    time_budget_ms: Optional[float] = None,
+                    stream: Optional[str] = None, summary: bool = False):
     """
     Brute-force analysis of all 127 ML combinations.
+    Accepts the same binary signal bodies as /analyze; results stay JSON.
+
+    top_k / max_evals / time_budget_ms switch to the budgeted auditor
+    (engine.run_budgeted_benchmark): the best top_k combinations found
+    within the budget, with `exhaustive` telling whether every subset
+    was scored. max_evals counts the solos too, so it must be at least
+    the number of techniques. Deadline-bound results are not cached.
+
+    stream=ndjson|sse sends combinations as they are scored, plus a
+    running top_k (default 10) leaderboard, instead of one list at the
+    end; streamed runs bypass the result cache. summary=true keeps only
+    the leaderboard metrics (BENCHMARK_SUMMARY_METRICS) per entry.
     """
+    _, raw_array = await _read_input(request, BenchmarkInput)
+    if top_k is not None and top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be at least 1.")
+    n_techs = len(engine.techniques.names())
+    if max_evals is not None and max_evals < n_techs:
+        raise HTTPException(status_code=400,
+                            detail=f"max_evals must be at least {n_techs} (every solo technique is scored).")
+    if stream is not None:
+        if stream not in BENCHMARK_STREAM_FORMATS:
+            raise HTTPException(status_code=400, detail=f"stream must be one of {list(BENCHMARK_STREAM_FORMATS)}.")
+        if max_evals is not None or time_budget_ms is not None:
+            raise HTTPException(status_code=400, detail="stream applies to the exhaustive auditor only.")
+        return StreamingResponse(
+            _encode_events(_benchmark_events(raw_array, top_k or 10, summary), stream),
+            media_type=BENCHMARK_STREAM_FORMATS[stream],
+            headers={"Cache-Control": "no-cache"}
+        )
+    # input + the solo stack + one chunk of ensembles being scored
+    precision = _precision_report("/benchmark", raw_array, 1 + n_techs + 16)
     try:
-        raw_array = np.array(input_data.raw_data)
-        results = engine.run_brute_force_benchmark(raw_array)
-        return {"results": results}
+        if top_k is None and max_evals is None and time_budget_ms is None:
+            results = await cached(("benchmark", raw_array),
+                                   engine.run_brute_force_benchmark, raw_array)
+            if summary:
+                results = [_summarize_entry(entry) for entry in results]
+            return {"results": results, "exhaustive": True, "precision": precision}
+
+        search = (raw_array, top_k or 10, max_evals,
+                  None if time_budget_ms is None else time_budget_ms / 1000.0)
+        if time_budget_ms is None:
+            found = await cached(("benchmark_budgeted", *search[:3]),
+                                 engine.run_budgeted_benchmark, *search)
+        else:
+            found = await run_blocking(engine.run_budgeted_benchmark, *search)
+        if summary:
+            found = {**found, "results": [_summarize_entry(entry) for entry in found["results"]]}
+        return {**found, "precision": precision}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/subjects/{subject_id}/calibrate")
+async def calibrate_subject(subject_id: str, input_data: CalibrationInput):
+    """
+    Fit a subject's warm detectors on a calibration segment; later
+    /analyze calls with this subject_id only predict until drift.
+    """
+    if subject_models is None:
+        raise HTTPException(status_code=409, detail="Warm subject models are disabled (FORGE_MODEL_SUBJECTS=0).")
+    _techniques_or_400(input_data.techniques)
+    try:
+        fitted = await run_blocking(subject_models.calibrate, subject_id,
+                                    input_data.techniques, engine.as_signal(input_data.raw_data))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"subject_id": subject_id, "calibrated": fitted}
+
+@app.delete("/subjects/{subject_id}")
+async def drop_subject(subject_id: str):
+    """
+    Discard a subject's warm detectors.
+    """
+    return {"closed": subject_models is not None and subject_models.close(subject_id)}
+
+@app.get("/subjects/stats")
+async def subject_stats():
+    """
+    Warm subject count and fit / predict counters.
+    """
+    if subject_models is None:
+        return {"enabled": False}
+    return {"enabled": True, **subject_models.stats()}
+
+def _service_gauges() -> dict:
+    gauges = {
+        "forge_stream_sessions":        len(streams),
+        "forge_pca_stream_sessions":    len(pca_streams),
+        "forge_batch_jobs_running":     sum(j.status == "running" for j in batch_jobs.jobs.values()),
+        "forge_telemetry_rows_written": telemetry.rows_written,
+        "forge_telemetry_flushes":      telemetry.flushes,
+        "forge_telemetry_rows_dropped": telemetry.rows_dropped,
+        "forge_vault_compactions":      telemetry.compactions,
+        "forge_startup_seconds":        startup_seconds,
+        "forge_backends_loaded":        len(loaded_backends()),
+    }
+    for name, value in shared_buffers.stats().items():
+        gauges[f"forge_shm_{name}"] = value
+    if result_cache is not None:
+        for name, value in result_cache.stats().items():
+            if isinstance(value, (int, float)):
+                gauges[f"forge_cache_{name}"] = value
+    if subject_models is not None:
+        for name, value in subject_models.stats().items():
+            gauges[f"forge_warm_models_{name}"] = value
+    return gauges
+
+metrics.register_collector(_service_gauges)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Prometheus text exposition: per-stage engine timings, per-endpoint
+    request counters / latency, pool outcomes and service gauges.
+    Stage and request series are only recorded with FORGE_METRICS=1.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/metrics/profiles/{profile_id}", response_class=PlainTextResponse)
+async def request_profile(profile_id: str):
+    """
+    cProfile report of a request sent with `X-Forge-Profile: 1`
+    (id from its X-Forge-Profile-Id response header).
+    """
+    report = profiles.get(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profile not found (expired or never captured).")
+    return PlainTextResponse(report)
+
+@app.get("/techniques")
+async def list_techniques():
+    """
+    Registered techniques in canonical order with their declared
+    capabilities (cost class, fit, streaming, multi-channel vectorized)
+    and the detector implementation serving each one (FORGE_DETECTORS).
+    """
+    return {"techniques": [
+        {**t.capabilities(), "implementation": detector_implementation(t.name)}
+        for t in engine.techniques
+    ]}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """
+    Hit / miss / eviction counters of the engine result cache.
+    """
+    if result_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **result_cache.stats()}
+
 @app.get("/download_csv")
-async def download_csv():
+async def download_csv(
+    user_id: Optional[List[str]] = Query(None),
+    win_min: Optional[int] = None,
+    win_max: Optional[int] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    columns: Optional[str] = None,
+):
     """
     Export the persistent telemetry database for external forensic auditing.
+
+    Optional filters: repeated user_id, Win range (win_min/win_max),
+    Timestamp range (since/until) and a comma-separated column
+    projection. The CSV is streamed, never materialised in memory.
     """
-    file_path = "telemetry_database.csv"
-    if os.path.exists(file_path):
+    await telemetry.flush()
+    vault = telemetry.vault
+    if not vault.exists():
+        raise HTTPException(status_code=404, detail="Forensic Vault is empty. No data logged yet.")
+
+    time_range = tuple(parse_timestamp(t) if t else None for t in (since, until))
+    if (since and time_range[0] is None) or (until and time_range[1] is None):
+        raise HTTPException(status_code=400, detail="Unreadable since/until timestamp.")
+    selection = ExportFilter(
+        user_ids   = user_id,
+        win_range  = (win_min, win_max),
+        time_range = time_range,
+        columns    = columns.split(",") if columns else None,
+    )
+
+    if vault.kind == "csv" and selection.is_empty:
         return FileResponse(
-            path=file_path,
+            path=vault.path,
             filename="SIGNAL_FORGE_EXPORT.csv",
             media_type="text/csv"
         )
-    else:
-        raise HTTPException(status_code=404, detail="Forensic Vault is empty. No data logged yet.")
+    return StreamingResponse(
+        vault.iter_csv(selection),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="SIGNAL_FORGE_EXPORT.csv"'}
+    )
+
+# ===========================================================
+# /batch — whole subject files and multi-user groups
+# ===========================================================
+
+def _get_job(job_id: str):
+    job = batch_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown batch job '{job_id}'.")
+    return job
+
+@app.post("/batch")
+async def batch_submit(
+    file: UploadFile = File(...),
+    mode: str = Form("solo"),
+    techniques: str = Form("cul"),
+    column: str = Form("EDA_Mean"),
+):
+    """
+    Upload a subject CSV (User_ID + EDA_Mean columns); every subject is
+    refined in a worker process. Poll GET /batch/{job_id} for progress.
+    """
+    techs = _techniques_or_400([t for t in techniques.split(",") if t])
+    job = await batch_jobs.submit(file, mode, techs, column)
+    return {"job_id": job.id, "status": job.status}
+
+@app.get("/batch/{job_id}")
+async def batch_status(job_id: str):
+    return _get_job(job_id).summary()
+
+@app.get("/batch/{job_id}/result")
+async def batch_result(job_id: str, part: str = "refined"):
+    """
+    part="refined": input rows + EDA_Refined column;
+    part="metrics": one calculate_metrics row per subject.
+    """
+    job = _get_job(job_id)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Batch job is {job.status}, not done.")
+    path = job.metrics_path if part == "metrics" else job.result_path
+    return FileResponse(
+        path=path,
+        filename=f"SIGNAL_FORGE_{part.upper()}_{job.id[:8]}.csv",
+        media_type="text/csv"
+    )
+
+@app.delete("/batch/{job_id}")
+async def batch_cancel(job_id: str, purge: bool = False):
+    """
+    Cancel a running job (subjects not yet started are dropped);
+    purge=true also deletes its files.
+    """
+    job = _get_job(job_id)
+    if purge:
+        await batch_jobs.purge(job_id)
+        return {"job_id": job_id, "status": "purged"}
+    batch_jobs.cancel(job_id)
+    return {"job_id": job_id, "status": "cancelling" if job.status in ("queued", "running") else job.status}
 
 @app.post("/live_reconstruct")
 async def live_reconstruct(input_data: dict):
     """
     Legacy support for monitor page, now routes to new logic.
+
+    With a "session_id" the server keeps the window itself: clients send
+    only {"session_id", "raw_val"} per tick ("history" optionally seeds a
+    new session) and get the same CUL-v4 refined sample back in O(1).
     """
     val = input_data.get("raw_val")
     hist = input_data.get("history", [])
+    session_id = input_data.get("session_id")
+
+    if session_id is not None:
+        # Constant-time update — cheap enough to stay on the event loop
+        refined = streams.push(str(session_id), float(val), history=hist)
+        return {"refined": refined, "session_id": session_id}
     
     # Pack into a small window for the engine
     window = np.array(hist + [val])
     # For live, we default to CUL-v4 as it's the most stable for streams
-    refined = engine.run_solo("cul", window)
+    refined = await run_blocking(engine.run_solo, "cul", window)
     
     return {"refined": float(refined[-1])}
 
+@app.delete("/live_reconstruct/{session_id}")
+async def close_live_session(session_id: str):
+    """
+    Release a live sensor's streaming state when its session ends.
+    """
+    closed = [registry.close(session_id) for registry in live_streams.values()]
+    closed.append(subject_models is not None and subject_models.close(session_id))
+    return {"closed": any(closed)}
+
+# ===========================================================
+# /ws/stream — binary low-latency bridge for live sensors
+# ===========================================================
+
+STREAM_QUEUE_FRAMES = int(os.environ.get("FORGE_STREAM_QUEUE", "64"))
+STREAM_MAX_BATCH    = int(os.environ.get("FORGE_STREAM_BATCH", "32"))
+
+async def _refine_stream_batch(session_id: str, samples: np.ndarray,
+                               mode: str, techniques: List[str]) -> np.ndarray:
+    # A technique flagged streaming without a stream class here (e.g. a
+    # plugin) takes the window path below
+    live = live_streams.get(techniques[0]) if mode == "solo" else None
+    if live is not None and engine.techniques.get(techniques[0]).streaming:
+        stream = live.get(session_id)
+        return np.array([stream.push(x) for x in samples])
+
+    stream = streams.get(session_id)
+    # Model-based techniques: re-run on the session window after each
+    # window-sized slice, keep the outputs for the new samples only.
+    # The session's warm detectors predict and only refit on drift.
+    out = []
+    for start in range(0, len(samples), streams.window):
+        chunk = samples[start:start + streams.window]
+        stream.prime(chunk)
+        window  = np.array(stream.values())
+        if subject_models is not None:
+            refined = await run_blocking(subject_models.run_mode, session_id,
+                                         mode, techniques, window)
+        else:
+            refined = await run_blocking(engine.run_mode, mode, techniques, window)
+        out.append(refined[-len(chunk):])
+    return np.concatenate(out) if out else np.empty(0)
+
+@app.websocket("/ws/stream")
+async def ws_stream(websocket: WebSocket, mode: str = "solo", techniques: str = "cul"):
+    """
+    Binary streaming bridge. Each frame is
+    [u8 id_len][session id][float32 LE samples] (see streaming.py) and
+    is answered with a frame of refined samples under the same id.
+
+    Backpressure: frames queue up to FORGE_STREAM_QUEUE; when full the
+    reader stops pulling from the socket so TCP flow control slows the
+    sender. Micro-batching: everything queued while the engine was busy
+    is merged per session and refined in one pass.
+    """
+    await websocket.accept()
+    techs = [t for t in techniques.split(",") if t] or ["cul"]
+    try:
+        engine.techniques.validate(techs)
+    except UnknownTechnique as e:
+        await websocket.send_json({"error": str(e)})
+        await websocket.close(code=1008)
+        return
+    inbox: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_FRAMES)
+
+    async def reader():
+        try:
+            while True:
+                await inbox.put(await websocket.receive_bytes())
+        except (WebSocketDisconnect, KeyError, RuntimeError):
+            pass
+        finally:
+            await inbox.put(None)
+
+    reader_task = asyncio.create_task(reader())
+    try:
+        closing = False
+        while not closing:
+            frame = await inbox.get()
+            if frame is None:
+                break
+            batch = [frame]
+            while len(batch) < STREAM_MAX_BATCH and not inbox.empty():
+                frame = inbox.get_nowait()
+                if frame is None:
+                    closing = True
+                    break
+                batch.append(frame)
+
+            grouped = {}
+            for frame in batch:
+                try:
+                    session_id, samples = decode_frame(frame)
+                except ValueError as e:
+                    await websocket.send_json({"error": str(e)})
+                    continue
+                grouped.setdefault(session_id, []).append(samples)
+
+            for session_id, chunks in grouped.items():
+                samples = np.concatenate(chunks).astype(float)
+                refined = await _refine_stream_batch(session_id, samples, mode, techs)
+                await websocket.send_bytes(encode_frame(session_id, refined))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        reader_task.cancel()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
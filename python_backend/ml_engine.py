@@ -1,12 +1,244 @@
-import numpy as np
-from sklearn.mixture import GaussianMixture
-from sklearn.ensemble import IsolationForest
-from sklearn.cluster import DBSCAN
-from sklearn.neighbors import LocalOutlierFactor
-from sklearn.decomposition import PCA
-from typing import List, Dict, Any
+import importlib
 import os
-import pandas as pd
+import time
+import numpy as np
+from functools import cached_property
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+from instrumentation import metrics, timed
+from techniques import (
+    COST_CHEAP, COST_MODERATE, COST_HEAVY, Technique, TechniqueRegistry,
+)
+
+
+# ===========================================================
+# LAZY DETECTOR BACKENDS
+# ===========================================================
+#
+# sklearn costs ~1.5 s to import; a worker that only serves CUL for the
+# live monitor never needs it. Model-based techniques import their
+# backend on first use (or up front via preload_backends), so a process
+# whose detectors are all native never imports it at all.
+
+TECHNIQUE_BACKENDS = {
+    "gmm":        ("sklearn.mixture",   "GaussianMixture"),
+    "dbscan":     ("sklearn.cluster",   "DBSCAN"),
+    "iso_forest": ("sklearn.ensemble",  "IsolationForest"),
+    "lof":        ("sklearn.neighbors", "LocalOutlierFactor"),
+}
+
+# Sort-based single-feature implementations (detectors_1d.py) with the
+# same estimator API. DBSCAN and GMM reproduce sklearn's artifact masks
+# exactly and are the default; native LOF can differ where a point has
+# two exactly equidistant k-th neighbours (common on rounded
+# recordings — sklearn's pick depends on KD-tree visiting order), so it
+# is opt-in. FORGE_DETECTORS overrides per technique.
+NATIVE_BACKENDS = {
+    "gmm":    ("detectors_1d", "GaussianMixture1D"),
+    "dbscan": ("detectors_1d", "DBSCAN1D"),
+    "lof":    ("detectors_1d", "LocalOutlierFactor1D"),
+}
+
+DEFAULT_DETECTORS = {"gmm": "native", "dbscan": "native"}
+
+
+def parse_detectors(spec: Optional[str]) -> Dict[str, str]:
+    """
+    FORGE_DETECTORS value → {technique: "native"} for techniques served
+    by detectors_1d: "" (defaults), "native" / "sklearn" (all), or
+    overrides of the defaults such as "lof=native,gmm=sklearn".
+    """
+    spec = (spec or "").strip().lower()
+    if spec in ("", "default"):
+        return dict(DEFAULT_DETECTORS)
+    if spec == "native":
+        return {t: "native" for t in NATIVE_BACKENDS}
+    if spec == "sklearn":
+        return {}
+
+    detectors = dict(DEFAULT_DETECTORS)
+    for part in spec.split(","):
+        technique, _, kind = part.strip().partition("=")
+        if technique not in NATIVE_BACKENDS or kind not in ("native", "sklearn"):
+            continue
+        if kind == "native":
+            detectors[technique] = "native"
+        else:
+            detectors.pop(technique, None)
+    return detectors
+
+
+_backends: Dict[str, Any] = {}
+_detectors: Dict[str, str] = parse_detectors(os.environ.get("FORGE_DETECTORS"))
+
+
+def load_backend(technique: str):
+    """Estimator class behind `technique`, imported on first call."""
+    backend = _backends.get(technique)
+    if backend is None:
+        table = NATIVE_BACKENDS if _detectors.get(technique) == "native" else TECHNIQUE_BACKENDS
+        module, name = table[technique]
+        backend = _backends[technique] = getattr(importlib.import_module(module), name)
+    return backend
+
+
+def use_detector(technique: str, implementation: str):
+    """
+    Switch `technique` between "native" and "sklearn" in this process
+    (pool workers started later read FORGE_DETECTORS instead).
+    """
+    if implementation == "native" and technique not in NATIVE_BACKENDS:
+        raise ValueError(f"No native implementation of '{technique}'")
+    if implementation not in ("native", "sklearn"):
+        raise ValueError(f"Unknown detector implementation '{implementation}'")
+    if implementation == "native":
+        _detectors[technique] = "native"
+    else:
+        _detectors.pop(technique, None)
+    _backends.pop(technique, None)
+
+
+def detector_implementation(technique: str) -> str:
+    """"native", "sklearn", or "numpy" for techniques without an estimator."""
+    if _detectors.get(technique) == "native":
+        return "native"
+    return "sklearn" if technique in TECHNIQUE_BACKENDS else "numpy"
+
+
+def detector_signature() -> str:
+    """Native selections as a stable string (part of the result-cache version)."""
+    return ",".join(f"{t}={k}" for t, k in sorted(_detectors.items()))
+
+
+# ===========================================================
+# NUMERIC PRECISION
+# ===========================================================
+#
+# EDA recordings carry ~4 decimals of uS (see the bundled CSVs), well
+# inside float32's 7 significant digits. In float32 mode signals, solo
+# stacks, ensemble output, run_segmented accumulators, cached results
+# and shared-memory segments are all half size; detector fits, the SSA
+# lag products, signal moments and the auditor metrics still upcast to
+# float64 locally. FORGE_PRECISION picks the process default.
+
+PRECISIONS = {"float64": np.dtype(np.float64), "float32": np.dtype(np.float32)}
+
+
+def parse_precision(spec: Optional[str]) -> str:
+    """
+    FORGE_PRECISION value → "float64" (default) or "float32". Anything
+    else raises ValueError, so a typo fails at import instead of
+    silently running the service at full precision.
+    """
+    spec = (spec or "").strip().lower()
+    if spec in ("", "default", "double", "f8"):
+        return "float64"
+    if spec in ("single", "f4"):
+        return "float32"
+    if spec not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{spec}' — expected one of "
+                         f"{list(PRECISIONS)} (or single / double)")
+    return spec
+
+
+DEFAULT_PRECISION = parse_precision(os.environ.get("FORGE_PRECISION"))
+
+
+def preload_backends(techniques: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Import backends ahead of the first request (default: all of them).
+    Returns seconds spent per technique; already-loaded ones cost ~0.
+    """
+    timings = {}
+    for technique in (TECHNIQUE_BACKENDS if techniques is None else techniques):
+        if technique not in TECHNIQUE_BACKENDS:
+            continue
+        started = time.perf_counter()
+        load_backend(technique)
+        timings[technique] = round(time.perf_counter() - started, 4)
+    return timings
+
+
+def loaded_backends() -> List[str]:
+    return sorted(_backends)
+
+
+def parse_preload(spec: Optional[str]) -> List[str]:
+    """FORGE_PRELOAD value → techniques: "" (lazy), "all", or "gmm,lof,..."."""
+    spec = (spec or "").strip().lower()
+    if spec in ("", "none", "0"):
+        return []
+    if spec == "all":
+        return list(TECHNIQUE_BACKENDS)
+    return [t for t in (part.strip() for part in spec.split(",")) if t in TECHNIQUE_BACKENDS]
+
+
+class _SoloContext:
+    """
+    Per-call signal statistics shared by the run_solo techniques.
+    Each is computed on first use, so a technique only pays for the
+    statistics it actually reads (pca never builds an SCR mask).
+    """
+
+    def __init__(self, engine: "ForensicMLEngine", data: np.ndarray, technique: str):
+        self.engine    = engine
+        self.data      = data
+        self.technique = technique
+
+    @cached_property
+    def reshaped(self) -> np.ndarray:
+        # Detectors always fit in float64, whatever the engine precision
+        return self.data.astype(np.float64).reshape(-1, 1)
+
+    @cached_property
+    def mean(self) -> float:
+        return float(np.mean(self.data, dtype=np.float64))
+
+    @cached_property
+    def std(self) -> float:
+        return self.engine._safe_std(self.data)
+
+    @cached_property
+    def scr_mask(self) -> np.ndarray:
+        with timed("scr_mask", self.technique):
+            return self.engine._detect_scr_events(self.data)
+
+    @cached_property
+    def contamination(self) -> float:
+        with timed("contamination", self.technique):
+            return self.engine._adaptive_contamination(self.data)
+
+
+class _MetricsProfile:
+    """
+    Raw-side statistics of calculate_metrics for one or more
+    recordings, as (r,) / (r, n) rows. Scoring a candidate stack
+    against a single recording uses r = 1 and broadcasts.
+    """
+
+    def __init__(self, engine: "ForensicMLEngine", raw: np.ndarray):
+        raw  = np.nan_to_num(np.atleast_2d(np.asarray(raw, dtype=np.float64)))
+        std  = engine._safe_std_rows(raw)
+        mean = np.mean(raw, axis=1)
+
+        # Artifact points: statistical outliers > 2.5 sigma
+        art_mask   = np.abs(raw - mean[:, None]) > engine.ARTIFACT_SIGMA * std[:, None]
+        clean_mask = ~art_mask
+
+        # Expected tonic: median of the clean points (mean if too few)
+        expected_tonic = mean.copy()
+        enough_clean   = clean_mask.sum(axis=1) > 2
+        if np.any(enough_clean):
+            masked = np.where(clean_mask[enough_clean], raw[enough_clean], np.nan)
+            expected_tonic[enough_clean] = np.nanmedian(masked, axis=1)
+
+        self.raw            = raw
+        self.std            = std
+        self.mean           = mean
+        self.art_mask       = art_mask
+        self.n_art          = art_mask.sum(axis=1)
+        self.expected_tonic = expected_tonic
+
 
 class ForensicMLEngine:
     """
@@ -32,14 +264,39 @@ class ForensicMLEngine:
     ============================================================
     """
 
+    # Bump whenever a change alters engine output — result caches key on it
+    ENGINE_VERSION        = "5.0.0"
+
     # EDA Physiological Constants
     EDA_VALID_RANGE       = (0.5, 20.0)   # uS — valid human range
     SCR_MAX_AMPLITUDE     = 3.0           # uS — max real SCR above baseline
     ARTIFACT_SIGMA        = 2.5           # stddev — Benedek & Kaernbach threshold
     TYPICAL_CONTAMINATION = 0.08          # 8% typical lab EDA contamination
 
-    def __init__(self):
+    # run_budgeted_benchmark: share of a time budget the solo fits may
+    # use; the rest is kept for scoring ensembles
+    BUDGET_FIT_SHARE      = 0.75
+    # First import of an sklearn backend (see load_backend)
+    BACKEND_IMPORT_SECONDS = 1.5
+
+    def __init__(self, executor=None, techniques: Optional[TechniqueRegistry] = None,
+                 precision: Optional[str] = None):
         self.trial_history = []
+        # Storage dtype of signals and reconstructions (PRECISIONS key);
+        # None = the process default from FORGE_PRECISION
+        self.precision = precision or DEFAULT_PRECISION
+        if self.precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision '{self.precision}' — expected one of {list(PRECISIONS)}")
+        self.dtype = PRECISIONS[self.precision]
+        # Technique registry run_solo dispatches through (module default
+        # TECHNIQUES below unless a custom one is injected)
+        self.techniques = techniques if techniques is not None else TECHNIQUES
+        # Optional DetectorExecutor (executor.py). None = run detectors
+        # sequentially in the calling thread.
+        self.executor = executor
+        # technique → (samples, seconds) of its last successful run_solo,
+        # used to predict fit times under a time budget
+        self.fit_timings: Dict[str, tuple] = {}
         # NOTE: No persistent history_anchor — all algorithms compute
         # fresh per batch to prevent cross-call state contamination.
 
@@ -47,9 +304,25 @@ class ForensicMLEngine:
     # SHARED EDA UTILITIES
     # ===========================================================
 
+    def as_signal(self, data) -> np.ndarray:
+        """`data` in the engine's storage dtype (no copy when it already is)."""
+        return np.asarray(data, dtype=self.dtype)
+
+    def precision_report(self, values: int) -> Dict[str, Any]:
+        """
+        Estimated bytes `values` signal samples occupy at this precision,
+        and what float64 storage would have cost on top of that. Counts
+        sample storage only (itemsize × values) — not array headers,
+        allocator slack or the float64 temporaries detectors fit on.
+        """
+        held = int(values) * self.dtype.itemsize
+        return {"precision":             self.precision,
+                "estimated_bytes":       held,
+                "estimated_bytes_saved": int(values) * 8 - held}
+
     def _safe_std(self, data: np.ndarray) -> float:
         """Standard deviation with physiological floor (avoids division by zero)."""
-        return max(float(np.std(data)), 0.01)
+        return max(float(np.std(data, dtype=np.float64)), 0.01)
 
     def _adaptive_contamination(self, data: np.ndarray) -> float:
         """
@@ -58,7 +331,7 @@ class ForensicMLEngine:
         Clamped to physiologically plausible range: 2-25%.
         """
         std  = self._safe_std(data)
-        mean = float(np.mean(data))
+        mean = float(np.mean(data, dtype=np.float64))
         n_out = float(np.sum(np.abs(data - mean) > self.ARTIFACT_SIGMA * std))
         rate  = n_out / max(len(data), 1)
         return float(np.clip(rate, 0.02, 0.25))
@@ -87,12 +360,13 @@ class ForensicMLEngine:
         std      = self._safe_std(data)
         diffs    = np.diff(data)
 
-        for i in range(1, n - 1):
-            rise_gradual   = 0 < diffs[i - 1] < std * 2.5
-            amp_valid      = 0.05 <= (data[i] - baseline) <= self.SCR_MAX_AMPLITUDE
-            not_artifact   = data[i] < baseline + self.ARTIFACT_SIGMA * std
-            if rise_gradual and amp_valid and not_artifact:
-                is_scr[i] = True
+        # Interior points i = 1..n-2, each compared with the step into it
+        rise      = diffs[:-1]
+        amplitude = data[1:-1] - baseline
+        rise_gradual = (rise > 0) & (rise < std * 2.5)
+        amp_valid    = (amplitude >= 0.05) & (amplitude <= self.SCR_MAX_AMPLITUDE)
+        not_artifact = data[1:-1] < baseline + self.ARTIFACT_SIGMA * std
+        is_scr[1:-1] = rise_gradual & amp_valid & not_artifact
 
         return is_scr
 
@@ -107,35 +381,85 @@ class ForensicMLEngine:
         Method: Lajante et al. (2012) — piecewise linear bridge across
         artifact gaps, preserving physiological tonic trend.
         """
-        refined = data.copy().astype(float)
+        refined = data.astype(self.dtype)      # always a copy
         n       = len(data)
-
-        for i in np.where(artifact_mask)[0]:
-            left = i - 1
-            while left >= 0 and artifact_mask[left]:
-                left -= 1
-            right = i + 1
-            while right < n and artifact_mask[right]:
-                right += 1
-
-            if left >= 0 and right < n:
-                t = (i - left) / (right - left)
-                refined[i] = data[left] * (1.0 - t) + data[right] * t
-            elif left >= 0:
-                refined[i] = data[left]
-            elif right < n:
-                refined[i] = data[right]
-            else:
-                refined[i] = float(np.median(data))
+        art_idx = np.flatnonzero(artifact_mask)
+        if len(art_idx) == 0:
+            return refined
+
+        # Nearest clean neighbour on each side of every point, found with
+        # running max/min over clean indices instead of per-point walks.
+        idx       = np.arange(n)
+        clean     = ~np.asarray(artifact_mask, dtype=bool)
+        left_all  = np.maximum.accumulate(np.where(clean, idx, -1))
+        right_all = np.minimum.accumulate(np.where(clean, idx, n)[::-1])[::-1]
+        left      = left_all[art_idx]
+        right     = right_all[art_idx]
+
+        has_left  = left >= 0
+        has_right = right < n
+        both      = has_left & has_right
+
+        if np.any(both):
+            i, l, r = art_idx[both], left[both], right[both]
+            t = (i - l) / (r - l)
+            refined[i] = data[l] * (1.0 - t) + data[r] * t
+        only_left  = has_left & ~has_right
+        only_right = has_right & ~has_left
+        refined[art_idx[only_left]]  = data[left[only_left]]
+        refined[art_idx[only_right]] = data[right[only_right]]
+        if not np.any(clean):
+            refined[:] = float(np.median(data))
 
         return refined
 
+    def _ssa_rank1(self, data: np.ndarray, window_size: int) -> np.ndarray:
+        """
+        SINGULAR-SPECTRUM "MAIN THREAD" — rank-1 Hankel reconstruction
+        ----------------------------------------------------------------
+        Same result as fitting PCA(n_components=1) on the trajectory
+        (Hankel) matrix and overlap-adding its reconstruction, without
+        ever materialising that matrix:
+
+          - trajectory rows are a sliding_window_view (no copies)
+          - the w×w lag covariance is built from w² dot products of
+            contiguous signal slices; its top eigenvector is the
+            principal component (w <= 16, so eigh is trivial)
+          - diagonal averaging of mean + score·component is two 1-D
+            convolutions divided by the closed-form overlap counts
+        """
+        w    = window_size
+        rows = len(data) - w + 1
+        mu   = float(np.mean(data))
+        y    = np.asarray(data, dtype=float) - mu     # centred: better conditioned lag products
+
+        col_mean = np.lib.stride_tricks.sliding_window_view(y, w).mean(axis=0)
+        lagged   = [y[j:j + rows] for j in range(w)]
+        cov = np.empty((w, w))
+        for j in range(w):
+            for k in range(j, w):
+                cov[j, k] = cov[k, j] = float(lagged[j] @ lagged[k])
+        cov -= rows * np.outer(col_mean, col_mean)
+
+        component = np.linalg.eigh(cov)[1][:, -1]
+        scores    = sum(component[j] * (lagged[j] - col_mean[j]) for j in range(w))
+
+        counts = np.convolve(np.ones(rows), np.ones(w))
+        diag   = np.convolve(np.ones(rows), col_mean) + np.convolve(scores, component)
+        return mu + diag / counts
+
     # ===========================================================
     # EDA-CALIBRATED QUALITY METRICS
     # ===========================================================
 
     def calculate_metrics(self, raw: np.ndarray,
                            refined: np.ndarray) -> Dict[str, float]:
+        """Auditor metrics for one reconstruction (timed; see _calculate_metrics)."""
+        with timed("metrics"):
+            return self._calculate_metrics(raw, refined)
+
+    def _calculate_metrics(self, raw: np.ndarray,
+                           refined: np.ndarray) -> Dict[str, float]:
         """
         3-AXIS DIFFERENTIATING SCORE SYSTEM
         -------------------------------------
@@ -160,8 +484,8 @@ class ForensicMLEngine:
            Algorithms that remove larger spikes score higher.
            Helps separate algorithms on magnitude of healing.
         """
-        raw     = np.nan_to_num(raw)
-        refined = np.nan_to_num(refined)
+        raw     = np.nan_to_num(np.asarray(raw, dtype=np.float64))
+        refined = np.nan_to_num(np.asarray(refined, dtype=np.float64))
 
         if len(refined) < 3:
             return dict(
@@ -301,132 +625,164 @@ class ForensicMLEngine:
           1. Adaptive thresholds from signal's own statistics
           2. Linear interpolation heals — no flat constant substitution
           3. SCR event protection — legitimate spikes preserved
+
+        The technique is looked up in the registry (techniques.py);
+        an unknown name raises UnknownTechnique instead of silently
+        returning the raw signal. Algorithm failures still fall back to
+        the unhealed copy.
+        """
+        spec = self.techniques.get(technique)
+        data = self.as_signal(data)
+        with timed("solo", technique):
+            try:
+                started = time.perf_counter()
+                refined = self.as_signal(spec.run(self, data, _SoloContext(self, data, technique)))
+                self.fit_timings[technique] = (len(data), time.perf_counter() - started)
+                return refined
+            except Exception as e:
+                print(f"[ML Engine] Algorithm error [{technique}]: {str(e)}")
+                metrics.inc("forge_engine_errors_total", technique=technique)
+                return data.copy()
+
+    def expected_fit_seconds(self, technique: str, n: int,
+                             cold_import: bool = True) -> float:
         """
-        data_reshaped = data.reshape(-1, 1)
-        refined       = data.copy()
-        mean          = float(np.mean(data))
-        std           = self._safe_std(data)
-        scr_mask      = self._detect_scr_events(data)
-        contamination = self._adaptive_contamination(data)
-
-        try:
-            if technique == "gmm":
-                # 3 components when enough data: resting / aroused / artifact
-                # Baseline = cluster closest to median (robust vs argmin)
-                n_comp = 3 if len(data) >= 15 else 2
-                model  = GaussianMixture(
-                    n_components=n_comp, random_state=42,
-                    covariance_type='full', max_iter=200
-                ).fit(data_reshaped)
-
-                means            = model.means_.flatten()
-                labels           = model.predict(data_reshaped)
-                baseline_cluster = int(np.argmin(np.abs(means - np.median(data))))
-
-                artifact_mask = (
-                    (labels != baseline_cluster) &
-                    (np.abs(data - mean) > self.ARTIFACT_SIGMA * std) &
-                    ~scr_mask
-                )
-                refined = self._interpolate_artifacts(data, artifact_mask)
-
-            elif technique == "kmeans":
-                # Init centroids at mean and mean+2.5-sigma (physiological target)
-                c_base = mean
-                c_art  = mean + self.ARTIFACT_SIGMA * std
-
-                if std < 0.001:
-                    refined = data
-                else:
-                    for _ in range(20):
-                        labels = np.array([
-                            0 if abs(x - c_base) <= abs(x - c_art) else 1
-                            for x in data
-                        ])
-                        cl0 = data[labels == 0]
-                        cl1 = data[labels == 1]
-                        if len(cl0) > 0: c_base = float(np.mean(cl0))
-                        if len(cl1) > 0: c_art  = float(np.mean(cl1))
-
-                    artifact_cluster = 1 if c_art > c_base else 0
-                    artifact_mask = (
-                        (labels == artifact_cluster) &
-                        (np.abs(data - mean) > self.ARTIFACT_SIGMA * std) &
-                        ~scr_mask
-                    )
-                    refined = self._interpolate_artifacts(data, artifact_mask)
-
-            elif technique == "dbscan":
-                # eps auto-calibrated to actual inter-sample EDA variation
-                # Natural EDA variation between 5-sec windows ~ 0.1-0.4 uS
-                # OLD: eps=0.03 — invisible to real EDA variation
-                # NEW: eps = 1.5x typical inter-sample step, bounded 0.05-2.0 uS
-                inter_var = float(np.mean(np.abs(np.diff(data))))
-                eps = float(np.clip(max(inter_var * 1.5, std * 0.5), 0.05, 2.0))
-
-                model = DBSCAN(eps=eps, min_samples=2).fit(data_reshaped)
-                artifact_mask = (model.labels_ == -1) & ~scr_mask
-                refined = self._interpolate_artifacts(data, artifact_mask)
-
-            elif technique == "iso_forest":
-                # OLD: fixed contamination=0.15 (over-cleans)
-                # NEW: adaptive from signal statistics, 150 trees for stability
-                model = IsolationForest(
-                    contamination=contamination,
-                    random_state=42,
-                    n_estimators=150
-                ).fit(data_reshaped)
-                preds = model.predict(data_reshaped)
-                artifact_mask = (preds == -1) & ~scr_mask
-                refined = self._interpolate_artifacts(data, artifact_mask)
-
-            elif technique == "lof":
-                # OLD: n_neighbors=5 — statistically unstable on small datasets
-                # NEW: len//4 clamped 3-15, adaptive contamination
-                n_neighbors = int(np.clip(len(data) // 4, 3, 15))
-                model = LocalOutlierFactor(
-                    n_neighbors=n_neighbors,
-                    contamination=contamination
-                )
-                preds = model.fit_predict(data_reshaped)
-                artifact_mask = (preds == -1) & ~scr_mask
-                refined = self._interpolate_artifacts(data, artifact_mask)
-
-            elif technique == "pca":
-                # OLD: window=4 (20s context — too narrow for SCR decay shape)
-                # NEW: window=8 (40s context — captures full SCR 5-30s recovery)
-                # OLD: overwrite bug — early points blended multiple times
-                # NEW: weight accumulation — every point treated equally
-                window_size = int(np.clip(min(8, len(data) // 3), 3, 16))
-
-                if len(data) <= window_size:
-                    refined = data
-                else:
-                    hankel = np.array([
-                        data[i:i + window_size]
-                        for i in range(len(data) - window_size + 1)
-                    ])
-                    pca_model = PCA(n_components=1)
-                    low_dim   = pca_model.fit_transform(hankel)
-                    recon     = pca_model.inverse_transform(low_dim)
-
-                    weight_acc = np.zeros(len(data))
-                    value_acc  = np.zeros(len(data))
-                    for i in range(len(recon)):
-                        value_acc[i:i + window_size]  += recon[i]
-                        weight_acc[i:i + window_size] += 1.0
-
-                    weight_acc = np.maximum(weight_acc, 1.0)
-                    pca_signal = value_acc / weight_acc
-                    refined    = data * 0.40 + pca_signal * 0.60
-
-            elif technique == "cul":
-                refined = self.cul_v4_logic(data)
-
-        except Exception as e:
-            print(f"[ML Engine] Algorithm error [{technique}]: {str(e)}")
+        Predicted run_solo time on `n` samples: the last recorded run
+        rescaled by the cost-class prior, else the prior itself plus,
+        when `cold_import`, the sklearn import if this process has not
+        loaded the backend yet.
+        """
+        spec  = self.techniques.get(technique)
+        prior = spec.prior_seconds(n)
+        seen  = self.fit_timings.get(technique)
+        if seen is not None:
+            return seen[1] * prior / spec.prior_seconds(seen[0])
+        if (cold_import and spec.backend is not None and spec.backend not in _backends
+                and detector_implementation(spec.backend) == "sklearn"):
+            prior += self.BACKEND_IMPORT_SECONDS
+        return prior
+
+    def _heal(self, data: np.ndarray, artifact_mask: np.ndarray,
+              technique: str) -> np.ndarray:
+        with timed("interpolate", technique):
+            return self._interpolate_artifacts(data, artifact_mask)
 
-        return refined
+    # ===========================================================
+    # Built-in techniques (registered at the bottom of this module)
+    # ===========================================================
+
+    def _solo_gmm(self, data: np.ndarray, ctx: "_SoloContext") -> np.ndarray:
+        # 3 components when enough data: resting / aroused / artifact
+        # Baseline = cluster closest to median (robust vs argmin)
+        n_comp = 3 if len(data) >= 15 else 2
+        GaussianMixture = load_backend("gmm")
+        with timed("fit", "gmm"):
+            model  = GaussianMixture(
+                n_components=n_comp, random_state=42,
+                covariance_type='full', max_iter=200
+            ).fit(ctx.reshaped)
+
+        with timed("predict", "gmm"):
+            means            = model.means_.flatten()
+            labels           = model.predict(ctx.reshaped)
+        baseline_cluster = int(np.argmin(np.abs(means - np.median(data))))
+
+        artifact_mask = (
+            (labels != baseline_cluster) &
+            (np.abs(data - ctx.mean) > self.ARTIFACT_SIGMA * ctx.std) &
+            ~ctx.scr_mask
+        )
+        return self._heal(data, artifact_mask, "gmm")
+
+    def _solo_kmeans(self, data: np.ndarray, ctx: "_SoloContext") -> np.ndarray:
+        # Init centroids at mean and mean+2.5-sigma (physiological target)
+        mean, std = ctx.mean, ctx.std
+        c_base = mean
+        c_art  = mean + self.ARTIFACT_SIGMA * std
+
+        if std < 0.001:
+            return data
+
+        with timed("fit", "kmeans"):
+            labels = None
+            for _ in range(20):
+                prev   = labels
+                labels = (np.abs(data - c_base) > np.abs(data - c_art)).astype(int)
+                cl0 = data[labels == 0]
+                cl1 = data[labels == 1]
+                if len(cl0) > 0: c_base = float(np.mean(cl0))
+                if len(cl1) > 0: c_art  = float(np.mean(cl1))
+                # Same assignment twice → centroids are a fixed point
+                if prev is not None and np.array_equal(prev, labels):
+                    break
+
+        artifact_cluster = 1 if c_art > c_base else 0
+        artifact_mask = (
+            (labels == artifact_cluster) &
+            (np.abs(data - mean) > self.ARTIFACT_SIGMA * std) &
+            ~ctx.scr_mask
+        )
+        return self._heal(data, artifact_mask, "kmeans")
+
+    def _solo_dbscan(self, data: np.ndarray, ctx: "_SoloContext") -> np.ndarray:
+        # eps auto-calibrated to actual inter-sample EDA variation
+        # Natural EDA variation between 5-sec windows ~ 0.1-0.4 uS
+        # OLD: eps=0.03 — invisible to real EDA variation
+        # NEW: eps = 1.5x typical inter-sample step, bounded 0.05-2.0 uS
+        inter_var = float(np.mean(np.abs(np.diff(data))))
+        eps = float(np.clip(max(inter_var * 1.5, ctx.std * 0.5), 0.05, 2.0))
+
+        DBSCAN = load_backend("dbscan")
+        with timed("fit", "dbscan"):
+            model = DBSCAN(eps=eps, min_samples=2).fit(ctx.reshaped)
+        artifact_mask = (model.labels_ == -1) & ~ctx.scr_mask
+        return self._heal(data, artifact_mask, "dbscan")
+
+    def _solo_iso_forest(self, data: np.ndarray, ctx: "_SoloContext") -> np.ndarray:
+        # OLD: fixed contamination=0.15 (over-cleans)
+        # NEW: adaptive from signal statistics, 150 trees for stability
+        IsolationForest = load_backend("iso_forest")
+        with timed("fit", "iso_forest"):
+            model = IsolationForest(
+                contamination=ctx.contamination,
+                random_state=42,
+                n_estimators=150
+            ).fit(ctx.reshaped)
+        with timed("predict", "iso_forest"):
+            preds = model.predict(ctx.reshaped)
+        artifact_mask = (preds == -1) & ~ctx.scr_mask
+        return self._heal(data, artifact_mask, "iso_forest")
+
+    def _solo_lof(self, data: np.ndarray, ctx: "_SoloContext") -> np.ndarray:
+        # OLD: n_neighbors=5 — statistically unstable on small datasets
+        # NEW: len//4 clamped 3-15, adaptive contamination
+        n_neighbors = int(np.clip(len(data) // 4, 3, 15))
+        LocalOutlierFactor = load_backend("lof")
+        model = LocalOutlierFactor(
+            n_neighbors=n_neighbors,
+            contamination=ctx.contamination
+        )
+        with timed("fit", "lof"):
+            preds = model.fit_predict(ctx.reshaped)
+        artifact_mask = (preds == -1) & ~ctx.scr_mask
+        return self._heal(data, artifact_mask, "lof")
+
+    def _solo_pca(self, data: np.ndarray, ctx: "_SoloContext") -> np.ndarray:
+        # OLD: window=4 (20s context — too narrow for SCR decay shape)
+        # NEW: window=8 (40s context — captures full SCR 5-30s recovery)
+        # OLD: overwrite bug — early points blended multiple times
+        # NEW: weight accumulation — every point treated equally
+        window_size = int(np.clip(min(8, len(data) // 3), 3, 16))
+
+        if len(data) <= window_size:
+            return data
+        with timed("fit", "pca"):
+            pca_signal = self._ssa_rank1(data, window_size)
+        return data * 0.40 + pca_signal * 0.60
+
+    def _solo_cul(self, data: np.ndarray, ctx: "_SoloContext") -> np.ndarray:
+        with timed("fit", "cul"):
+            return self.cul_v4_logic(data)
 
     # ===========================================================
     # run_hybrid — Majority-vote ensemble
@@ -445,19 +801,346 @@ class ForensicMLEngine:
         if not techniques:
             return data
 
-        stack  = np.array([self.run_solo(t, data) for t in techniques])
-        std    = self._safe_std(data)
+        data  = self.as_signal(data)
+        stack = self._solo_stack(techniques, data)
+        return self._consensus_from_stack(
+            stack, data, np.ones((1, len(techniques)), dtype=bool)
+        )[0]
+
+    def _solo_stack(self, techniques: List[str], data: np.ndarray) -> np.ndarray:
+        """(n_techs, n) stack of solo reconstructions, fanned out when a pool is attached."""
+        if self.executor is None:
+            return np.array([self.run_solo(t, data) for t in techniques], dtype=self.dtype)
+        return np.array(self.executor.map_solo(self, techniques, data), dtype=self.dtype)
+
+    def _consensus_from_stack(self, stack: np.ndarray, data: np.ndarray,
+                               masks: np.ndarray) -> np.ndarray:
+        """
+        Majority-vote consensus for many ensembles at once.
+        ----------------------------------------------------
+        stack : (n_techs, n) solo reconstructions, computed once
+        masks : (n_combos, n_techs) boolean membership matrix
+
+        Votes are counted for every combo with a single matrix product;
+        medians are taken per ensemble size so each group is one
+        vectorized np.median over a (n_combos_r, r, n) gather.
+        Returns (n_combos, n) — row k equals run_hybrid(combo_k, data).
+        """
+        with timed("consensus"):
+            return self._consensus(stack, data, masks)
 
+    def _consensus(self, stack: np.ndarray, data: np.ndarray,
+                   masks: np.ndarray) -> np.ndarray:
+        data       = np.asarray(data, dtype=stack.dtype)
+        std        = self._safe_std(data)
         votes      = np.abs(stack - data) > (std * 0.5)
-        vote_count = np.sum(votes, axis=0)
-        majority   = max(1, len(techniques) // 2 + 1)
+        vote_count = masks.astype(np.int64) @ votes.astype(np.int64)
+        sizes      = masks.sum(axis=1)
+        majority   = np.maximum(1, sizes // 2 + 1)
 
-        return np.where(vote_count >= majority, np.median(stack, axis=0), data)
+        medians = np.empty((len(masks), stack.shape[1]), dtype=stack.dtype)
+        for r in np.unique(sizes):
+            rows    = np.flatnonzero(sizes == r)
+            members = np.nonzero(masks[rows])[1].reshape(len(rows), r)
+            medians[rows] = np.median(stack[members], axis=1)
+
+        return np.where(vote_count >= majority[:, None], medians, data)
+
+    def run_mode(self, mode: str, techniques: List[str],
+                 data: np.ndarray) -> np.ndarray:
+        """API-level dispatch: "solo" runs the first technique (default CUL), else hybrid."""
+        if mode == "solo":
+            return self.run_solo(techniques[0] if techniques else "cul", data)
+        return self.run_hybrid(techniques, data)
+
+    # ===========================================================
+    # Multi-channel — (n_channels, n_samples) in one call
+    # ===========================================================
+
+    def _safe_std_rows(self, X: np.ndarray) -> np.ndarray:
+        return np.maximum(np.std(X, axis=1, dtype=np.float64), 0.01)
+
+    def _adaptive_contamination_rows(self, X: np.ndarray) -> np.ndarray:
+        """_adaptive_contamination for every row at once → (n_channels,)."""
+        std   = self._safe_std_rows(X)
+        mean  = np.mean(X, axis=1)
+        n_out = np.sum(np.abs(X - mean[:, None]) > self.ARTIFACT_SIGMA * std[:, None], axis=1)
+        return np.clip(n_out / max(X.shape[1], 1), 0.02, 0.25)
+
+    def _detect_scr_events_rows(self, X: np.ndarray) -> np.ndarray:
+        """_detect_scr_events for every row at once → (n_channels, n) mask."""
+        is_scr = np.zeros(X.shape, dtype=bool)
+        if X.shape[1] < 3:
+            return is_scr
+
+        baseline  = np.median(X, axis=1)[:, None]
+        std       = self._safe_std_rows(X)[:, None]
+        rise      = np.diff(X, axis=1)[:, :-1]
+        amplitude = X[:, 1:-1] - baseline
+        rise_gradual = (rise > 0) & (rise < std * 2.5)
+        amp_valid    = (amplitude >= 0.05) & (amplitude <= self.SCR_MAX_AMPLITUDE)
+        not_artifact = X[:, 1:-1] < baseline + self.ARTIFACT_SIGMA * std
+        is_scr[:, 1:-1] = rise_gradual & amp_valid & not_artifact
+        return is_scr
+
+    def _interpolate_artifacts_rows(self, X: np.ndarray,
+                                    artifact_mask: np.ndarray) -> np.ndarray:
+        """_interpolate_artifacts applied independently to every row."""
+        refined = X.astype(self.dtype, copy=True)
+        n       = X.shape[1]
+        rows, cols = np.nonzero(artifact_mask)
+        if len(rows) == 0:
+            return refined
+
+        idx       = np.arange(n)
+        clean     = ~artifact_mask
+        left_all  = np.maximum.accumulate(np.where(clean, idx, -1), axis=1)
+        right_all = np.minimum.accumulate(np.where(clean, idx, n)[:, ::-1], axis=1)[:, ::-1]
+        left      = left_all[rows, cols]
+        right     = right_all[rows, cols]
+
+        has_left  = left >= 0
+        has_right = right < n
+        both      = has_left & has_right
+
+        if np.any(both):
+            r, i, l, rr = rows[both], cols[both], left[both], right[both]
+            t = (i - l) / (rr - l)
+            refined[r, i] = X[r, l] * (1.0 - t) + X[r, rr] * t
+        only_left  = has_left & ~has_right
+        only_right = has_right & ~has_left
+        refined[rows[only_left], cols[only_left]]   = X[rows[only_left], left[only_left]]
+        refined[rows[only_right], cols[only_right]] = X[rows[only_right], right[only_right]]
+
+        all_art = ~clean.any(axis=1)
+        if np.any(all_art):
+            refined[all_art] = np.median(X[all_art], axis=1)[:, None]
+        return refined
+
+    def cul_v4_rows(self, X: np.ndarray) -> np.ndarray:
+        """cul_v4_logic on every row in one vectorized pass."""
+        anchor    = np.median(X, axis=1)[:, None]
+        threshold = self._safe_std_rows(X)[:, None] * self.ARTIFACT_SIGMA + 0.001
+        artifact_mask = (np.abs(X - anchor) > threshold) & ~self._detect_scr_events_rows(X)
+        return self._interpolate_artifacts_rows(X, artifact_mask)
+
+    def run_mode_channels(self, mode: str, techniques: List[str],
+                          X: np.ndarray) -> np.ndarray:
+        """
+        MULTI-CHANNEL DISPATCH
+        ----------------------
+        run_mode for every row of an (n_channels, n_samples) matrix.
+        A solo technique that declares a `rows` implementation (CUL —
+        pure array statistics) runs for all channels in one vectorized
+        pass; model-based techniques and hybrids are fitted per channel,
+        fanned out across the DetectorExecutor pool when one is attached.
+        """
+        X = self.as_signal(X)
+        if mode == "solo":
+            spec = self.techniques.get(techniques[0] if techniques else "cul")
+            if spec.vectorizable:
+                with timed("solo", spec.name):
+                    try:
+                        return spec.rows(self, X)
+                    except Exception as e:
+                        print(f"[ML Engine] Algorithm error [{spec.name}]: {str(e)}")
+                        # One error per channel, as the per-channel path counts them
+                        metrics.inc("forge_engine_errors_total", len(X), technique=spec.name)
+                        return X.copy()
+        if self.executor is not None and len(X) > 1:
+            return np.array(self.executor.map_channels(self, mode, techniques, X), dtype=self.dtype)
+        return np.array([self.run_mode(mode, techniques, row) for row in X], dtype=self.dtype)
+
+    def calculate_metrics_rows(self, raw: np.ndarray,
+                               refined: np.ndarray) -> List[Dict[str, float]]:
+        """
+        calculate_metrics for every (raw[c], refined[c]) pair, with the
+        per-channel statistics, masks and reductions computed across all
+        channels at once. Returns one metrics dict per channel.
+        """
+        with timed("metrics"):
+            return self._calculate_metrics_rows(raw, refined)
+
+    def _calculate_metrics_rows(self, raw: np.ndarray,
+                                refined: np.ndarray) -> List[Dict[str, float]]:
+        return self._score_profile(self.metrics_profile(raw), refined)
+
+    def metrics_profile(self, raw: np.ndarray) -> "_MetricsProfile":
+        """
+        The raw-side half of calculate_metrics (std, mean, artifact mask,
+        expected tonic). It depends only on the recording, so one
+        profile scores every candidate reconstruction of that recording.
+        """
+        return _MetricsProfile(self, raw)
+
+    def calculate_metrics_stack(self, raw: np.ndarray, refined: np.ndarray,
+                                profile: Optional["_MetricsProfile"] = None
+                                ) -> List[Dict[str, float]]:
+        """
+        calculate_metrics(raw, refined[k]) for every row of a
+        (n_candidates, n) stack of reconstructions of the same `raw`,
+        in one batched pass. Pass `profile` to reuse the raw side
+        across calls (the benchmark scores its combinations in chunks).
+        """
+        with timed("metrics"):
+            if profile is None:
+                profile = self.metrics_profile(raw)
+            return self._score_profile(profile, refined)
+
+    def _score_profile(self, profile: "_MetricsProfile",
+                       refined: np.ndarray) -> List[Dict[str, float]]:
+        """
+        Vectorized calculate_metrics body. `refined` is (k, n); profile
+        rows are either one per candidate or a single row broadcast
+        across all of them.
+        """
+        # Scored in float64 whatever the storage precision (chunk-sized upcast)
+        refined = np.nan_to_num(np.atleast_2d(np.asarray(refined, dtype=np.float64)))
+        n_cand, n = refined.shape
+
+        if n < 3:
+            return [dict(
+                artifact_suppression=0.0, baseline_integrity=0.0,
+                scr_preservation=0.0,     signal_continuity=0.0,
+                smoothness_score=0.0,     noise_suppression=0.0,
+                stability_index=0.0
+            ) for _ in range(n_cand)]
+
+        raw      = profile.raw
+        std      = profile.std
+        art_mask = profile.art_mask
+        n_art    = profile.n_art
+
+        # METRIC 1: tonic fidelity — distance of healed artifacts from the clean median
+        deviation = np.where(art_mask, np.abs(refined - profile.expected_tonic[:, None]), 0.0)
+        healed_deviation = deviation.sum(axis=1) / np.maximum(n_art, 1)
+        tonic_fidelity   = np.where(n_art > 0,
+                                    np.maximum(0.0, 100.0 - (healed_deviation / std * 50)),
+                                    100.0)
+
+        # METRIC 2: healing precision
+        residual       = raw - refined
+        abs_residual   = np.abs(residual)
+        changed_mask   = abs_residual > (std[:, None] * 0.1)
+        n_changed      = changed_mask.sum(axis=1)
+        true_positives = (art_mask & changed_mask).sum(axis=1)
+        precision      = np.where(n_changed > 0,
+                                  true_positives / np.maximum(n_changed, 1) * 100,
+                                  np.where(n_art > 0, 0.0, 100.0))
+
+        # METRIC 3: SNR improvement
+        signal_var     = np.var(refined, axis=1) + 0.0001
+        sq_err         = residual ** 2
+        artifact_noise = np.where(art_mask, sq_err, 0.0).sum(axis=1) / np.maximum(n_art, 1) + 0.0001
+        snr_improvement = np.where(n_art > 0,
+                                   np.minimum(100.0, signal_var / artifact_noise * 8),
+                                   100.0)
+
+        composite = (
+            tonic_fidelity   * 0.40 +
+            precision        * 0.35 +
+            snr_improvement  * 0.25
+        )
+
+        signal_power    = np.mean(refined ** 2, axis=1) + 0.0001
+        noise_power     = np.mean(sq_err, axis=1) + 0.0001
+        snr_db          = 10 * np.log10(signal_power / noise_power)
+        stability_index = np.round(np.clip(snr_db / 3.0, 0.0, 10.0), 2)
+
+        noise_suppression = abs_residual.sum(axis=1)
+        flat_steps        = (np.abs(np.diff(refined, axis=1)) < 0.001).sum(axis=1)
+        signal_continuity = np.maximum(0.0, 100.0 - flat_steps / max(n - 1, 1) * 180)
+
+        columns = dict(
+            artifact_suppression = tonic_fidelity,
+            baseline_integrity   = precision,
+            scr_preservation     = snr_improvement,
+            signal_continuity    = signal_continuity,
+            smoothness_score     = composite,
+            noise_suppression    = noise_suppression,
+            stability_index      = stability_index,
+        )
+        rounded = {k: np.nan_to_num(np.round(np.broadcast_to(v, (n_cand,)).astype(float), 2),
+                                    nan=0.0, posinf=0.0, neginf=0.0)
+                   for k, v in columns.items()}
+        return [{k: float(v[c]) for k, v in rounded.items()} for c in range(n_cand)]
+
+    # ===========================================================
+    # run_segmented — Overlapping-window mode for long recordings
+    # ===========================================================
+
+    def run_segmented(self, mode: str, techniques: List[str], data: np.ndarray,
+                      segment: int = 2048, overlap: int = 256) -> np.ndarray:
+        """
+        Long-recording execution mode
+        -----------------------------
+        LOF / DBSCAN neighbour search is superlinear and GMM / PCA fit
+        over the whole array, so multi-hour recordings blow up in time
+        and memory when refined in one shot.
+
+        Here the signal is cut into `segment`-sample windows overlapping
+        by `overlap` samples; each window goes through run_mode exactly
+        like a short recording, and neighbouring windows are crossfaded
+        with linear ramps across the overlap so no seam is visible.
+        Memory is bounded by one window plus the output accumulators;
+        runtime grows linearly with recording length.
+        """
+        data = self.as_signal(data)
+        n    = len(data)
+        if segment < 3:
+            raise ValueError("Segment length must be at least 3 samples")
+        overlap = int(np.clip(overlap, 0, segment // 2))
+        if n <= segment:
+            return self.run_mode(mode, techniques, data)
+
+        step   = segment - overlap
+        starts = list(range(0, n - segment, step)) + [n - segment]
+
+        value_acc  = np.zeros(n, dtype=self.dtype)
+        weight_acc = np.zeros(n, dtype=self.dtype)
+        ramp       = ((np.arange(overlap) + 1.0) / (overlap + 1.0)).astype(self.dtype)
+
+        for k, start in enumerate(starts):
+            stop    = start + segment
+            refined = self.run_mode(mode, techniques, data[start:stop])
+
+            weight = np.ones(segment, dtype=self.dtype)
+            if overlap and k > 0:
+                weight[:overlap] = ramp
+            if overlap and k < len(starts) - 1:
+                weight[-overlap:] = ramp[::-1]
+
+            value_acc[start:stop]  += refined * weight
+            weight_acc[start:stop] += weight
+
+        return value_acc / weight_acc
 
     # ===========================================================
     # run_brute_force_benchmark — All 127 combinations
     # ===========================================================
 
+    # Filled from the technique registry at the bottom of this module;
+    # instances read self.techniques.names() so injected registries work
+    BENCHMARK_TECHNIQUES = ()
+
+    @staticmethod
+    def _combination_masks(n_techs: int) -> np.ndarray:
+        """
+        (2^n - 1, n) boolean membership matrix, one row per non-empty
+        subset, ordered exactly like itertools.combinations by size.
+        """
+        from itertools import chain, combinations
+
+        subsets = chain.from_iterable(
+            combinations(range(n_techs), r) for r in range(1, n_techs + 1)
+        )
+        masks = []
+        for combo in subsets:
+            row = np.zeros(n_techs, dtype=bool)
+            row[list(combo)] = True
+            masks.append(row)
+        return np.array(masks)
+
     def run_brute_force_benchmark(self, data: np.ndarray) -> List[Dict[str, Any]]:
         """
         Full 127-combination EDA benchmark.
@@ -467,36 +1150,306 @@ class ForensicMLEngine:
             every call — results are fully deterministic & order-independent
           - Scoring uses 4-axis EDA composite stored in smoothness_score
             (DBSCAN can no longer game the score by doing nothing)
+          - Each of the 7 solo reconstructions is computed once and every
+            ensemble is voted from the cached stack (7 fits, not 448)
         """
-        from itertools import chain, combinations
-
-        techs   = ['cul', 'gmm', 'kmeans', 'dbscan', 'iso_forest', 'lof', 'pca']
-        subsets = chain.from_iterable(
-            combinations(techs, r) for r in range(1, len(techs) + 1)
-        )
-
-        results = []
-        for combo in subsets:
-            combo_list = list(combo)
-            if len(combo_list) == 1:
-                refined = self.run_solo(combo_list[0], data)
-                mode    = "solo"
-            else:
-                refined = self.run_hybrid(combo_list, data)
-                mode    = "hybrid"
+        results = [entry for chunk in self.iter_brute_force_benchmark(data)
+                   for entry in chunk]
+        results.sort(key=lambda x: x["total_score"], reverse=True)
+        return results
 
-            metrics = self.calculate_metrics(data, refined)
-            score   = metrics['smoothness_score']   # 4-axis EDA composite
+    def iter_brute_force_benchmark(self, data: np.ndarray,
+                                   chunk_size: int = 16) -> Iterator[List[Dict[str, Any]]]:
+        """
+        The brute-force leaderboard, unsorted, as it is computed: lists
+        of up to `chunk_size` entries in combination order. Ensembles
+        are voted one chunk at a time, so a long signal holds a
+        (chunk_size, n) block instead of all (127, n) reconstructions.
+        """
+        techs  = self.techniques.names()
+        masks  = self._combination_masks(len(techs))
+        sizes  = masks.sum(axis=1)
+
+        # Each detector is fitted exactly once; all 127 ensembles are
+        # assembled from this cached (7, n) stack instead of 448 refits.
+        data  = self.as_signal(data)
+        stack = self._solo_stack(techs, data)
+        # The raw side of the metrics is the same for every combination
+        profile = self.metrics_profile(data)
+
+        for start in range(0, len(masks), chunk_size):
+            block    = masks[start:start + chunk_size]
+            hybrid   = sizes[start:start + chunk_size] > 1
+            refined  = np.empty((len(block), len(data)), dtype=stack.dtype)
+            refined[~hybrid] = stack[np.argmax(block[~hybrid], axis=1)]
+            if np.any(hybrid):
+                refined[hybrid] = self._consensus_from_stack(stack, data, block[hybrid])
+
+            # One batched metrics pass per chunk instead of one per combination;
+            # total_score = 4-axis EDA composite (smoothness_score)
+            scores = self.calculate_metrics_stack(data, refined, profile)
+            yield [
+                self._entry([t for t, used in zip(techs, mask) if used],
+                            "hybrid" if is_hybrid else "solo", metrics)
+                for mask, is_hybrid, metrics in zip(block, hybrid, scores)
+            ]
 
-            results.append({
-                "mode":        mode,
-                "techs":       combo_list,
-                "metrics":     metrics,
-                "total_score": round(score, 2)
-            })
+    # ===========================================================
+    # run_budgeted_benchmark — anytime top-k auditor search
+    # ===========================================================
 
-        results.sort(key=lambda x: x["total_score"], reverse=True)
-        return results
+    def _benchmark_entry(self, combo_list: List[str], mode: str,
+                         data: np.ndarray, refined: np.ndarray,
+                         profile: Optional["_MetricsProfile"] = None) -> Dict[str, Any]:
+        metrics = self.calculate_metrics_stack(data, refined[None, :], profile)[0]
+        return self._entry(combo_list, mode, metrics)
+
+    @staticmethod
+    def _entry(combo_list: List[str], mode: str, metrics: Dict[str, float]) -> Dict[str, Any]:
+        return {
+            "mode":        mode,
+            "techs":       combo_list,
+            "metrics":     metrics,
+            "total_score": round(metrics['smoothness_score'], 2)
+        }
+
+    def run_budgeted_benchmark(self, data: np.ndarray, top_k: int = 10,
+                               max_evals: Optional[int] = None,
+                               time_budget: Optional[float] = None,
+                               beam_width: int = 3) -> Dict[str, Any]:
+        """
+        Budgeted top-k auditor.
+        -------------------------
+        The leaderboard only shows its top, and on long recordings it is
+        scoring the 120 ensembles (a median vote + metrics pass over the
+        whole signal each) that misses an interactive deadline, not the
+        7 fits. This search scores the most promising subsets first:
+
+          1. The 7 solos are fitted once (same stack as the brute force)
+             and always scored — they seed everything else. Under a
+             time_budget they are fitted cheapest cost class first
+             within BUDGET_FIT_SHARE of it; a technique whose expected
+             fit time (expected_fit_seconds) does not fit what is left
+             is skipped rather than started, and pool fits that overrun
+             are abandoned (the fits, not the scoring, dominate past
+             ~10k samples).
+          2. Beam search up the subset lattice: the `beam_width` best
+             combos of size r are each extended by one technique. An
+             ensemble heals a point only where a majority of its members
+             vote, and heals it to their median, so its score tends to
+             sit near its members' — candidates are tried in order of
+             mean member solo score.
+          3. Budget left over goes to the remaining subsets, best-first
+             by the same priority, until every subset has been scored.
+
+        The priority is a heuristic, not a bound: the composite score is
+        not monotone in the member set, so only a search that finishes
+        is reported as exhaustive.
+
+        Budgets: max_evals (subsets scored, solos included — so at
+        least one per technique; fewer raises ValueError) and
+        time_budget (seconds, fits included). With neither this is
+        run_brute_force_benchmark cut to top_k.
+
+        Returns {"results": top_k entries (brute-force format and order),
+                 "exhaustive", "evaluated", "total", "max_evals" (the
+                 evaluation cap applied, None without one), "stopped"
+                 ("complete" | "max_evals" | "time_budget"), "skipped"
+                 (techniques not fitted in time), "elapsed_ms"}.
+        """
+        from itertools import combinations
+
+        started = time.perf_counter()
+        data    = self.as_signal(data)
+        techs   = self.techniques.names()
+        n_techs = len(techs)
+        total   = 2 ** n_techs - 1
+
+        if max_evals is not None and max_evals < n_techs:
+            raise ValueError(f"max_evals must be at least {n_techs} (one per solo technique), "
+                             f"got {max_evals}")
+
+        if max_evals is None and time_budget is None:
+            results = self.run_brute_force_benchmark(data)
+            return {
+                "results":    results[:top_k],
+                "exhaustive": True,
+                "evaluated":  total,
+                "total":      total,
+                "max_evals":  None,
+                "stopped":    "complete",
+                "skipped":    [],
+                "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 2),
+            }
+
+        deadline = None if time_budget is None else started + time_budget
+        if deadline is None:
+            stack, fitted = self._solo_stack(techs, data), list(range(n_techs))
+        else:
+            fit_deadline  = started + time_budget * self.BUDGET_FIT_SHARE
+            stack, fitted = self._solo_stack_until(techs, data, fit_deadline)
+        limit   = total if max_evals is None else min(int(max_evals), total)
+        profile = self.metrics_profile(data)
+        scored: Dict[tuple, Dict[str, Any]] = {}
+
+        def score(combo: tuple):
+            combo_list = [techs[i] for i in combo]
+            if len(combo) == 1:
+                scored[combo] = self._benchmark_entry(combo_list, "solo", data, stack[combo[0]],
+                                                      profile)
+                return
+            mask = np.zeros((1, n_techs), dtype=bool)
+            mask[0, list(combo)] = True
+            refined = self._consensus_from_stack(stack, data, mask)[0]
+            scored[combo] = self._benchmark_entry(combo_list, "hybrid", data, refined, profile)
+
+        for i in fitted:
+            score((i,))
+        solo_scores = np.zeros(n_techs)
+        for i in fitted:
+            solo_scores[i] = scored[(i,)]["total_score"]
+
+        def priority(combo: tuple):
+            return (-float(solo_scores[list(combo)].mean()), combo)
+
+        def ranked(size: int) -> List[tuple]:
+            level = [c for c in scored if len(c) == size]
+            return sorted(level, key=lambda c: (-scored[c]["total_score"], c))
+
+        def search_order():
+            frontier = ranked(1)[:beam_width]
+            for size in range(2, n_techs + 1):
+                children = {tuple(sorted(c + (j,)))
+                            for c in frontier for j in fitted if j not in c}
+                yield from sorted(children - scored.keys(), key=priority)
+                frontier = ranked(size)[:beam_width]
+            rest = (c for r in range(2, len(fitted) + 1)
+                    for c in combinations(fitted, r) if c not in scored)
+            yield from sorted(rest, key=priority)
+
+        stopped = "complete" if len(fitted) == n_techs else "time_budget"
+        for combo in search_order():
+            if len(scored) >= limit:
+                stopped = "max_evals"
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                stopped = "time_budget"
+                break
+            score(combo)
+
+        # Same order as the brute-force leaderboard: score, then
+        # itertools.combinations order (size, lexicographic)
+        leaderboard = sorted(scored, key=lambda c: (-scored[c]["total_score"], len(c), c))
+        return {
+            "results":    [scored[c] for c in leaderboard[:top_k]],
+            "exhaustive": len(scored) == total,
+            "evaluated":  len(scored),
+            "total":      total,
+            "max_evals":  None if max_evals is None else limit,
+            "stopped":    stopped,
+            "skipped":    [t for i, t in enumerate(techs) if i not in fitted],
+            "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 2),
+        }
+
+    def _solo_stack_until(self, techs: List[str], data: np.ndarray,
+                          deadline: float):
+        """
+        Solo stack fitted cheapest cost class first until `deadline`.
+        A technique is only started when its expected fit time fits the
+        time left. Cheap numpy techniques (and everything, without a
+        pool) run one at a time in this thread; model fits go to the
+        pool one cost class at a time with the deadline as timeout, and
+        fits that overrun it count as not fitted.
+
+        Returns (stack, fitted indices); rows of unfitted techniques
+        hold the raw signal and must not be used.
+        """
+        n      = len(data)
+        order  = self.techniques.by_cost(techs)
+        stack  = np.tile(self.as_signal(data), (len(techs), 1))
+        fitted = []
 
+        if self.executor is None or self.executor.runs_inline(order, data):
+            in_thread, pooled = order, []
+        else:
+            # Kept out of the pool so fits abandoned by an earlier
+            # deadline cannot hold up the techniques that always fit
+            in_thread = [t for t in order if self.techniques.get(t).cost == COST_CHEAP]
+            pooled    = [t for t in order if t not in in_thread]
+
+        for t in in_thread:
+            if time.perf_counter() + self.expected_fit_seconds(t, n) > deadline:
+                continue
+            stack[techs.index(t)] = self.run_solo(t, data)
+            fitted.append(techs.index(t))
+
+        batches = []
+        for t in pooled:
+            if batches and self.techniques.get(t).cost == self.techniques.get(batches[-1][0]).cost:
+                batches[-1].append(t)
+            else:
+                batches.append([t])
+
+        # Backends the pool workers have not imported yet pay for it in the fit
+        cold = {t for t in pooled
+                if self.techniques.get(t).backend not in self.executor.preload}
+        for batch in batches:
+            left  = deadline - time.perf_counter()
+            batch = [t for t in batch
+                     if self.expected_fit_seconds(t, n, cold_import=t in cold) <= left]
+            if not batch:
+                continue
+            failed: List[str] = []
+            started = time.perf_counter()
+            rows    = self.executor.map_solo(self, batch, data, deadline=deadline, failed=failed)
+            elapsed = time.perf_counter() - started
+            for t, row in zip(batch, rows):
+                if t in failed:
+                    continue
+                stack[techs.index(t)] = row
+                fitted.append(techs.index(t))
+                # Pool fits are only timed as a batch — a conservative estimate
+                self.fit_timings[t] = (n, elapsed)
+        return stack, sorted(fitted)
+
+
+# ===========================================================
+# Built-in technique registry — registration order is the
+# canonical technique order (benchmark combinations, API docs)
+# ===========================================================
+
+TECHNIQUES = TechniqueRegistry()
+
+TECHNIQUES.register(Technique(
+    "cul", ForensicMLEngine._solo_cul, cost=COST_CHEAP, streaming=True,
+    rows=ForensicMLEngine.cul_v4_rows,
+    description="Median-anchored 2.5-sigma gate with SCR protection",
+))
+TECHNIQUES.register(Technique(
+    "gmm", ForensicMLEngine._solo_gmm, cost=COST_MODERATE, needs_fit=True,
+    backend="gmm", description="Gaussian mixture; non-baseline components past 2.5 sigma",
+))
+TECHNIQUES.register(Technique(
+    "kmeans", ForensicMLEngine._solo_kmeans, cost=COST_CHEAP,
+    description="Two-centroid 1-D k-means seeded at mean / mean + 2.5 sigma",
+))
+TECHNIQUES.register(Technique(
+    "dbscan", ForensicMLEngine._solo_dbscan, cost=COST_MODERATE, needs_fit=True,
+    backend="dbscan", description="Density noise points, eps from inter-sample variation",
+))
+TECHNIQUES.register(Technique(
+    "iso_forest", ForensicMLEngine._solo_iso_forest, cost=COST_HEAVY, needs_fit=True,
+    backend="iso_forest", description="150-tree isolation forest, adaptive contamination",
+))
+TECHNIQUES.register(Technique(
+    "lof", ForensicMLEngine._solo_lof, cost=COST_MODERATE, needs_fit=True,
+    backend="lof", description="Local outlier factor, adaptive neighbourhood",
+))
+TECHNIQUES.register(Technique(
+    "pca", ForensicMLEngine._solo_pca, cost=COST_CHEAP, streaming=True,
+    description="Rank-1 singular spectrum reconstruction blended 60/40",
+))
+
+ForensicMLEngine.BENCHMARK_TECHNIQUES = tuple(TECHNIQUES.names())
 
 engine = ForensicMLEngine()
@@ -0,0 +1,272 @@
+import os
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from ml_engine import load_backend
+
+
+class WarmDetector:
+    """
+    One fitted detector (gmm / iso_forest) for one subject.
+
+    The model is fitted on a calibration segment and then only asked to
+    predict. Segments are centred on their own median before they reach
+    the model, so slow tonic (SCL) drift never invalidates it; a segment
+    whose robust spread has moved away from the calibration segment's
+    triggers a refit on that segment:
+
+      gmm          refit with warm_start — EM restarts from the previous
+                   means/covariances and converges in a few iterations;
+                   a component that dies in the process forces a cold fit
+      iso_forest   rebuilt from scratch (its warm_start only adds trees)
+
+    Every detector is also refitted when the number of points it flags
+    strays from what a cold fit would flag by more than `count_tolerance`
+    (relative) — the calibration model no longer describes the subject
+    even though the spread looks stable.
+
+    Artifact masks are formed exactly as in run_solo (2.5-sigma gate for
+    GMM, SCR protection, linear-interpolation healing); only the fit
+    is skipped when the subject has not drifted.
+    """
+
+    # LOF stays transductive: a novelty-mode kneighbors query costs as
+    # much as fit_predict on segments this size, so there is nothing to save.
+    TECHNIQUES = ("gmm", "iso_forest")
+
+    def __init__(self, engine, technique: str,
+                 scale_ratio: float = 2.0, count_tolerance: float = 0.5):
+        if technique not in self.TECHNIQUES:
+            raise ValueError(f"No warm model for technique '{technique}'")
+
+        self.engine          = engine
+        self.technique       = technique
+        self.scale_ratio     = scale_ratio
+        self.count_tolerance = count_tolerance
+        self.model           = None
+        self.scale           = 1.0
+        self.fits            = 0
+        self.predictions     = 0
+        self._lock           = threading.Lock()
+
+    # ===========================================================
+    # Drift check
+    # ===========================================================
+
+    @staticmethod
+    def _robust_scale(centred: np.ndarray) -> float:
+        """MAD-based sigma (floored like _safe_std) — artifacts barely move it."""
+        return max(1.4826 * float(np.median(np.abs(centred))), 0.01)
+
+    def drifted(self, centred: np.ndarray) -> bool:
+        ratio = self._robust_scale(centred) / self.scale
+        return not (1.0 / self.scale_ratio <= ratio <= self.scale_ratio)
+
+    # ===========================================================
+    # Fit / predict
+    # ===========================================================
+
+    def fit(self, data: np.ndarray):
+        """Fit on a raw calibration segment."""
+        self._fit(data - np.median(data), self.engine._adaptive_contamination(data))
+
+    def _fit(self, centred: np.ndarray, contamination: float):
+        x = centred.reshape(-1, 1)
+
+        if self.technique == "gmm":
+            n_comp = 3 if len(centred) >= 15 else 2
+            warm   = self.model is not None and self.model.n_components == n_comp
+            if warm:
+                self.model.fit(x)
+            if not warm or self.model.weights_.min() < 1.0 / len(centred):
+                self.model = load_backend("gmm")(
+                    n_components=n_comp, random_state=42,
+                    covariance_type='full', max_iter=200, warm_start=True
+                ).fit(x)
+
+        else:
+            self.model = load_backend("iso_forest")(
+                contamination=contamination,
+                random_state=42,
+                n_estimators=150
+            ).fit(x)
+
+        self.scale = self._robust_scale(centred)
+        self.fits += 1
+
+    def _outliers(self, data: np.ndarray, centred: np.ndarray) -> np.ndarray:
+        """Detector's own outlier vote (before SCR protection)."""
+        x = centred.reshape(-1, 1)
+        if self.technique == "gmm":
+            means            = self.model.means_.flatten()
+            labels           = self.model.predict(x)
+            baseline_cluster = int(np.argmin(np.abs(means)))   # closest to the median
+            mean = float(np.mean(data))
+            std  = self.engine._safe_std(data)
+            return (
+                (labels != baseline_cluster) &
+                (np.abs(data - mean) > self.engine.ARTIFACT_SIGMA * std)
+            )
+        return self.model.predict(x) == -1
+
+    def _count_mismatch(self, data: np.ndarray, outliers: np.ndarray,
+                        contamination: float) -> bool:
+        """
+        A cold fit flags about ceil(contamination·n) points (iso_forest)
+        or every point past the 2.5-sigma gate it can separate
+        (gmm); a warm model far from that count is stale.
+        """
+        if self.technique == "gmm":
+            gate     = np.abs(data - np.mean(data)) > self.engine.ARTIFACT_SIGMA * self.engine._safe_std(data)
+            expected = int(gate.sum())
+        else:
+            expected = int(np.ceil(contamination * len(data)))
+        return abs(int(outliers.sum()) - expected) > self.count_tolerance * expected
+
+    def refine(self, data: np.ndarray) -> np.ndarray:
+        try:
+            centred       = data - np.median(data)
+            contamination = self.engine._adaptive_contamination(data)
+            with self._lock:
+                fresh = self.model is None or self.drifted(centred)
+                if fresh:
+                    self._fit(centred, contamination)
+                outliers = self._outliers(data, centred)
+                if not fresh and self._count_mismatch(data, outliers, contamination):
+                    self._fit(centred, contamination)
+                    outliers = self._outliers(data, centred)
+                self.predictions += 1
+            artifact_mask = outliers & ~self.engine._detect_scr_events(data)
+            return self.engine._interpolate_artifacts(data, artifact_mask)
+        except Exception as e:
+            print(f"[ML Engine] Warm model error [{self.technique}]: {str(e)}")
+            return data.copy()
+
+
+class SubjectModelRegistry:
+    """
+    ============================================================
+    SIGNAL FORGE — WARM PER-SUBJECT DETECTOR MODELS
+    ============================================================
+    /analyze and the live loop used to construct and fit a fresh
+    GaussianMixture and 150-tree IsolationForest on every call,
+    even for a 31-sample window of a subject whose distribution has
+    barely moved. Calls that carry a subject id are routed here instead:
+    the subject's detectors are fitted once (on the first segment, or an
+    explicit calibration segment) and then reused for prediction until
+    the drift check asks for a refit (see WarmDetector).
+
+    Techniques without a separable fit (cul, kmeans, dbscan, lof, pca)
+    are cheap or transductive and still run through engine.run_solo.
+
+    Settings (constructor args, or environment via from_env()):
+      FORGE_MODEL_SUBJECTS      subjects kept warm, LRU (0 disables)
+      FORGE_MODEL_TTL           seconds before an idle subject is dropped
+      FORGE_MODEL_DRIFT_RATIO   spread change (× calibration MAD sigma)
+                                that triggers a refit
+    ============================================================
+    """
+
+    def __init__(self, engine, max_subjects: int = 512, idle_ttl: float = 1800.0,
+                 scale_ratio: float = 2.0):
+        self.engine       = engine
+        self.max_subjects = max_subjects
+        self.idle_ttl     = idle_ttl
+        self.scale_ratio  = scale_ratio
+        self._subjects: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, engine) -> Optional["SubjectModelRegistry"]:
+        max_subjects = int(os.environ.get("FORGE_MODEL_SUBJECTS", "512"))
+        if max_subjects <= 0:
+            return None
+        return cls(
+            engine,
+            max_subjects = max_subjects,
+            idle_ttl     = float(os.environ.get("FORGE_MODEL_TTL", "1800")),
+            scale_ratio  = float(os.environ.get("FORGE_MODEL_DRIFT_RATIO", "2.0")),
+        )
+
+    def __len__(self) -> int:
+        return len(self._subjects)
+
+    # ===========================================================
+    # Subject store
+    # ===========================================================
+
+    def _evict(self):
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._subjects:
+            subject_id, (_, last_seen) = next(iter(self._subjects.items()))
+            if len(self._subjects) < self.max_subjects and last_seen >= cutoff:
+                break
+            del self._subjects[subject_id]
+
+    def _detector(self, subject_id: str, technique: str) -> WarmDetector:
+        with self._lock:
+            entry = self._subjects.pop(subject_id, None)
+            if entry is None:
+                self._evict()
+                detectors: Dict[str, WarmDetector] = {}
+            else:
+                detectors = entry[0]
+            self._subjects[subject_id] = (detectors, time.monotonic())
+
+            detector = detectors.get(technique)
+            if detector is None:
+                detector = WarmDetector(self.engine, technique,
+                                        self.scale_ratio)
+                detectors[technique] = detector
+            return detector
+
+    def close(self, subject_id: str) -> bool:
+        with self._lock:
+            return self._subjects.pop(subject_id, None) is not None
+
+    # ===========================================================
+    # Engine-shaped entry points
+    # ===========================================================
+
+    def run_solo(self, subject_id: str, technique: str, data: np.ndarray) -> np.ndarray:
+        if technique not in WarmDetector.TECHNIQUES:
+            return self.engine.run_solo(technique, data)
+        return self._detector(subject_id, technique).refine(data)
+
+    def run_mode(self, subject_id: str, mode: str, techniques: List[str],
+                 data: np.ndarray) -> np.ndarray:
+        """engine.run_mode with the subject's warm detectors."""
+        if mode == "solo":
+            return self.run_solo(subject_id, techniques[0] if techniques else "cul", data)
+        if not techniques:
+            return data
+        stack = np.array([self.run_solo(subject_id, t, data) for t in techniques])
+        return self.engine._consensus_from_stack(
+            stack, data, np.ones((1, len(techniques)), dtype=bool)
+        )[0]
+
+    def calibrate(self, subject_id: str, techniques: List[str],
+                  data: np.ndarray) -> List[str]:
+        """Fit the subject's warm detectors on a calibration segment; returns those fitted."""
+        fitted = []
+        for technique in techniques:
+            if technique in WarmDetector.TECHNIQUES:
+                detector = self._detector(subject_id, technique)
+                with detector._lock:
+                    detector.fit(data)
+                fitted.append(technique)
+        return fitted
+
+    def stats(self) -> dict:
+        with self._lock:
+            detectors = [d for entry in self._subjects.values() for d in entry[0].values()]
+        return {
+            "subjects":     len(self._subjects),
+            "max_subjects": self.max_subjects,
+            "detectors":    len(detectors),
+            "fits":         sum(d.fits for d in detectors),
+            "predictions":  sum(d.predictions for d in detectors),
+        }
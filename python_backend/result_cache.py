@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+import numpy as np
+
+
+class ResultCache:
+    """
+    ============================================================
+    SIGNAL FORGE — CONTENT-ADDRESSED RESULT CACHE
+    ============================================================
+    The forge page re-posts the same dataset whenever a technique is
+    toggled back and forth, and the auditor re-runs /benchmark on the
+    same history. Engine output is a pure function of
+    (signal bytes, request kind, mode, techniques, engine version), so
+    identical requests are answered from here instead of refitting.
+
+      key      blake2b(raw float64 bytes) + kind + params + version
+      memory   LRU bounded by `max_bytes` (arrays by nbytes, other
+               values by their pickled size)
+      disk     optional write-through tier under `disk_dir`; a memory
+               miss that hits disk is promoted back into memory
+      stats    hits / disk_hits / misses / evictions / bytes
+
+    Cached arrays are stored read-only so no caller can corrupt them.
+    ============================================================
+    """
+
+    def __init__(self, max_bytes: int = 256 << 20, disk_dir: Optional[str] = None,
+                 version: str = ""):
+        self.max_bytes = max_bytes
+        self.disk_dir  = disk_dir
+        self.version   = version
+        self.bytes     = 0
+        self.hits      = 0
+        self.disk_hits = 0
+        self.misses    = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls, version: str) -> Optional["ResultCache"]:
+        """FORGE_CACHE_MB (0 disables), FORGE_CACHE_DIR (optional disk tier)."""
+        megabytes = int(os.environ.get("FORGE_CACHE_MB", "256"))
+        if megabytes <= 0:
+            return None
+        return cls(megabytes << 20, os.environ.get("FORGE_CACHE_DIR") or None, version)
+
+    # ===========================================================
+    # Keys and sizing
+    # ===========================================================
+
+    def key(self, kind: str, raw: np.ndarray, *params: Any) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(np.ascontiguousarray(raw, dtype=np.float64).tobytes())
+        digest.update(json.dumps([kind, self.version, params],
+                                 separators=(",", ":"), default=str).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _freeze(value: Any) -> Any:
+        if isinstance(value, np.ndarray):
+            value = value.copy()
+            value.setflags(write=False)
+            return value
+        if isinstance(value, tuple):
+            return tuple(ResultCache._freeze(v) for v in value)
+        return value
+
+    @staticmethod
+    def _sizeof(value: Any) -> int:
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, tuple):
+            return sum(ResultCache._sizeof(v) for v in value)
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    # ===========================================================
+    # Lookup / store
+    # ===========================================================
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        # Disk I/O stays outside the lock; the counters do not
+        value = self._disk_load(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._store(key, value)
+        return value
+
+    def put(self, key: str, value: Any) -> Any:
+        value = self._freeze(value)
+        self._store(key, value)
+        self._disk_save(key, value)
+        return value
+
+    def _store(self, key: str, value: Any):
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes     -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    # ===========================================================
+    # Disk tier
+    # ===========================================================
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], key + ".pkl")
+
+    def _disk_load(self, key: str) -> Optional[Any]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                return self._freeze(pickle.load(f))
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _disk_save(self, key: str, value: Any):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp  = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[Result Cache] Disk write failed: {str(e)}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, disk_hits, misses = self.hits, self.disk_hits, self.misses
+            entries, size, evictions = len(self._entries), self.bytes, self.evictions
+        lookups = hits + disk_hits + misses
+        return {
+            "entries":   entries,
+            "bytes":     size,
+            "max_bytes": self.max_bytes,
+            "hits":      hits,
+            "disk_hits": disk_hits,
+            "misses":    misses,
+            "evictions": evictions,
+            "hit_rate":  round((hits + disk_hits) / lookups, 4) if lookups else 0.0,
+            "disk_tier": self.disk_dir,
+        }
@@ -0,0 +1,175 @@
+import atexit
+import os
+import secrets
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+# (segment name, shape, dtype str) — all a worker needs to attach
+Handle = Tuple[str, Tuple[int, ...], str]
+
+SEGMENT_PREFIX = "forge_"
+
+_live: Dict[str, "SharedArray"] = {}
+_live_lock = threading.Lock()
+_totals = {"created": 0, "bytes_created": 0}
+
+
+class SharedArray:
+    """
+    One ndarray backed by a named POSIX shared-memory segment, owned by
+    the process that created it. Workers attach by `handle`; the owner
+    calls release() (SharedArena does) to close and unlink it.
+    """
+
+    def __init__(self, shape: Tuple[int, ...], dtype=np.float64):
+        dtype  = np.dtype(dtype)
+        nbytes = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        name   = f"{SEGMENT_PREFIX}{os.getpid()}_{secrets.token_hex(6)}"
+
+        self.shm    = shared_memory.SharedMemory(name=name, create=True, size=nbytes)
+        self.shape  = tuple(int(s) for s in shape)
+        self.dtype  = dtype.str
+        self.nbytes = nbytes
+        self.array  = np.ndarray(self.shape, dtype, buffer=self.shm.buf)
+
+        with _live_lock:
+            _live[name] = self
+            _totals["created"]       += 1
+            _totals["bytes_created"] += nbytes
+
+    @property
+    def handle(self) -> Handle:
+        return (self.shm.name, self.shape, self.dtype)
+
+    def release(self):
+        """Close and unlink; safe to call twice."""
+        with _live_lock:
+            if _live.pop(self.shm.name, None) is None:
+                return
+        self.array = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # A caller still holds a view; the mapping goes away with it
+            pass
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedArena:
+    """
+    ============================================================
+    SIGNAL FORGE — SHARED-MEMORY SIGNAL BUFFERS
+    ============================================================
+    Transport for process-pool fan-out. Instead of pickling the raw
+    signal into every task and every reconstruction back out, the
+    caller copies the raw array into one segment once, allocates one
+    output segment for the whole (n_tasks, n) result stack, and sends
+    each worker only the two handles and its row index. Workers map
+    both zero-copy (attached) and write their reconstruction in place.
+
+    Lifecycle — every segment of a fan-out call belongs to one arena:
+      normal exit / exception   release() (or the `with` block) frees
+                                them all
+      timed-out worker          the executor defers release() until
+                                every task it submitted is done, so a
+                                late worker can still attach and write
+      worker crash              its future completes with the error,
+                                which counts as done
+      owner process crash       multiprocessing's resource tracker
+                                unlinks every segment it registered
+      interpreter exit          release_all() runs from atexit
+
+    Results must be copied out (np.array(seg.array[k])) before the
+    arena closes — views into a released segment are invalid.
+    ============================================================
+    """
+
+    def __init__(self):
+        self._segments: List[SharedArray] = []
+
+    def empty(self, shape: Tuple[int, ...], dtype=np.float64) -> SharedArray:
+        segment = SharedArray(shape, dtype)
+        self._segments.append(segment)
+        return segment
+
+    def copy_of(self, data: np.ndarray) -> SharedArray:
+        data    = np.ascontiguousarray(data)
+        segment = self.empty(data.shape, data.dtype)
+        segment.array[...] = data
+        return segment
+
+    def release(self):
+        while self._segments:
+            self._segments.pop().release()
+
+    def __enter__(self) -> "SharedArena":
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class attached:
+    """
+    Worker side: `with attached(handle) as view:` maps a segment by
+    name and yields an ndarray over it (read-only unless writeable).
+    The mapping is closed on exit.
+    """
+
+    def __init__(self, handle: Handle, writeable: bool = False):
+        self.handle    = handle
+        self.writeable = writeable
+        self._shm      = None
+        self._view     = None
+
+    def __enter__(self) -> np.ndarray:
+        name, shape, dtype = self.handle
+        self._shm  = shared_memory.SharedMemory(name=name)
+        self._view = np.ndarray(shape, np.dtype(dtype), buffer=self._shm.buf)
+        self._view.flags.writeable = self.writeable
+        return self._view
+
+    def __exit__(self, *exc):
+        self._view = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # Something (e.g. a traceback frame) still references the
+            # view; the mapping is dropped when that reference is
+            pass
+        self._shm = None
+
+
+def ensure_tracker():
+    """
+    Start the resource tracker before forking pool workers, so they
+    share the parent's tracker instead of each starting their own
+    (which would unlink the parent's segments when a worker exits).
+    """
+    resource_tracker.ensure_running()
+
+
+def release_all():
+    with _live_lock:
+        segments = list(_live.values())
+    for segment in segments:
+        segment.release()
+
+
+def stats() -> Dict[str, int]:
+    with _live_lock:
+        return {
+            "live_segments": len(_live),
+            "live_bytes":    sum(s.nbytes for s in _live.values()),
+            **_totals,
+        }
+
+
+atexit.register(release_all)
@@ -0,0 +1,323 @@
+import math
+import time
+import numpy as np
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+
+class StreamingReconstructor:
+    """
+    ============================================================
+    CUL-v4 STREAMING EDITION — one sample in, one sample out
+    ============================================================
+    The monitor loop used to post the last 30 samples + the new one and
+    have the server rebuild the window, its median/std, the SCR mask and
+    the full interpolation only to keep refined[-1].
+
+    This class keeps the window server-side and answers that same
+    question in constant work per tick:
+
+      - ring buffer of the last `window` samples
+      - sorted mirror for the rolling median (bisect search, O(log w))
+      - running sum / sum-of-squares for the rolling std, resynced
+        once per window to bound floating-point drift
+      - SCR protection evaluated lazily, only for the few points the
+        backward clean-neighbour scan actually visits
+
+    Output equals cul_v4_logic(window)[-1] on the same window:
+      * the newest point can never be an SCR (no successor), so it is
+        healed iff it sits beyond the 2.5-sigma anchor threshold
+      * a healed newest point takes the nearest clean point behind it
+        (no clean point to its right exists yet), else the median
+    ============================================================
+    """
+
+    def __init__(self, engine, window: int = 31):
+        if window < 1:
+            raise ValueError("Streaming window must hold at least one sample")
+
+        self.engine   = engine
+        self.window   = window
+        self._ring    = [0.0] * window
+        self._start   = 0
+        self._count   = 0
+        self._sorted  = []
+        self._sum     = 0.0
+        self._sumsq   = 0.0
+        self._ticks   = 0
+        self.last_seen = time.monotonic()
+
+    def __len__(self) -> int:
+        return self._count
+
+    # ===========================================================
+    # Rolling window bookkeeping
+    # ===========================================================
+
+    def _at(self, j: int) -> float:
+        """Logical index j (0 = oldest) into the ring buffer."""
+        return self._ring[(self._start + j) % self.window]
+
+    def _append(self, value: float):
+        if self._count == self.window:
+            old = self._ring[self._start]
+            del self._sorted[bisect_left(self._sorted, old)]
+            self._sum   -= old
+            self._sumsq -= old * old
+            self._ring[self._start] = value
+            self._start = (self._start + 1) % self.window
+        else:
+            self._ring[(self._start + self._count) % self.window] = value
+            self._count += 1
+
+        insort(self._sorted, value)
+        self._sum   += value
+        self._sumsq += value * value
+
+        self._ticks += 1
+        if self._ticks % self.window == 0:
+            values      = self.values()
+            self._sum   = math.fsum(values)
+            self._sumsq = math.fsum(v * v for v in values)
+
+    def _median(self) -> float:
+        n, mid = self._count, self._count // 2
+        if n % 2:
+            return float(self._sorted[mid])
+        return float((self._sorted[mid - 1] + self._sorted[mid]) / 2)
+
+    def _std(self) -> float:
+        """Same floor as ForensicMLEngine._safe_std."""
+        mean = self._sum / self._count
+        var  = max(self._sumsq / self._count - mean * mean, 0.0)
+        return max(math.sqrt(var), 0.01)
+
+    # ===========================================================
+    # Public API
+    # ===========================================================
+
+    def values(self) -> List[float]:
+        """Current window, oldest first."""
+        return [self._at(j) for j in range(self._count)]
+
+    def prime(self, history: Iterable[float]):
+        """Seed the window (e.g. from the legacy history payload) without output."""
+        self.last_seen = time.monotonic()
+        for value in history:
+            self._append(float(value))
+
+    def push(self, value: float) -> float:
+        """Add one raw sample and return its refined value."""
+        self.last_seen = time.monotonic()
+        self._append(float(value))
+
+        n         = self._count
+        anchor    = self._median()
+        std       = self._std()
+        threshold = std * self.engine.ARTIFACT_SIGMA + 0.001
+
+        newest = self._at(n - 1)
+        if abs(newest - anchor) <= threshold:
+            return newest
+
+        art_ceiling = anchor + self.engine.ARTIFACT_SIGMA * std
+        for j in range(n - 2, -1, -1):
+            x = self._at(j)
+            if abs(x - anchor) <= threshold:
+                return x
+            # Protected SCR points count as clean neighbours (interior only)
+            if j >= 1:
+                rise = x - self._at(j - 1)
+                if (0 < rise < std * 2.5 and
+                        0.05 <= x - anchor <= self.engine.SCR_MAX_AMPLITUDE and
+                        x < art_ceiling):
+                    return x
+
+        return anchor
+
+
+class StreamingSSA:
+    """
+    ============================================================
+    "pca" TECHNIQUE, STREAMING EDITION — rank-1 SSA per sample
+    ============================================================
+    The batch pca technique refits the principal component of the
+    window's trajectory (Hankel) matrix. Sliding the window by one
+    sample only swaps one trajectory row for another, so instead of
+    refitting this class keeps
+
+      - column sums of the trajectory matrix          (lag)
+      - its lag cross-product matrix H^T H            (lag × lag)
+
+    and updates both in O(lag²) per tick (outer product of the row
+    that enters minus the row that leaves), resynced from the window
+    once per `window` ticks to bound floating-point drift. Each tick
+    then solves only the lag × lag eigenproblem.
+
+    Output equals run_solo("pca", window)[-1]: the newest sample is
+    covered by a single trajectory row, so its diagonal average is
+    that row's rank-1 reconstruction in the last lag column.
+    Until the window is full the batch technique is used as-is.
+    ============================================================
+    """
+
+    def __init__(self, engine, window: int = 31):
+        if window < 1:
+            raise ValueError("Streaming window must hold at least one sample")
+
+        self.engine  = engine
+        self.window  = window
+        self.lag     = int(np.clip(min(8, window // 3), 3, 16))   # as run_solo("pca")
+        self.rows    = window - self.lag + 1
+        # Every sample is written twice so the window is always the
+        # contiguous slice _buf[_start:_start + _count]
+        self._buf     = np.zeros(2 * window)
+        self._start   = 0
+        self._count   = 0
+        self._colsum  = np.zeros(self.lag)
+        self._lagprod = np.zeros((self.lag, self.lag))
+        self._ticks   = 0
+        self.last_seen = time.monotonic()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def values(self) -> np.ndarray:
+        """Current window, oldest first (a view — copy before keeping it)."""
+        return self._buf[self._start:self._start + self._count]
+
+    def _resync(self):
+        rows = np.lib.stride_tricks.sliding_window_view(self.values(), self.lag)
+        self._colsum  = rows.sum(axis=0)
+        self._lagprod = rows.T @ rows
+
+    def _append(self, value: float):
+        n = self.window
+        if self._count == n and n <= self.lag:
+            # Too short for a trajectory matrix: push() runs the batch technique
+            self._buf[self._start] = self._buf[self._start + n] = value
+            self._start = (self._start + 1) % n
+        elif self._count == n:
+            leaving = self._buf[self._start:self._start + self.lag].copy()
+            self._buf[self._start] = self._buf[self._start + n] = value
+            self._start = (self._start + 1) % n
+            entering = self._buf[self._start + n - self.lag:self._start + n]
+
+            self._colsum  += entering - leaving
+            self._lagprod += np.outer(entering, entering) - np.outer(leaving, leaving)
+            self._ticks   += 1
+            if self._ticks % n == 0:
+                self._resync()
+        else:
+            i = (self._start + self._count) % n
+            self._buf[i] = self._buf[i + n] = value
+            self._count += 1
+            if self._count == n and n > self.lag:
+                self._resync()
+
+    def prime(self, history: Iterable[float]):
+        self.last_seen = time.monotonic()
+        for value in history:
+            self._append(float(value))
+
+    def push(self, value: float) -> float:
+        """Add one raw sample and return its refined value."""
+        self.last_seen = time.monotonic()
+        value = float(value)
+        self._append(value)
+
+        if self._count < self.window or self.window <= self.lag:
+            return float(self.engine.run_solo("pca", self.values().copy())[-1])
+
+        mean      = self._colsum / self.rows
+        cov       = self._lagprod - self.rows * np.outer(mean, mean)
+        component = np.linalg.eigh(cov)[1][:, -1]
+        newest    = self._buf[self._start + self.window - self.lag:self._start + self.window]
+        score     = float((newest - mean) @ component)
+        pca_value = mean[-1] + score * component[-1]
+        return value * 0.40 + pca_value * 0.60
+
+
+class StreamRegistry:
+    """
+    Per-session streaming state store for live sensors
+    (StreamingReconstructor by default, StreamingSSA for "pca").
+    LRU-bounded with idle expiry, so several hundred concurrent
+    sensors cost a few KB each and abandoned sessions are reclaimed.
+    """
+
+    def __init__(self, engine, window: int = 31,
+                 max_sessions: int = 2048, idle_ttl: float = 600.0,
+                 stream_cls=StreamingReconstructor):
+        self.engine       = engine
+        self.window       = window
+        self.max_sessions = max_sessions
+        self.idle_ttl     = idle_ttl
+        self.stream_cls   = stream_cls
+        self._sessions: "OrderedDict" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _evict(self):
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._sessions:
+            sid, stream = next(iter(self._sessions.items()))
+            if len(self._sessions) < self.max_sessions and stream.last_seen >= cutoff:
+                break
+            del self._sessions[sid]
+
+    def get(self, session_id: str,
+            history: Optional[Iterable[float]] = None):
+        stream = self._sessions.get(session_id)
+        if stream is None:
+            self._evict()
+            stream = self.stream_cls(self.engine, self.window)
+            if history is not None:
+                # Keep room for the sample about to be pushed; with a
+                # one-sample window nothing is primed
+                history = list(history)
+                stream.prime(history[max(len(history) - (self.window - 1), 0):])
+            self._sessions[session_id] = stream
+        else:
+            self._sessions.move_to_end(session_id)
+        return stream
+
+    def push(self, session_id: str, value: float,
+             history: Optional[Iterable[float]] = None) -> float:
+        return self.get(session_id, history).push(value)
+
+    def close(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+
+
+# ===========================================================
+# WebSocket frame codec — /ws/stream
+# ===========================================================
+#
+#   [u8 id_len][id_len bytes UTF-8 session id][float32 LE samples ...]
+#
+# The same layout is used in both directions, so one socket can carry
+# several sensors and every reply frame says which sensor it belongs to.
+
+FRAME_DTYPE = np.dtype("<f4")
+
+
+def decode_frame(frame: bytes) -> Tuple[str, np.ndarray]:
+    if len(frame) < 1:
+        raise ValueError("Empty stream frame")
+    id_len = frame[0]
+    offset = 1 + id_len
+    if len(frame) < offset or (len(frame) - offset) % FRAME_DTYPE.itemsize:
+        raise ValueError("Malformed stream frame: payload is not packed float32")
+    session_id = frame[1:offset].decode("utf-8")
+    samples    = np.frombuffer(frame, dtype=FRAME_DTYPE, offset=offset)
+    return session_id, samples
+
+
+def encode_frame(session_id: str, samples: np.ndarray) -> bytes:
+    tag = session_id.encode("utf-8")
+    if len(tag) > 255:
+        raise ValueError("Session id longer than 255 bytes")
+    return bytes([len(tag)]) + tag + np.asarray(samples, dtype=FRAME_DTYPE).tobytes()
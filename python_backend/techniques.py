@@ -0,0 +1,137 @@
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional
+
+
+# Cost classes — rough fit cost on a live window, used for ordering
+COST_CHEAP    = 0     # pure numpy statistics (cul, kmeans, pca)
+COST_MODERATE = 1     # one sklearn fit, sub-linear to n log n (gmm, dbscan, lof)
+COST_HEAVY    = 2     # ensemble fits (iso_forest: 150 trees)
+
+COST_NAMES = {COST_CHEAP: "cheap", COST_MODERATE: "moderate", COST_HEAVY: "heavy"}
+
+# Fit time prior per cost class: (fixed seconds, seconds per sample),
+# from warm fits on generated signals. Used until the engine has timed
+# the technique itself (ForensicMLEngine.expected_fit_seconds).
+COST_PRIOR_SECONDS = {
+    COST_CHEAP:    (0.001, 3e-7),
+    COST_MODERATE: (0.005, 3e-6),
+    COST_HEAVY:    (0.25,  3e-5),
+}
+
+
+class Technique:
+    """
+    One run_solo technique and what it can do.
+
+      run(engine, data, ctx)   1-D signal → refined signal; `ctx` is the
+                               engine's shared per-call statistics
+      rows(engine, X)          optional: every row of a (channels, n)
+                               matrix in one vectorized pass
+      streaming                has a per-sample incremental implementation
+                               for live sessions (streaming.py)
+      cost                     COST_CHEAP / COST_MODERATE / COST_HEAVY
+      needs_fit                fits a model (candidate for warm reuse)
+      backend                  lazily imported estimator (ml_engine
+                               TECHNIQUE_BACKENDS key), None = numpy only
+    """
+
+    def __init__(self, name: str, run: Callable,
+                 cost: int = COST_CHEAP,
+                 needs_fit: bool = False,
+                 streaming: bool = False,
+                 rows: Optional[Callable] = None,
+                 backend: Optional[str] = None,
+                 description: str = ""):
+        self.name        = name
+        self.run         = run
+        self.cost        = cost
+        self.needs_fit   = needs_fit
+        self.streaming   = streaming
+        self.rows        = rows
+        self.backend     = backend
+        self.description = description
+
+    def prior_seconds(self, n: int) -> float:
+        """Cost-class estimate of one fit on `n` samples."""
+        fixed, per_sample = COST_PRIOR_SECONDS.get(self.cost, COST_PRIOR_SECONDS[COST_HEAVY])
+        return fixed + per_sample * n
+
+    @property
+    def vectorizable(self) -> bool:
+        return self.rows is not None
+
+    def capabilities(self) -> dict:
+        return {
+            "name":         self.name,
+            "cost":         COST_NAMES.get(self.cost, str(self.cost)),
+            "needs_fit":    self.needs_fit,
+            "streaming":    self.streaming,
+            "vectorizable": self.vectorizable,
+            "backend":      self.backend,
+            "description":  self.description,
+        }
+
+
+class UnknownTechnique(ValueError):
+    pass
+
+
+class TechniqueRegistry:
+    """
+    ============================================================
+    SIGNAL FORGE — TECHNIQUE REGISTRY
+    ============================================================
+    run_solo looks techniques up here instead of walking an if/elif
+    chain, and the benchmark, scheduler, result cache and live
+    streaming read the declared capabilities instead of hard-coded
+    name lists. Registration order is the canonical technique order
+    (the auditor's combination order).
+
+    A faster implementation of an existing technique is added with
+    register(..., replace=True); nothing else has to change.
+    ============================================================
+    """
+
+    def __init__(self):
+        self._techniques: "OrderedDict[str, Technique]" = OrderedDict()
+
+    def register(self, technique: Technique, replace: bool = False) -> Technique:
+        if technique.name in self._techniques and not replace:
+            raise ValueError(f"Technique '{technique.name}' is already registered")
+        self._techniques[technique.name] = technique
+        return technique
+
+    def get(self, name: str) -> Technique:
+        technique = self._techniques.get(name)
+        if technique is None:
+            raise UnknownTechnique(
+                f"Unknown technique '{name}' — expected one of {self.names()}"
+            )
+        return technique
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._techniques
+
+    def __iter__(self):
+        return iter(self._techniques.values())
+
+    def names(self) -> List[str]:
+        return list(self._techniques)
+
+    def validate(self, names: Iterable[str]) -> List[str]:
+        """`names` as a list, raising UnknownTechnique on the first bad one."""
+        names = list(names)
+        for name in names:
+            self.get(name)
+        return names
+
+    def by_cost(self, names: Iterable[str], heaviest_first: bool = False) -> List[str]:
+        """Stable sort by cost class (cheap first unless heaviest_first)."""
+        sign = -1 if heaviest_first else 1
+        return sorted(names, key=lambda n: sign * self.get(n).cost)
+
+    def max_cost(self, names: Iterable[str]) -> int:
+        return max((self.get(n).cost for n in names), default=COST_CHEAP)
+
+    def streaming(self) -> List[str]:
+        return [t.name for t in self if t.streaming]
@@ -0,0 +1,209 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from vault import open_vault
+
+
+class TelemetrySink:
+    """
+    ============================================================
+    SIGNAL FORGE — BUFFERED TELEMETRY WRITER
+    ============================================================
+    Rows are no longer written one pandas DataFrame per request.
+    Handlers drop rows into an in-memory buffer and return; a single
+    background writer task owns the vault (vault.py) and appends whole
+    batches:
+
+      - flush when `flush_rows` rows are waiting or every
+        `flush_interval` seconds, whichever comes first
+      - one vault append per batch (one CSV write, or one Parquet part
+        per partition touched)
+      - single writer → concurrent requests can never interleave rows
+      - stop() drains the buffer, so shutdown loses nothing
+      - a failed batch is re-queued ahead of newer rows; after
+        `max_failed_flushes` failures in a row the buffer is capped at
+        `max_buffer_rows`, dropping the oldest rows (`rows_dropped`),
+        so a vault that stays unwritable cannot exhaust memory
+
+    Partitioned vaults (ParquetVault) are compacted by the same writer
+    every `compact_interval` seconds — closed partitions, plus open
+    ones past `compact_open_parts` part files — and fully on stop().
+    A Parquet vault that is still empty when the sink starts imports
+    `import_csv` (the old CSV vault) first.
+
+    Durability (fsync "never" / "flush" / "interval") is a vault setting.
+    ============================================================
+    """
+
+    def __init__(self, vault, flush_rows: int = 256, flush_interval: float = 2.0,
+                 compact_interval: float = 600.0, compact_open_parts: int = 64,
+                 import_csv: Optional[str] = None, max_buffer_rows: int = 100_000,
+                 max_failed_flushes: int = 5):
+        self.vault              = vault
+        self.flush_rows         = max(1, flush_rows)
+        self.flush_interval     = flush_interval
+        self.compact_interval   = compact_interval
+        self.compact_open_parts = compact_open_parts
+        self.import_csv         = import_csv
+        self.max_buffer_rows    = max(self.flush_rows, max_buffer_rows)
+        self.max_failed_flushes = max(1, max_failed_flushes)
+
+        self.rows_written   = 0
+        self.flushes        = 0
+        self.compactions    = 0
+        self.rows_imported  = 0
+        self.rows_dropped   = 0
+        self.failed_flushes = 0     # consecutive; reset by a successful write
+        self._last_compact = time.monotonic()
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task]  = None
+        self._closing       = False
+        self._write_lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def from_env(cls, csv_path: str, fields: Dict[str, type]) -> "TelemetrySink":
+        """
+        FORGE_VAULT="csv" (default) keeps the single CSV at `csv_path`;
+        "parquet" writes the partitioned vault under FORGE_VAULT_DIR
+        and, unless FORGE_VAULT_IMPORT_CSV=0, migrates `csv_path` into
+        it on first start.
+        """
+        kind     = os.environ.get("FORGE_VAULT", "csv")
+        location = csv_path if kind == "csv" else os.environ.get("FORGE_VAULT_DIR", "telemetry_vault")
+        vault    = open_vault(kind, location, fields,
+                              fsync=os.environ.get("FORGE_TELEMETRY_FSYNC", "flush"))
+        return cls(
+            vault,
+            flush_rows     = int(os.environ.get("FORGE_TELEMETRY_FLUSH_ROWS", "256")),
+            flush_interval = float(os.environ.get("FORGE_TELEMETRY_FLUSH_SECS", "2.0")),
+            compact_interval   = float(os.environ.get("FORGE_VAULT_COMPACT_SECS", "600")),
+            compact_open_parts = int(os.environ.get("FORGE_VAULT_COMPACT_OPEN_PARTS", "64")),
+            import_csv = (csv_path if kind == "parquet"
+                          and os.environ.get("FORGE_VAULT_IMPORT_CSV", "1") != "0" else None),
+            max_buffer_rows    = int(os.environ.get("FORGE_TELEMETRY_MAX_BUFFER_ROWS", "100000")),
+            max_failed_flushes = int(os.environ.get("FORGE_TELEMETRY_MAX_FAILED_FLUSHES", "5")),
+        )
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    # ===========================================================
+    # Lifecycle
+    # ===========================================================
+
+    async def start(self):
+        self._closing    = False
+        self._wake       = asyncio.Event()
+        self._write_lock = asyncio.Lock()
+        if self.import_csv and os.path.exists(self.import_csv) and not self.vault.exists():
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._import_csv)
+        self._task       = asyncio.create_task(self._writer_loop())
+
+    async def stop(self):
+        """Flush everything still buffered, compact, and close the file."""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wake.set()
+        await self._task
+        self._task = None
+        try:
+            await self.compact()
+        except Exception as e:
+            print(f"[Telemetry] Compaction error: {str(e)}")
+        self.vault.close()
+
+    # ===========================================================
+    # Producer side
+    # ===========================================================
+
+    def submit(self, rows: List[Dict[str, Any]]):
+        """Queue rows for the writer. Never touches the disk."""
+        self._buffer.extend(rows)
+        if self._wake is not None and len(self._buffer) >= self.flush_rows:
+            self._wake.set()
+
+    async def flush(self):
+        """Write out everything buffered so far (e.g. before an export)."""
+        if self._write_lock is None:
+            # Sink not started (scripts / tests) — write synchronously
+            self._write_rows(self._take())
+            return
+        async with self._write_lock:
+            rows = self._take()
+            if rows:
+                loop = asyncio.get_running_loop()
+                try:
+                    await loop.run_in_executor(None, self._write_rows, rows)
+                except Exception:
+                    # Keep the batch for the next attempt, ahead of newer rows
+                    self._buffer[:0] = rows
+                    self._failed()
+                    raise
+                self.failed_flushes = 0
+
+    async def compact(self, open_parts: Optional[int] = None) -> int:
+        """Merge the vault's part files, serialised with the writer's flushes."""
+        async with self._write_lock:
+            loop   = asyncio.get_running_loop()
+            merged = await loop.run_in_executor(None, self.vault.compact, open_parts)
+        self._last_compact = time.monotonic()
+        self.compactions  += 1
+        return merged
+
+    # ===========================================================
+    # Writer side
+    # ===========================================================
+
+    def _take(self) -> List[Dict[str, Any]]:
+        rows, self._buffer = self._buffer, []
+        return rows
+
+    def _failed(self):
+        """Count a failed flush; past the limit, shed the oldest rows over the cap."""
+        self.failed_flushes += 1
+        excess = len(self._buffer) - self.max_buffer_rows
+        if self.failed_flushes < self.max_failed_flushes or excess <= 0:
+            return
+        del self._buffer[:excess]
+        self.rows_dropped += excess
+        print(f"[Telemetry] Vault unwritable for {self.failed_flushes} flushes — "
+              f"dropped {excess} oldest rows ({self.rows_dropped} total)")
+
+    async def _writer_loop(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"[Telemetry] Flush error: {str(e)}")
+            if time.monotonic() - self._last_compact >= self.compact_interval:
+                try:
+                    await self.compact(self.compact_open_parts)
+                except Exception as e:
+                    print(f"[Telemetry] Compaction error: {str(e)}")
+        await self.flush()
+
+    def _import_csv(self):
+        started = time.perf_counter()
+        self.rows_imported = self.vault.import_csv(self.import_csv)
+        self.vault.compact()
+        print(f"[Telemetry] Imported {self.rows_imported} rows from {self.import_csv} "
+              f"into {self.vault.location} in {time.perf_counter() - started:.1f} s")
+
+    def _write_rows(self, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+        self.vault.append(rows)
+        self.rows_written += len(rows)
+        self.flushes      += 1
@@ -0,0 +1,200 @@
+"""
+Parity tests: the native 1-D detectors in detectors_1d against the
+sklearn estimators they stand in for, fitted with the parameters
+ml_engine uses, on every bundled CSV plus degenerate inputs (constant
+signal, fewer samples than min_samples / components, tied values).
+
+Run from python_backend/:  python -m pytest -q test_detectors_1d.py
+"""
+import warnings
+
+import numpy as np
+import pytest
+from sklearn.cluster import DBSCAN
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.mixture import GaussianMixture
+from sklearn.neighbors import LocalOutlierFactor
+
+import ml_engine
+from benchmark_suite import csv_signals
+from detectors_1d import DBSCAN1D, GaussianMixture1D, LocalOutlierFactor1D
+from ml_engine import ForensicMLEngine
+
+SIGNALS = csv_signals()
+ENGINE  = ForensicMLEngine(precision="float64")
+
+_rng = np.random.default_rng(3)
+EDGE_CASES = {
+    "constant":      np.full(50, 2.0),
+    "constant_tiny": np.full(14, 1.0),
+    "two_levels":    np.r_[np.full(30, 1.0), np.full(20, 4.0)],
+    "three_levels":  np.repeat([1.0, 2.0, 5.0], [10, 25, 15]),
+    "evenly_spaced": np.arange(10.0),     # samples exactly on k-means midpoints
+    "n3":            np.array([1.0, 1.1, 5.0]),
+    "rounded":       np.round(_rng.normal(2.0, 0.3, 300), 1),
+}
+# Many exactly equidistant neighbours — where native LOF may pick a
+# different k-th neighbour than the KD-tree (hence opt-in, see ml_engine)
+DUPLICATE_HEAVY = {"rounded", "constant", "constant_tiny", "two_levels", "three_levels"}
+
+ALL = {**SIGNALS, **EDGE_CASES}
+
+
+def column(data: np.ndarray) -> np.ndarray:
+    return data.reshape(-1, 1)
+
+
+def dbscan_eps(data: np.ndarray) -> float:
+    """eps as ForensicMLEngine._solo_dbscan calibrates it."""
+    inter_var = float(np.mean(np.abs(np.diff(data))))
+    return float(np.clip(max(inter_var * 1.5, ENGINE._safe_std(data) * 0.5), 0.05, 2.0))
+
+
+def test_bundled_csvs_present():
+    assert len(SIGNALS) == 6
+
+
+# ===========================================================
+# DBSCAN
+# ===========================================================
+
+@pytest.mark.parametrize("name", sorted(ALL))
+@pytest.mark.parametrize("min_samples", [2, 5])
+def test_dbscan_matches_sklearn(name, min_samples):
+    data = ALL[name]
+    eps  = dbscan_eps(data)
+    ref  = DBSCAN(eps=eps, min_samples=min_samples).fit(column(data))
+    got  = DBSCAN1D(eps=eps, min_samples=min_samples).fit(column(data))
+
+    assert np.array_equal(got.labels_ == -1, ref.labels_ == -1)
+    assert np.array_equal(got.core_sample_indices_, ref.core_sample_indices_)
+    # Same partition of the core points (cluster ids may be numbered differently)
+    core = ref.core_sample_indices_
+    pairs = {(int(a), int(b)) for a, b in zip(ref.labels_[core], got.labels_[core])}
+    assert len({a for a, _ in pairs}) == len({b for _, b in pairs}) == len(pairs)
+
+
+@pytest.mark.parametrize("data", [np.array([2.0]), np.array([1.0, 4.0]), np.full(3, 1.5)],
+                         ids=["n1", "n2_apart", "n3_tied"])
+def test_dbscan_fewer_samples_than_min_samples(data):
+    ref = DBSCAN(eps=0.5, min_samples=5).fit(column(data))
+    got = DBSCAN1D(eps=0.5, min_samples=5).fit(column(data))
+    assert np.array_equal(got.labels_, ref.labels_)
+    assert np.all(got.labels_ == -1)
+
+
+# ===========================================================
+# Gaussian mixture
+# ===========================================================
+
+def fit_gmm(cls, data: np.ndarray, n_components: int):
+    with warnings.catch_warnings():
+        # sklearn warns when there are fewer distinct values than clusters
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        return cls(n_components=n_components, random_state=42,
+                   covariance_type="full", max_iter=200).fit(column(data))
+
+
+@pytest.mark.parametrize("name", sorted(ALL))
+def test_gmm_matches_sklearn(name):
+    data   = ALL[name]
+    n_comp = 3 if len(data) >= 15 else 2
+    ref    = fit_gmm(GaussianMixture, data, n_comp)
+    got    = fit_gmm(GaussianMixture1D, data, n_comp)
+
+    assert np.array_equal(got.predict(column(data)), ref.predict(column(data)))
+    assert got.n_iter_ == ref.n_iter_
+    assert np.allclose(got.means_, ref.means_, rtol=1e-7, atol=1e-9)
+
+
+def test_gmm_fewer_samples_than_components():
+    data = np.array([1.0, 2.0])
+    with pytest.raises(ValueError):
+        fit_gmm(GaussianMixture, data, 3)
+    with pytest.raises(ValueError):
+        fit_gmm(GaussianMixture1D, data, 3)
+
+
+# ===========================================================
+# Local outlier factor
+# ===========================================================
+
+def fit_lof(cls, data: np.ndarray) -> np.ndarray:
+    n_neighbors = int(np.clip(len(data) // 4, 3, 15))
+    with warnings.catch_warnings():
+        # sklearn warns about duplicate values outnumbering n_neighbors
+        warnings.simplefilter("ignore", UserWarning)
+        return cls(n_neighbors=n_neighbors,
+                   contamination=ENGINE._adaptive_contamination(data)).fit_predict(column(data))
+
+
+@pytest.mark.parametrize("name", sorted(set(ALL) - DUPLICATE_HEAVY))
+def test_lof_matches_sklearn(name):
+    data = ALL[name]
+    assert np.array_equal(fit_lof(LocalOutlierFactor1D, data), fit_lof(LocalOutlierFactor, data))
+
+
+@pytest.mark.parametrize("name", sorted(DUPLICATE_HEAVY))
+def test_lof_duplicate_values_flag_as_many(name):
+    data = ALL[name]
+    ref  = fit_lof(LocalOutlierFactor, data)
+    got  = fit_lof(LocalOutlierFactor1D, data)
+    assert abs(int(np.sum(got == -1)) - int(np.sum(ref == -1))) <= 1
+
+
+def test_lof_single_sample_raises():
+    for cls in (LocalOutlierFactor, LocalOutlierFactor1D):
+        with pytest.raises(ValueError), warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            cls(n_neighbors=3).fit_predict(column(np.array([1.0])))
+
+
+# ===========================================================
+# Through the engine
+# ===========================================================
+
+@pytest.fixture
+def restore_detectors():
+    saved = dict(ml_engine._detectors)
+    yield
+    ml_engine._detectors.clear()
+    ml_engine._detectors.update(saved)
+    ml_engine._backends.clear()
+
+
+@pytest.mark.parametrize("technique", ["dbscan", "gmm", "lof"])
+@pytest.mark.parametrize("name", sorted(SIGNALS))
+def test_engine_reconstruction_matches(restore_detectors, technique, name):
+    data = SIGNALS[name]
+    ml_engine.use_detector(technique, "sklearn")
+    ref = ENGINE.run_solo(technique, data)
+    ml_engine.use_detector(technique, "native")
+    got = ENGINE.run_solo(technique, data)
+    assert np.array_equal(got, ref)
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")    # the engine's own statistics on inf
+@pytest.mark.parametrize("bad", [np.nan, np.inf, -np.inf], ids=["nan", "inf", "-inf"])
+@pytest.mark.parametrize("technique", ["dbscan", "gmm", "lof"])
+def test_engine_falls_back_on_non_finite(restore_detectors, technique, bad):
+    data = SIGNALS["csv_EDA_GROUP_02_MESSY"][:80].copy()
+    data[10] = bad
+    for implementation in ("native", "sklearn"):
+        ml_engine.use_detector(technique, implementation)
+        out = ENGINE.run_solo(technique, data)
+        assert np.array_equal(out, data, equal_nan=True), implementation
+
+
+@pytest.mark.parametrize("cls", [DBSCAN1D, GaussianMixture1D, LocalOutlierFactor1D])
+def test_native_rejects_non_finite_input(cls):
+    data = np.r_[np.linspace(1.0, 2.0, 20), np.nan]
+    with pytest.raises(ValueError):
+        model = cls()
+        (model.fit_predict if cls is LocalOutlierFactor1D else model.fit)(column(data))
+
+
+@pytest.mark.parametrize("eps", [np.nan, np.inf, 0.0, -0.1])
+def test_dbscan_rejects_bad_eps(eps):
+    for cls in (DBSCAN, DBSCAN1D):
+        with pytest.raises(ValueError):
+            cls(eps=eps, min_samples=2).fit(column(np.linspace(1.0, 2.0, 20)))
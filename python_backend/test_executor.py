@@ -0,0 +1,115 @@
+"""
+DetectorExecutor fan-out under timeouts: shared-memory segments must
+outlive abandoned tasks, and an abandoned fit must not keep holding a
+pool slot for later calls.
+
+A deliberately slow technique is registered in the module registry
+before each executor forks its workers, so process workers see it too.
+
+Run from python_backend/:  python -m pytest -q test_executor.py
+"""
+import time
+
+import numpy as np
+import pytest
+
+import shared_buffers
+from executor import DetectorExecutor
+from ml_engine import TECHNIQUES, ForensicMLEngine
+from techniques import COST_HEAVY, Technique
+
+SLOW_SECONDS = 1.5
+
+
+def _solo_slow(engine, data, ctx):
+    time.sleep(SLOW_SECONDS)
+    return data + 1.0
+
+
+@pytest.fixture
+def slow_technique():
+    TECHNIQUES.register(Technique("slow", _solo_slow, cost=COST_HEAVY))
+    yield "slow"
+    TECHNIQUES._techniques.pop("slow", None)
+
+
+def make_executor(kind: str, max_workers: int = 2) -> DetectorExecutor:
+    return DetectorExecutor(kind=kind, max_workers=max_workers, technique_timeout=0.2,
+                            shm_min_bytes=0, inline_below=0)
+
+
+def wait_until(condition, seconds: float) -> bool:
+    until = time.perf_counter() + seconds
+    while time.perf_counter() < until:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+def test_shared_segments_outlive_a_timed_out_task(slow_technique):
+    executor = make_executor("process")
+    engine   = ForensicMLEngine(executor=executor, precision="float64")
+    data     = np.linspace(1.0, 2.0, 600)
+    before   = shared_buffers.stats()["live_segments"]
+    try:
+        failed  = []
+        results = executor.map_solo(engine, ["slow", "cul"], data, failed=failed)
+        assert failed == ["slow"]
+        assert np.array_equal(results[0], data)
+
+        # The abandoned worker still has to attach and write: raw + out stay mapped
+        assert shared_buffers.stats()["live_segments"] == before + 2
+        assert wait_until(lambda: shared_buffers.stats()["live_segments"] == before,
+                          SLOW_SECONDS + 5)
+    finally:
+        executor.shutdown(wait=False)
+
+
+@pytest.mark.parametrize("kind", ["process", "thread"])
+def test_timed_out_fit_does_not_starve_later_calls(slow_technique, kind):
+    # One worker: without recycling, the next call would queue behind the stuck fit
+    executor = make_executor(kind, max_workers=1)
+    engine   = ForensicMLEngine(executor=executor, precision="float64")
+    data     = np.linspace(1.0, 2.0, 600)
+    try:
+        failed = []
+        executor.map_solo(engine, ["slow", "cul"], data, failed=failed)
+        assert "slow" in failed
+        assert executor.recycled == 1
+
+        failed  = []
+        results = executor.map_solo(engine, ["cul", "kmeans"], data, failed=failed)
+        assert failed == []
+        assert np.array_equal(results[0], engine.run_solo("cul", data))
+    finally:
+        executor.shutdown(wait=False)
+
+
+def test_thread_pools_are_not_retired_past_the_cap(slow_technique):
+    executor = make_executor("thread", max_workers=1)
+    engine   = ForensicMLEngine(executor=executor, precision="float64")
+    data     = np.linspace(1.0, 2.0, 600)
+    try:
+        for _ in range(DetectorExecutor.MAX_RETIRED_POOLS + 2):
+            executor.map_solo(engine, ["slow"], data, deadline=time.perf_counter() + 0.1)
+        # Each retired pool still runs its slow fit: threads stay bounded
+        assert executor.recycled == DetectorExecutor.MAX_RETIRED_POOLS
+    finally:
+        executor.shutdown(wait=False)
+
+
+def test_process_pools_past_the_cap_are_terminated(slow_technique):
+    executor = make_executor("process", max_workers=1)
+    engine   = ForensicMLEngine(executor=executor, precision="float64")
+    data     = np.linspace(1.0, 2.0, 600)
+    try:
+        retired = []
+        for _ in range(DetectorExecutor.MAX_RETIRED_POOLS + 1):
+            executor.map_solo(engine, ["slow"], data, deadline=time.perf_counter() + 0.1)
+            retired.append(executor._retired[-1][0])
+        assert executor.recycled == DetectorExecutor.MAX_RETIRED_POOLS + 1
+        assert len(executor._retired) == DetectorExecutor.MAX_RETIRED_POOLS
+        assert all(entry[0] is not retired[0] for entry in executor._retired)
+    finally:
+        executor.shutdown(wait=False)
@@ -0,0 +1,270 @@
+"""
+Equivalence tests: the vectorized SCR detector, artifact interpolation
+and k-means in ml_engine against the per-sample loop implementations
+they replaced, on every bundled CSV. Boolean masks must match exactly;
+float output within a tight tolerance. The budgeted auditor is checked
+against the brute-force leaderboard it cuts short.
+
+Run from python_backend/:  python -m pytest -q test_ml_engine.py
+"""
+import numpy as np
+import pytest
+
+from benchmark_suite import csv_signals
+from instrumentation import metrics
+from ml_engine import TECHNIQUES, ForensicMLEngine
+from techniques import Technique
+
+SIGNALS = csv_signals()
+ENGINE  = ForensicMLEngine(precision="float64")
+
+
+# ===========================================================
+# Reference loop implementations (pre-vectorization)
+# ===========================================================
+
+def loop_detect_scr_events(engine: ForensicMLEngine, data: np.ndarray) -> np.ndarray:
+    n      = len(data)
+    is_scr = np.zeros(n, dtype=bool)
+    if n < 3:
+        return is_scr
+
+    baseline = float(np.median(data))
+    std      = engine._safe_std(data)
+    diffs    = np.diff(data)
+
+    for i in range(1, n - 1):
+        rise_gradual = 0 < diffs[i - 1] < std * 2.5
+        amp_valid    = 0.05 <= (data[i] - baseline) <= engine.SCR_MAX_AMPLITUDE
+        not_artifact = data[i] < baseline + engine.ARTIFACT_SIGMA * std
+        if rise_gradual and amp_valid and not_artifact:
+            is_scr[i] = True
+    return is_scr
+
+
+def loop_interpolate_artifacts(data: np.ndarray, artifact_mask: np.ndarray) -> np.ndarray:
+    refined = data.copy().astype(float)
+    n       = len(data)
+
+    for i in np.where(artifact_mask)[0]:
+        left = i - 1
+        while left >= 0 and artifact_mask[left]:
+            left -= 1
+        right = i + 1
+        while right < n and artifact_mask[right]:
+            right += 1
+
+        if left >= 0 and right < n:
+            t = (i - left) / (right - left)
+            refined[i] = data[left] * (1.0 - t) + data[right] * t
+        elif left >= 0:
+            refined[i] = data[left]
+        elif right < n:
+            refined[i] = data[right]
+        else:
+            refined[i] = float(np.median(data))
+    return refined
+
+
+def loop_kmeans(engine: ForensicMLEngine, data: np.ndarray) -> np.ndarray:
+    mean   = float(np.mean(data))
+    std    = engine._safe_std(data)
+    c_base = mean
+    c_art  = mean + engine.ARTIFACT_SIGMA * std
+
+    if std < 0.001:
+        return data
+
+    for _ in range(20):
+        labels = np.array([0 if abs(x - c_base) <= abs(x - c_art) else 1 for x in data])
+        cl0 = data[labels == 0]
+        cl1 = data[labels == 1]
+        if len(cl0) > 0: c_base = float(np.mean(cl0))
+        if len(cl1) > 0: c_art  = float(np.mean(cl1))
+
+    artifact_cluster = 1 if c_art > c_base else 0
+    artifact_mask = (
+        (labels == artifact_cluster) &
+        (np.abs(data - mean) > engine.ARTIFACT_SIGMA * std) &
+        ~loop_detect_scr_events(engine, data)
+    )
+    return loop_interpolate_artifacts(data, artifact_mask)
+
+
+# ===========================================================
+# Inputs
+# ===========================================================
+
+def artifact_masks(data: np.ndarray):
+    """Sigma outliers as the engines flag them, plus gap shapes at the edges."""
+    n     = len(data)
+    sigma = np.abs(data - data.mean()) > ENGINE.ARTIFACT_SIGMA * ENGINE._safe_std(data)
+    edges = np.zeros(n, dtype=bool)
+    edges[:3] = edges[-4:] = True
+    edges[n // 2:n // 2 + 5] = True
+    every_third = np.arange(n) % 3 == 0
+    return {
+        "sigma":       sigma,
+        "sigma_edges": sigma | edges,
+        "every_third": every_third,
+        "none":        np.zeros(n, dtype=bool),
+        "all":         np.ones(n, dtype=bool),
+    }
+
+
+def test_bundled_csvs_present():
+    assert len(SIGNALS) == 6
+
+
+# ===========================================================
+# SCR detection
+# ===========================================================
+
+@pytest.mark.parametrize("name", sorted(SIGNALS))
+def test_scr_mask_matches_loop(name):
+    data = SIGNALS[name]
+    assert np.array_equal(ENGINE._detect_scr_events(data), loop_detect_scr_events(ENGINE, data))
+
+
+@pytest.mark.parametrize("data", [np.array([]), np.array([1.0]), np.array([1.0, 2.0]),
+                                  np.full(50, 3.0)], ids=["n0", "n1", "n2", "constant"])
+def test_scr_mask_edge_cases(data):
+    assert np.array_equal(ENGINE._detect_scr_events(data), loop_detect_scr_events(ENGINE, data))
+
+
+def test_scr_rows_match_loop():
+    n    = min(len(d) for d in SIGNALS.values())
+    X    = np.stack([d[:n] for d in SIGNALS.values()])
+    want = np.stack([loop_detect_scr_events(ENGINE, row) for row in X])
+    assert np.array_equal(ENGINE._detect_scr_events_rows(X), want)
+
+
+# ===========================================================
+# Artifact interpolation
+# ===========================================================
+
+@pytest.mark.parametrize("name", sorted(SIGNALS))
+def test_interpolation_matches_loop(name):
+    data = SIGNALS[name]
+    for label, mask in artifact_masks(data).items():
+        got  = ENGINE._interpolate_artifacts(data, mask)
+        want = loop_interpolate_artifacts(data, mask)
+        assert np.allclose(got, want, rtol=1e-12, atol=1e-12), label
+        # Clean samples are never touched
+        assert np.array_equal(got[~mask], data[~mask]), label
+
+
+def test_interpolation_rows_match_loop():
+    n     = min(len(d) for d in SIGNALS.values())
+    X     = np.stack([d[:n] for d in SIGNALS.values()])
+    masks = [artifact_masks(row) for row in X]
+    for label in masks[0]:
+        M    = np.stack([m[label] for m in masks])
+        want = np.stack([loop_interpolate_artifacts(row, m) for row, m in zip(X, M)])
+        assert np.allclose(ENGINE._interpolate_artifacts_rows(X, M), want,
+                           rtol=1e-12, atol=1e-12), label
+
+
+# ===========================================================
+# k-means
+# ===========================================================
+
+@pytest.mark.parametrize("name", sorted(SIGNALS))
+def test_kmeans_matches_loop(name):
+    data = SIGNALS[name]
+    got  = ENGINE.run_solo("kmeans", data)
+    want = loop_kmeans(ENGINE, data)
+    assert np.allclose(got, want, rtol=1e-12, atol=1e-12)
+
+
+def test_kmeans_constant_signal_is_untouched():
+    data = np.full(40, 2.5)
+    assert np.array_equal(ENGINE.run_solo("kmeans", data), loop_kmeans(ENGINE, data))
+
+
+# ===========================================================
+# Budgeted auditor (top_k / max_evals / time_budget)
+# ===========================================================
+
+BENCH_SIGNAL = SIGNALS["csv_EDA_GROUP_02_MESSY"]
+BRUTE_FORCE  = ENGINE.run_brute_force_benchmark(BENCH_SIGNAL)
+N_TECHS      = len(ENGINE.techniques.names())
+
+
+def brute_force_entry(entry: dict) -> dict:
+    return next(r for r in BRUTE_FORCE if r["techs"] == entry["techs"])
+
+
+def test_budgeted_top_k_only_is_brute_force_cut():
+    found = ENGINE.run_budgeted_benchmark(BENCH_SIGNAL, top_k=5)
+    assert found["results"] == BRUTE_FORCE[:5]
+    assert found["exhaustive"] and found["stopped"] == "complete"
+    assert found["max_evals"] is None
+
+
+@pytest.mark.parametrize("max_evals", [N_TECHS, 20])
+def test_budgeted_max_evals_is_honoured(max_evals):
+    found = ENGINE.run_budgeted_benchmark(BENCH_SIGNAL, top_k=5, max_evals=max_evals)
+    assert found["evaluated"] == found["max_evals"] == max_evals
+    assert found["stopped"] == "max_evals" and not found["exhaustive"]
+    assert len(found["results"]) == 5
+    for entry in found["results"]:
+        assert entry == brute_force_entry(entry)
+    if max_evals == N_TECHS:
+        assert all(entry["mode"] == "solo" for entry in found["results"])
+
+
+def test_budgeted_max_evals_above_total_is_exhaustive():
+    found = ENGINE.run_budgeted_benchmark(BENCH_SIGNAL, top_k=5, max_evals=1000)
+    assert found["results"] == BRUTE_FORCE[:5]
+    assert found["exhaustive"] and found["stopped"] == "complete"
+    assert found["max_evals"] == found["total"] == 2 ** N_TECHS - 1
+
+
+def test_budgeted_max_evals_below_solo_count_raises():
+    with pytest.raises(ValueError):
+        ENGINE.run_budgeted_benchmark(BENCH_SIGNAL, top_k=5, max_evals=N_TECHS - 1)
+
+
+def test_budgeted_generous_time_budget_is_exhaustive():
+    found = ENGINE.run_budgeted_benchmark(BENCH_SIGNAL, top_k=5, time_budget=60.0)
+    assert found["results"] == BRUTE_FORCE[:5]
+    assert found["exhaustive"] and found["skipped"] == []
+
+
+def test_budgeted_expired_time_budget_skips_everything():
+    found = ENGINE.run_budgeted_benchmark(BENCH_SIGNAL, top_k=5, time_budget=1e-6)
+    assert found["stopped"] == "time_budget" and not found["exhaustive"]
+    assert found["evaluated"] == 0 and found["results"] == []
+    assert found["skipped"] == ENGINE.techniques.names()
+
+
+# ===========================================================
+# Error accounting
+# ===========================================================
+
+def _solo_broken(engine, data, ctx):
+    raise RuntimeError("broken")
+
+
+def _rows_broken(engine, X):
+    raise RuntimeError("broken")
+
+
+@pytest.fixture
+def counted_errors(monkeypatch):
+    monkeypatch.setattr(metrics, "enabled", True)
+    metrics.reset()
+    TECHNIQUES.register(Technique("broken", _solo_broken, rows=_rows_broken))
+    yield lambda: metrics._counters.get(
+        ("forge_engine_errors_total", (("technique", "broken"),)), 0.0)
+    TECHNIQUES._techniques.pop("broken", None)
+    metrics.reset()
+
+
+def test_errors_counted_on_solo_and_rows_paths(counted_errors):
+    X = np.stack([d[:60] for d in list(SIGNALS.values())[:3]])
+    assert np.array_equal(ENGINE.run_solo("broken", X[0]), X[0])
+    assert counted_errors() == 1
+    assert np.array_equal(ENGINE.run_mode_channels("solo", ["broken"], X), X)
+    assert counted_errors() == 1 + len(X)
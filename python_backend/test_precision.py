@@ -0,0 +1,108 @@
+"""
+float32 precision mode: metric drift against a float64 engine on every
+bundled CSV, per technique and per metric, plus the storage dtype and
+size of what a float32 engine hands back.
+
+Bounds are score points (metrics are rounded to 0.01), relative for
+noise_suppression — the summed residual, which grows with signal length.
+On the bundled CSVs every score metric is currently identical and
+noise_suppression moves by at most 0.05%; the bounds leave headroom for
+one rounding step, not for a real regression. (Longer generated signals
+drift more — see `benchmark_suite.py precision`.)
+
+Run from python_backend/:  python -m pytest -q test_precision.py
+"""
+import numpy as np
+import pytest
+
+from benchmark_suite import RELATIVE_METRICS, TECHNIQUES, _drift, csv_signals
+from ml_engine import ForensicMLEngine, parse_precision
+
+SIGNALS = csv_signals()
+E64     = ForensicMLEngine(precision="float64")
+E32     = ForensicMLEngine(precision="float32")
+
+MAX_DRIFT = {
+    "artifact_suppression": 0.02,
+    "baseline_integrity":   0.02,
+    "scr_preservation":     0.02,
+    "signal_continuity":    0.02,
+    "smoothness_score":     0.02,
+    "stability_index":      0.02,
+    "noise_suppression":    0.005,     # relative
+}
+
+# The 127-combination auditor is only run on the short CSVs
+BRUTE_FORCE_MAX_LEN = 100
+
+
+def run_case(engine: ForensicMLEngine, case: str, data: np.ndarray) -> np.ndarray:
+    if case == "hybrid":
+        return engine.run_hybrid(TECHNIQUES, data)
+    return engine.run_solo(case, data)
+
+
+def assert_within_bounds(drift: dict, where: str):
+    assert set(drift) == set(MAX_DRIFT), where
+    over = {k: round(v, 4) for k, v in drift.items() if v > MAX_DRIFT[k]}
+    assert not over, f"{where}: {over}"
+
+
+def test_bundled_csvs_present():
+    assert len(SIGNALS) == 6
+    assert set(RELATIVE_METRICS) == {"noise_suppression"}
+
+
+@pytest.mark.parametrize("case", TECHNIQUES + ["hybrid"])
+@pytest.mark.parametrize("name", sorted(SIGNALS))
+def test_metric_drift(name, case):
+    data  = SIGNALS[name]
+    raw32 = E32.as_signal(data)
+    out64 = run_case(E64, case, data)
+    out32 = run_case(E32, case, raw32)
+
+    assert out64.dtype == np.float64
+    assert out32.dtype == np.float32
+    assert_within_bounds(_drift(E64.calculate_metrics(data, out64),
+                                E32.calculate_metrics(raw32, out32)), f"{name}/{case}")
+
+
+@pytest.mark.parametrize("name", sorted(n for n, d in SIGNALS.items()
+                                        if len(d) <= BRUTE_FORCE_MAX_LEN))
+def test_brute_force_drift(name):
+    data = SIGNALS[name]
+    ref  = {tuple(r["techs"]): r["metrics"] for r in E64.run_brute_force_benchmark(data)}
+    got  = E32.run_brute_force_benchmark(E32.as_signal(data))
+
+    assert len(got) == len(ref)
+    for r in got:
+        assert_within_bounds(_drift(ref[tuple(r["techs"])], r["metrics"]),
+                             f"{name}/{'+'.join(r['techs'])}")
+
+
+def test_solo_stack_is_half_size():
+    data = SIGNALS["csv_EDA_SOLO_SUBJECT_02_MESSY"]
+
+    def stack(engine: ForensicMLEngine) -> np.ndarray:
+        return np.stack([engine.run_solo(t, engine.as_signal(data)) for t in TECHNIQUES])
+
+    assert stack(E32).nbytes * 2 == stack(E64).nbytes
+
+
+def test_precision_report_is_labelled_an_estimate():
+    report = E32.precision_report(1000)
+    assert report == {"precision": "float32",
+                      "estimated_bytes": 4000, "estimated_bytes_saved": 4000}
+    assert E64.precision_report(1000)["estimated_bytes_saved"] == 0
+
+
+@pytest.mark.parametrize("spec, want", [(None, "float64"), ("", "float64"), (" F4 ", "float32"),
+                                        ("single", "float32"), ("float64", "float64")])
+def test_parse_precision(spec, want):
+    assert parse_precision(spec) == want
+
+
+@pytest.mark.parametrize("spec", ["float16", "flaot32", "half"])
+def test_unknown_precision_raises(spec):
+    with pytest.raises(ValueError):
+        parse_precision(spec)
@@ -0,0 +1,60 @@
+"""
+Streaming-equals-batch: per-sample output of the live stream classes in
+streaming against the batch technique re-run on the same trailing
+window, on every bundled CSV. CUL-v4 must match exactly; rank-1 SSA
+within a small absolute tolerance (its lag cross-products are updated
+incrementally and resynced once per window).
+
+Run from python_backend/:  python -m pytest -q test_streaming.py
+"""
+import numpy as np
+import pytest
+
+from benchmark_suite import csv_signals
+from ml_engine import ForensicMLEngine
+from streaming import StreamingReconstructor, StreamingSSA, StreamRegistry
+
+SIGNALS = csv_signals()
+ENGINE  = ForensicMLEngine(precision="float64")
+
+STREAMS = {"cul": StreamingReconstructor, "pca": StreamingSSA}
+# Largest deviation on the bundled CSVs is ~2e-11 (pca, window 31)
+SSA_ATOL = 1e-10
+
+
+def batch_tail(technique: str, data: np.ndarray, window: int) -> np.ndarray:
+    """run_solo on each trailing window, newest sample only."""
+    return np.array([ENGINE.run_solo(technique, data[max(i - window + 1, 0):i + 1])[-1]
+                     for i in range(len(data))])
+
+
+def assert_matches(technique: str, got: np.ndarray, want: np.ndarray, where: str):
+    if technique == "cul":
+        assert np.array_equal(got, want), where
+    else:
+        assert np.allclose(got, want, rtol=0, atol=SSA_ATOL), where
+
+
+def test_bundled_csvs_present():
+    assert len(SIGNALS) == 6
+
+
+@pytest.mark.parametrize("window", [1, 2, 9, 31])
+@pytest.mark.parametrize("technique", sorted(STREAMS))
+@pytest.mark.parametrize("name", sorted(SIGNALS))
+def test_stream_matches_batch(name, technique, window):
+    data   = SIGNALS[name]
+    stream = STREAMS[technique](ENGINE, window)
+    got    = np.array([stream.push(x) for x in data])
+    assert_matches(technique, got, batch_tail(technique, data, window), f"{name}/w{window}")
+
+
+@pytest.mark.parametrize("window", [1, 9, 31])
+@pytest.mark.parametrize("technique", sorted(STREAMS))
+def test_registry_primes_from_history(technique, window):
+    # The legacy payload sends the whole history with the first sample;
+    # only the last window - 1 samples may seed the stream
+    data     = SIGNALS["csv_EDA_GROUP_02_MESSY"]
+    registry = StreamRegistry(ENGINE, window=window, stream_cls=STREAMS[technique])
+    got      = [registry.push(f"s{i}", data[i], history=data[:i]) for i in range(len(data))]
+    assert_matches(technique, np.array(got), batch_tail(technique, data, window), f"w{window}")
@@ -0,0 +1,407 @@
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+
+# ===========================================================
+# Shared helpers
+# ===========================================================
+
+FSYNC_POLICIES = ("never", "flush", "interval")
+
+TIMESTAMP_FORMATS = (
+    "%d/%m/%Y, %H:%M:%S",   # monitor page: toLocaleString('en-GB')
+    "%d/%m/%Y %H:%M:%S",
+)
+
+
+def parse_timestamp(value: str) -> Optional[datetime]:
+    """Vault timestamps come from the browser locale string; ISO is accepted too."""
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except (TypeError, ValueError):
+            pass
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class _FsyncPolicy:
+    def __init__(self, policy: str, interval: float):
+        if policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{policy}' — expected one of {FSYNC_POLICIES}")
+        self.policy   = policy
+        self.interval = interval
+        self._last    = 0.0
+
+    def after_write(self, fd: int):
+        if self.policy == "flush":
+            os.fsync(fd)
+        elif self.policy == "interval":
+            now = time.monotonic()
+            if now - self._last >= self.interval:
+                os.fsync(fd)
+                self._last = now
+
+
+class ExportFilter:
+    """
+    Row selection for vault exports. Every bound is optional and
+    inclusive; `columns` is a projection (None = all 14 attributes).
+    """
+
+    def __init__(self, user_ids: Optional[Sequence[str]] = None,
+                 win_range: Tuple[Optional[int], Optional[int]] = (None, None),
+                 time_range: Tuple[Optional[datetime], Optional[datetime]] = (None, None),
+                 columns: Optional[Sequence[str]] = None):
+        self.user_ids   = list(user_ids) if user_ids else None
+        self.win_range  = win_range
+        self.time_range = time_range
+        self.columns    = list(columns) if columns else None
+
+    @property
+    def is_empty(self) -> bool:
+        return (self.user_ids is None and self.columns is None and
+                self.win_range == (None, None) and self.time_range == (None, None))
+
+
+# ===========================================================
+# CSV VAULT — the original append-only file
+# ===========================================================
+
+class CsvVault:
+    """
+    Single append-only CSV (telemetry_database.csv). Filtered exports
+    have to scan the whole file, so this is kept as the compatible
+    default and as the migration source for ParquetVault.
+    """
+
+    kind = "csv"
+
+    def __init__(self, path: str, fields: Dict[str, type],
+                 fsync: str = "flush", fsync_interval: float = 10.0):
+        self.path     = path
+        self.location = path
+        self.fields   = list(fields)
+        self._fsync   = _FsyncPolicy(fsync, fsync_interval)
+        self._file    = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def append(self, rows: List[dict]):
+        if not rows:
+            return
+        if self._file is None:
+            # Header only if the vault is new (same rule as before)
+            header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self._file = open(self.path, "a", newline="")
+            if header:
+                csv.writer(self._file).writerow(self.fields)
+
+        writer = csv.DictWriter(self._file, fieldnames=self.fields, extrasaction="ignore")
+        writer.writerows(rows)
+        self._file.flush()
+        self._fsync.after_write(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def compact(self, open_parts: Optional[int] = None) -> int:
+        """One file already — nothing to merge."""
+        return 0
+
+    def iter_csv(self, selection: ExportFilter,
+                 chunk_rows: int = 65536) -> Iterator[bytes]:
+        if selection.is_empty:
+            with open(self.path, "rb") as f:
+                while True:
+                    block = f.read(1 << 20)
+                    if not block:
+                        return
+                    yield block
+
+        import pandas as pd
+
+        header = True
+        for chunk in pd.read_csv(self.path, chunksize=chunk_rows):
+            if selection.user_ids is not None:
+                chunk = chunk[chunk["User_ID"].astype(str).isin(selection.user_ids)]
+            lo, hi = selection.win_range
+            if lo is not None:
+                chunk = chunk[chunk["Win"] >= lo]
+            if hi is not None:
+                chunk = chunk[chunk["Win"] <= hi]
+            since, until = selection.time_range
+            if (since or until) and "Timestamp" in chunk:
+                ts = chunk["Timestamp"].map(parse_timestamp)
+                keep = ts.notna()
+                if since: keep &= ts.map(lambda t: t is not None and t >= since)
+                if until: keep &= ts.map(lambda t: t is not None and t <= until)
+                chunk = chunk[keep]
+            if selection.columns:
+                chunk = chunk[[c for c in selection.columns if c in chunk]]
+            yield chunk.to_csv(index=False, header=header).encode()
+            header = False
+
+
+# ===========================================================
+# PARQUET VAULT — columnar, partitioned by User_ID and date
+# ===========================================================
+
+class ParquetVault:
+    """
+    ============================================================
+    Hive-partitioned Parquet vault:
+
+        <root>/User_ID=<id>/date=<YYYY-MM-DD>/part-*.parquet
+
+    - each writer flush adds one small part file per partition touched
+    - a derived `_ts` timestamp column carries the parsed Timestamp
+      for time-range filters; it is never exported
+    - exports prune partitions by user/date, read only the projected
+      columns and stream record batches out as CSV, so a query costs
+      the size of its answer rather than the size of the vault
+    - compact() merges each partition's part files into one; the
+      telemetry sink runs it on a schedule and on shutdown
+    - import_csv() migrates an existing CSV vault (the sink does it
+      on first start; `python vault.py import` by hand)
+    ============================================================
+    """
+
+    kind = "parquet"
+
+    ARROW_TYPES = {str: "string", float: "float64", int: "int64"}
+
+    def __init__(self, root: str, fields: Dict[str, type],
+                 fsync: str = "flush", fsync_interval: float = 10.0):
+        import pyarrow as pa
+
+        self.root     = root
+        self.location = root
+        self.fields   = list(fields)
+        self._fsync   = _FsyncPolicy(fsync, fsync_interval)
+
+        # Partition column lives in the directory name, not the file
+        self._file_schema = pa.schema(
+            [(name, self.ARROW_TYPES.get(tp, "string"))
+             for name, tp in fields.items() if name != "User_ID"] +
+            [("_ts", pa.timestamp("ms"))]
+        )
+        self._partitioning = None
+
+    def exists(self) -> bool:
+        if not os.path.isdir(self.root):
+            return False
+        with os.scandir(self.root) as entries:
+            return any(entries)
+
+    def close(self):
+        pass
+
+    # -----------------------------------------------------------
+    # Write path
+    # -----------------------------------------------------------
+
+    def _partition_dir(self, user_id: str, day: str) -> str:
+        return os.path.join(self.root,
+                            f"User_ID={quote(str(user_id), safe='')}",
+                            f"date={day}")
+
+    def _write_part(self, directory: str, table):
+        import pyarrow.parquet as pq
+
+        os.makedirs(directory, exist_ok=True)
+        name  = f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+        final = os.path.join(directory, name)
+        tmp   = os.path.join(directory, "." + name + ".tmp")
+        pq.write_table(table, tmp)
+        if self._fsync.policy != "never":
+            fd = os.open(tmp, os.O_RDONLY)
+            try:
+                self._fsync.after_write(fd)
+            finally:
+                os.close(fd)
+        os.replace(tmp, final)   # readers never see half-written parts
+
+    def append(self, rows: List[dict]):
+        import pyarrow as pa
+
+        partitions: Dict[Tuple[str, str], List[dict]] = {}
+        for row in rows:
+            ts  = parse_timestamp(row.get("Timestamp"))
+            day = ts.strftime("%Y-%m-%d") if ts else "unknown"
+            partitions.setdefault((str(row.get("User_ID")), day), []).append(
+                dict(row, _ts=ts)
+            )
+
+        for (user_id, day), part_rows in partitions.items():
+            columns = {name: [r.get(name) for r in part_rows]
+                       for name in self._file_schema.names}
+            table = pa.Table.from_pydict(columns, schema=self._file_schema)
+            self._write_part(self._partition_dir(user_id, day), table)
+
+    def import_csv(self, path: str, chunk_rows: int = 65536) -> int:
+        """Migrate an existing telemetry_database.csv into the vault."""
+        import pandas as pd
+
+        total = 0
+        for chunk in pd.read_csv(path, chunksize=chunk_rows, dtype={"User_ID": str}):
+            chunk = chunk[[c for c in self.fields if c in chunk]]
+            self.append(chunk.to_dict("records"))
+            total += len(chunk)
+        return total
+
+    def compact(self, open_parts: Optional[int] = None) -> int:
+        """
+        Merge every partition's part files into a single file; returns
+        the number of partitions merged. With `open_parts`, partitions
+        still being written (today's and the undated one) are left alone
+        until they hold more than that many parts, so a scheduled pass
+        doesn't rewrite a hot partition on every run.
+        """
+        import pyarrow.parquet as pq
+
+        open_days = {f"date={datetime.now():%Y-%m-%d}", "date=unknown"}
+        merged_partitions = 0
+        for dirpath, _, files in os.walk(self.root):
+            parts = sorted(f for f in files if f.endswith(".parquet"))
+            if len(parts) < 2:
+                continue
+            if (open_parts is not None and os.path.basename(dirpath) in open_days
+                    and len(parts) <= open_parts):
+                continue
+            # Parts appended meanwhile are not in `parts` and survive as is
+            paths  = [os.path.join(dirpath, f) for f in parts]
+            merged = pq.ParquetDataset(paths, partitioning=None).read()
+            self._write_part(dirpath, merged.select(self._file_schema.names))
+            for p in paths:
+                os.remove(p)
+            merged_partitions += 1
+        return merged_partitions
+
+    # -----------------------------------------------------------
+    # Read path
+    # -----------------------------------------------------------
+
+    def _dataset(self):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        if self._partitioning is None:
+            self._partitioning = ds.partitioning(
+                pa.schema([("User_ID", pa.string()), ("date", pa.string())]),
+                flavor="hive"
+            )
+        return ds.dataset(self.root, format="parquet", partitioning=self._partitioning,
+                          schema=self._file_schema.append(pa.field("User_ID", pa.string()))
+                                                  .append(pa.field("date", pa.string())),
+                          exclude_invalid_files=False,
+                          ignore_prefixes=["."])
+
+    def _expression(self, selection: ExportFilter):
+        import pyarrow.dataset as ds
+
+        expr = None
+
+        def both(e):
+            return e if expr is None else expr & e
+
+        if selection.user_ids is not None:
+            expr = both(ds.field("User_ID").isin(selection.user_ids))
+        lo, hi = selection.win_range
+        if lo is not None:
+            expr = both(ds.field("Win") >= lo)
+        if hi is not None:
+            expr = both(ds.field("Win") <= hi)
+        since, until = selection.time_range
+        if since is not None:
+            expr = both(ds.field("date") >= since.strftime("%Y-%m-%d"))
+            expr = expr & (ds.field("_ts") >= since)
+        if until is not None:
+            expr = both(ds.field("date") <= until.strftime("%Y-%m-%d"))
+            expr = expr & (ds.field("_ts") <= until)
+        return expr
+
+    def _columns(self, selection: ExportFilter) -> List[str]:
+        wanted = selection.columns or self.fields
+        return [c for c in self.fields if c in wanted]
+
+    def query(self, selection: ExportFilter):
+        """Filtered, projected pyarrow Table (for in-process analysis)."""
+        return self._dataset().to_table(columns=self._columns(selection),
+                                        filter=self._expression(selection))
+
+    def iter_csv(self, selection: ExportFilter) -> Iterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+
+        columns = self._columns(selection)
+        header  = True
+        for batch in self._dataset().to_batches(columns=columns,
+                                                filter=self._expression(selection)):
+            if batch.num_rows == 0:
+                continue
+            buf = io.BytesIO()
+            pacsv.write_csv(pa.Table.from_batches([batch]), buf,
+                            pacsv.WriteOptions(include_header=header))
+            header = False
+            yield buf.getvalue()
+        if header:
+            yield (",".join(columns) + "\n").encode()
+
+
+def open_vault(kind: str, location: str, fields: Dict[str, type],
+               fsync: str = "flush"):
+    if kind == "csv":
+        return CsvVault(location, fields, fsync=fsync)
+    if kind == "parquet":
+        return ParquetVault(location, fields, fsync=fsync)
+    raise ValueError(f"Unknown vault backend '{kind}' — expected 'csv' or 'parquet'")
+
+
+# ===========================================================
+# CLI — offline migration / maintenance
+# ===========================================================
+
+def _telemetry_fields() -> Dict[str, type]:
+    # The API's TelemetryLog model is the vault schema
+    from main import TelemetryLog
+    return {name: field.annotation for name, field in TelemetryLog.model_fields.items()}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Forensic Vault maintenance")
+    sub    = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="migrate a CSV vault into a Parquet vault")
+    imp.add_argument("csv", help="existing telemetry_database.csv")
+    imp.add_argument("root", help="Parquet vault directory (FORGE_VAULT_DIR)")
+
+    comp = sub.add_parser("compact", help="merge each partition's part files")
+    comp.add_argument("root", help="Parquet vault directory (FORGE_VAULT_DIR)")
+
+    args  = parser.parse_args(argv)
+    vault = ParquetVault(args.root, _telemetry_fields())
+    started = time.perf_counter()
+    if args.command == "import":
+        rows = vault.import_csv(args.csv)
+        print(f"Imported {rows:,} rows from {args.csv} → {args.root}")
+    merged = vault.compact()
+    print(f"Compacted {merged} partitions in {time.perf_counter() - started:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())